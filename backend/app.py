@@ -1,22 +1,43 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, File, UploadFile
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, File, UploadFile, Request, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
+import secrets
+import time
 import logging
 from pathlib import Path
 import json
+import orjson
 import uuid
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from bson import ObjectId
-import requests
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, FileResponse, Response, ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+from azure_client import AzureTranslatorClient, AzureTranslatorError, pack_texts
+from circuit_breaker import CircuitBreaker
+from audio_cache import AudioCache, CachedAudio, audio_key, parse_byte_range, read_range
+from translation_cache import TranslationCache, translation_key
+from content_registry import ContentPackError, ContentRegistry
+from http_cache import content_etag, etag_matches, not_modified
+from compression import CompressionMiddleware, CompressionStats
+from idempotency import IdempotencyMiddleware, IdempotencyStore
+from progress_store import ProgressStore, decode_progress, popcount
+from user_counters import MAX_LIVES, UserCounters
+from lesson_sessions import LessonSessionError, LessonSessions, clamp_result
+from sync_events import EventSync
+from singleflight import SingleFlight, StreamFanout
+from token_cache import TokenCache
+from user_cache import UserCache
+from password_pool import PasswordHasher, PasswordPoolSaturated
+from refresh_tokens import RefreshTokenError, RefreshTokenStore
+from token_revocation import TokenRevocationList
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -28,15 +49,95 @@ db_name = os.environ.get('DB_NAME', 'maya_app_db') # Fallback seguro
 db = client[db_name]
 
 # Security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt runs on a process pool so logins never block the event loop
+password_hasher = PasswordHasher(
+    workers=int(os.environ.get("PASSWORD_POOL_WORKERS", "0")) or None,
+    max_pending=int(os.environ.get("PASSWORD_POOL_MAX_PENDING", "0")) or None,
+)
 SECRET_KEY = os.environ.get("SECRET_KEY", "maay-app-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_DAYS = 30
+# Short-lived access tokens carry the immutable user claims; refresh tokens renew them
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+refresh_tokens = RefreshTokenStore(
+    db.refresh_tokens,
+    expire_days=float(os.environ.get("REFRESH_TOKEN_EXPIRE_DAYS", "30")),
+)
+
+# Revoked access tokens (Mongo, mirrored into an in-memory Bloom filter)
+REVOCATION_SYNC_SECONDS = float(os.environ.get("REVOCATION_SYNC_SECONDS", "30"))
+# Each sync re-reads the previous interval too, for revocations that were written late
+revoked_tokens = TokenRevocationList(
+    db.revoked_tokens,
+    capacity=int(os.environ.get("REVOCATION_FILTER_CAPACITY", "100000")),
+    sync_overlap_seconds=REVOCATION_SYNC_SECONDS,
+)
 
 security = HTTPBearer()
 
+# Verified JWT claims, so repeated requests skip jwt.decode
+token_cache = TokenCache(max_entries=int(os.environ.get("TOKEN_CACHE_MAX_ENTRIES", "10000")))
+
+# User documents; endpoints that $set fields write through, atomic counter
+# updates (XP, lives, progress) drop the entry since they can finish out of order
+user_cache = UserCache(ttl_seconds=float(os.environ.get("USER_CACHE_TTL_SECONDS", "30")))
+
+# Azure Translator (shared pooled client, opened on startup, behind a circuit breaker)
+azure_breaker = CircuitBreaker(
+    "azure_translator",
+    slow_call_seconds=float(os.environ.get("AZURE_LATENCY_BUDGET_SECONDS", "2")),
+    open_seconds=float(os.environ.get("AZURE_BREAKER_OPEN_SECONDS", "15")),
+)
+azure_client = AzureTranslatorClient(breaker=azure_breaker)
+SPEAK_TIMEOUT_SECONDS = float(os.environ.get("SPEAK_TIMEOUT_SECONDS", "10"))
+TRANSLATE_TIMEOUT_SECONDS = float(os.environ.get("TRANSLATE_TIMEOUT_SECONDS", "5"))
+
+# TTS audio cache (content-addressed, size-bounded LRU on disk)
+SPEAK_LANGUAGE = "yua-MX"
+SPEAK_VOICE = "Male"
+SPEAK_FORMAT = "audio/mp3"
+AUDIO_CACHE_DIR = Path(os.environ.get("AUDIO_CACHE_DIR", ROOT_DIR / "audio_cache"))
+AUDIO_CACHE_MAX_BYTES = int(os.environ.get("AUDIO_CACHE_MAX_MB", "200")) * 1024 * 1024
+audio_cache = AudioCache(AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES)
+
+# Coalesces concurrent Azure translations of the same text
+translate_flights = SingleFlight()
+
+# Translation cache (in-process LRU + Mongo collection with TTL index)
+translation_cache = TranslationCache(
+    db.translation_cache,
+    max_entries=int(os.environ.get("TRANSLATION_CACHE_MAX_ENTRIES", "10000")),
+    ttl_seconds=float(os.environ.get("TRANSLATION_CACHE_TTL_DAYS", "30")) * 24 * 3600,
+    negative_ttl_seconds=float(os.environ.get("TRANSLATION_CACHE_NEGATIVE_TTL_SECONDS", "30")),
+)
+
+# Audio pre-generated by bake_audio.py (served from /static/audio)
+BAKED_AUDIO_DIR = ROOT_DIR / "static" / "audio"
+baked_audio: Dict[str, CachedAudio] = {}
+
+def load_baked_audio() -> Dict[str, CachedAudio]:
+    """Index the bake manifest by audio cache key"""
+    manifest_path = BAKED_AUDIO_DIR / "manifest.json"
+    if not manifest_path.exists():
+        return {}
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except Exception as e:
+        print(f"Could not read audio manifest: {e}")
+        return {}
+    if manifest.get("params") != {"language": SPEAK_LANGUAGE, "voice": SPEAK_VOICE, "format": SPEAK_FORMAT}:
+        return {}
+    index = {}
+    for entry in manifest.get("entries", {}).values():
+        path = BAKED_AUDIO_DIR / entry["file"]
+        if path.exists():
+            index[entry["key"]] = CachedAudio(entry["key"], path, entry["bytes"])
+    return index
+
 # Create the main app
-app = FastAPI()
+# orjson for every JSON response; hot endpoints return ORJSONResponse directly and skip validation
+app = FastAPI(default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # ============= MODELS =============
@@ -53,6 +154,14 @@ class UserLogin(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
 
 class UserResponse(BaseModel):
     id: str
@@ -73,866 +182,200 @@ class LessonProgress(BaseModel):
 class ReviewLesson(BaseModel):
     lesson_id: str
 
+class LessonSubmission(BaseModel):
+    session_token: str
+    # One per exercise: the chosen option, or {maya: spanish} for matching
+    answers: List[Any]
+
+class SyncEvent(BaseModel):
+    # Generated on the device; resending an event with the same id is a no-op
+    id: str = Field(..., min_length=1, max_length=64)
+    type: Literal["complete", "review", "lose_life", "gain_life"]
+    lesson_id: Optional[str] = None
+    score: int = 0
+    xp_earned: int = 0
+
+class SyncBatch(BaseModel):
+    events: List[SyncEvent]
+
 # ============= MAYA LANGUAGE CONTENT =============
 
-MAYA_LESSONS = [
-    # UNIT 1: GREETINGS (5 lessons)
-    {
-        "id": "u1l1",
-        "unit": 1,
-        "unit_title": "Saludos",
-        "order": 1,
-        "title": "Saludos Básicos",
-        "description": "Aprende los saludos básicos en Maya",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "¿Cómo se dice 'Hola' en Maya?",
-                "options": ["Ba'ax ka wa'alik", "Nib óolal", "Tu'ux ka bin", "Mix ba'al"],
-                "correct_answer": "Ba'ax ka wa'alik",
-                "audio_file": "baax_ka_waalik.mp3"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "¿Qué significa 'Nib óolal'?",
-                "options": ["Hola", "Adiós", "Gracias", "Por favor"],
-                "correct_answer": "Gracias"
-            },
-            {
-                "type": "matching",
-                "question": "Empareja las palabras",
-                "pairs": [
-                    {"maya": "Ba'ax ka wa'alik", "spanish": "Hola"},
-                    {"maya": "Nib óolal", "spanish": "Gracias"},
-                    {"maya": "Mix ba'al", "spanish": "De nada"}
-                ],
-                "correct_answer": "matched"
-            }
-        ]
-    },
-    {
-        "id": "u1l2",
-        "unit": 1,
-        "unit_title": "Saludos",
-        "order": 2,
-        "title": "Cómo estás",
-        "description": "Pregunta y responde cómo estás",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "Traduce al Maya: '¿Cómo estás?'",
-                "options": ["Bix a beel", "Ba'ax ka wa'alik", "Tu'ux ka bin", "Jach ki'"],
-                "correct_answer": "Bix a beel"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "'Jach ki' significa...",
-                "options": ["Muy bien", "Mal", "Regular", "Gracias"],
-                "correct_answer": "Muy bien"
-            },
-            {
-                "type": "translate",
-                "question": "¿Cómo se dice 'Estoy bien' en Maya?",
-                "options": ["Ma'alob", "Ko'oten", "Jach ki'", "Mix ba'al"],
-                "correct_answer": "Ma'alob"
-            }
-        ]
-    },
-    {
-        "id": "u1l3",
-        "unit": 1,
-        "unit_title": "Saludos",
-        "order": 3,
-        "title": "Despedidas",
-        "description": "Aprende a despedirte",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "Traduce: 'Adiós'",
-                "options": ["Jach ki'", "Jéetel u k'iin sáamal", "Ba'ax ka wa'alik", "Xen ich utsil"],
-                "correct_answer": "Xen ich utsil"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "¿Qué significa 'Jéetel u k'iin sáamal'?",
-                "options": ["Buenas noches", "Hasta mañana", "Buenas tardes", "Adiós"],
-                "correct_answer": "Hasta mañana"
-            },
-            {
-                "type": "matching",
-                "question": "Empareja",
-                "pairs": [
-                    {"maya": "Xen ich utsil", "spanish": "Adiós"},
-                    {"maya": "Jéetel u k'iin sáamal", "spanish": "Hasta mañana"},
-                    {"maya": "Ko'ox", "spanish": "Vamos"}
-                ],
-                "correct_answer": "matched"
-            }
-        ]
-    },
-    {
-        "id": "u1l4",
-        "unit": 1,
-        "unit_title": "Saludos",
-        "order": 4,
-        "title": "Por favor y perdón",
-        "description": "Expresiones de cortesía",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "'Por favor' en Maya es...",
-                "options": ["Meentik a wich", "Nib óolal", "P'áatal", "Ma'alob"],
-                "correct_answer": "Meentik a wich"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "¿Cómo pedir perdón?",
-                "options": ["P'áatal", "Nib óolal", "Mix ba'al", "Ko'ox"],
-                "correct_answer": "P'áatal"
-            },
-            {
-                "type": "translate",
-                "question": "Traduce: 'Disculpa'",
-                "options": ["P'áatal", "Meentik a wich", "Bix a beel", "Xen ich utsil"],
-                "correct_answer": "P'áatal"
-            }
-        ]
-    },
-    {
-        "id": "u1l5",
-        "unit": 1,
-        "unit_title": "Saludos",
-        "order": 5,
-        "title": "Repaso de Saludos",
-        "description": "Practica todo lo aprendido",
-        "xp_reward": 15,
-        "exercises": [
-            {
-                "type": "matching",
-                "question": "Empareja todas las expresiones",
-                "pairs": [
-                    {"maya": "Ba'ax ka wa'alik", "spanish": "Hola"},
-                    {"maya": "Nib óolal", "spanish": "Gracias"},
-                    {"maya": "Xen ich utsil", "spanish": "Adiós"},
-                    {"maya": "P'áatal", "spanish": "Perdón"}
-                ],
-                "correct_answer": "matched"
-            },
-            {
-                "type": "translate",
-                "question": "'¿Cómo estás?' en Maya",
-                "options": ["Bix a beel", "Ba'ax ka wa'alik", "Ma'alob", "Jach ki'"],
-                "correct_answer": "Bix a beel"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "Si alguien te ayuda, dices...",
-                "options": ["Nib óolal", "P'áatal", "Mix ba'al", "Ko'ox"],
-                "correct_answer": "Nib óolal"
-            }
-        ]
-    },
-    # UNIT 2: NUMBERS (3 lessons)
-    {
-        "id": "u2l1",
-        "unit": 2,
-        "unit_title": "Números",
-        "order": 1,
-        "title": "Números 1-5",
-        "description": "Aprende los primeros números",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "¿Cómo se dice 'uno' en Maya?",
-                "options": ["Jum", "Ka'", "Óox", "Kan"],
-                "correct_answer": "Jum"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "'Ka'' significa...",
-                "options": ["Uno", "Dos", "Tres", "Cuatro"],
-                "correct_answer": "Dos"
-            },
-            {
-                "type": "matching",
-                "question": "Empareja los números",
-                "pairs": [
-                    {"maya": "Jum", "spanish": "1"},
-                    {"maya": "Ka'", "spanish": "2"},
-                    {"maya": "Óox", "spanish": "3"}
-                ],
-                "correct_answer": "matched"
-            }
-        ]
-    },
-    {
-        "id": "u2l2",
-        "unit": 2,
-        "unit_title": "Números",
-        "order": 2,
-        "title": "Números 6-10",
-        "description": "Continúa con más números",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "'Seis' en Maya es...",
-                "options": ["Wakak", "Jo'", "Kan", "Láhun"],
-                "correct_answer": "Wakak"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "¿Qué número es 'Láhun'?",
-                "options": ["Ocho", "Nueve", "Diez", "Siete"],
-                "correct_answer": "Diez"
-            },
-            {
-                "type": "matching",
-                "question": "Empareja",
-                "pairs": [
-                    {"maya": "Wakak", "spanish": "6"},
-                    {"maya": "Wuk", "spanish": "7"},
-                    {"maya": "Láhun", "spanish": "10"}
-                ],
-                "correct_answer": "matched"
-            }
-        ]
-    },
-    {
-        "id": "u2l3",
-        "unit": 2,
-        "unit_title": "Números",
-        "order": 3,
-        "title": "Repaso de Números",
-        "description": "Practica todos los números",
-        "xp_reward": 15,
-        "exercises": [
-            {
-                "type": "matching",
-                "question": "Empareja todos los números",
-                "pairs": [
-                    {"maya": "Jum", "spanish": "1"},
-                    {"maya": "Ka'", "spanish": "2"},
-                    {"maya": "Óox", "spanish": "3"},
-                    {"maya": "Kan", "spanish": "4"}
-                ],
-                "correct_answer": "matched"
-            },
-            {
-                "type": "translate",
-                "question": "Traduce 'cinco'",
-                "options": ["Jo'", "Kan", "Óox", "Wakak"],
-                "correct_answer": "Jo'"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "¿Qué es 'Waxak'?",
-                "options": ["Seis", "Siete", "Ocho", "Nueve"],
-                "correct_answer": "Ocho"
-            }
-        ]
-    },
-    # UNIT 3: COLORS (3 lessons)
-    {
-        "id": "u3l1",
-        "unit": 3,
-        "unit_title": "Colores",
-        "order": 1,
-        "title": "Colores Básicos 1",
-        "description": "Aprende los colores principales",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "'Rojo' en Maya es...",
-                "options": ["Chak", "Sak", "K'an", "Box"],
-                "correct_answer": "Chak"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "¿Qué color es 'Sak'?",
-                "options": ["Rojo", "Blanco", "Negro", "Amarillo"],
-                "correct_answer": "Blanco"
-            },
-            {
-                "type": "matching",
-                "question": "Empareja los colores",
-                "pairs": [
-                    {"maya": "Chak", "spanish": "Rojo"},
-                    {"maya": "Sak", "spanish": "Blanco"},
-                    {"maya": "Box", "spanish": "Negro"}
-                ],
-                "correct_answer": "matched"
-            }
-        ]
-    },
-    {
-        "id": "u3l2",
-        "unit": 3,
-        "unit_title": "Colores",
-        "order": 2,
-        "title": "Colores Básicos 2",
-        "description": "Más colores en Maya",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "'Verde' en Maya",
-                "options": ["Ya'ax", "K'an", "Chak", "Ek'"],
-                "correct_answer": "Ya'ax"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "'K'an' significa...",
-                "options": ["Verde", "Amarillo", "Azul", "Rojo"],
-                "correct_answer": "Amarillo"
-            },
-            {
-                "type": "translate",
-                "question": "Traduce 'azul'",
-                "options": ["Ek'", "Ya'ax", "Chak", "Sak"],
-                "correct_answer": "Ya'ax"
-            }
-        ]
-    },
-    {
-        "id": "u3l3",
-        "unit": 3,
-        "unit_title": "Colores",
-        "order": 3,
-        "title": "Repaso de Colores",
-        "description": "Practica todos los colores",
-        "xp_reward": 15,
-        "exercises": [
-            {
-                "type": "matching",
-                "question": "Empareja todos",
-                "pairs": [
-                    {"maya": "Chak", "spanish": "Rojo"},
-                    {"maya": "Sak", "spanish": "Blanco"},
-                    {"maya": "K'an", "spanish": "Amarillo"},
-                    {"maya": "Box", "spanish": "Negro"}
-                ],
-                "correct_answer": "matched"
-            },
-            {
-                "type": "translate",
-                "question": "'Verde' es...",
-                "options": ["Ya'ax", "K'an", "Ek'", "Chak"],
-                "correct_answer": "Ya'ax"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "El cielo es azul: 'Ka'an ti' ...",
-                "options": ["Ya'ax", "Sak", "Box", "K'an"],
-                "correct_answer": "Ya'ax"
-            }
-        ]
-    },
-    # UNIT 4: FAMILY (4 lessons)
-    {
-        "id": "u4l1",
-        "unit": 4,
-        "unit_title": "Familia",
-        "order": 1,
-        "title": "Padres y Hermanos",
-        "description": "Aprende sobre la familia",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "'Padre' en Maya es...",
-                "options": ["Taata", "Maama", "Suku'un", "Iits'in"],
-                "correct_answer": "Taata"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "'Maama' significa...",
-                "options": ["Padre", "Madre", "Hermano", "Hermana"],
-                "correct_answer": "Madre"
-            },
-            {
-                "type": "matching",
-                "question": "Empareja",
-                "pairs": [
-                    {"maya": "Taata", "spanish": "Padre"},
-                    {"maya": "Maama", "spanish": "Madre"},
-                    {"maya": "Suku'un", "spanish": "Hermano mayor"}
-                ],
-                "correct_answer": "matched"
-            }
-        ]
-    },
-    {
-        "id": "u4l2",
-        "unit": 4,
-        "unit_title": "Familia",
-        "order": 2,
-        "title": "Abuelos",
-        "description": "Los mayores de la familia",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "'Abuelo' en Maya",
-                "options": ["Nool", "Chich", "Taata", "Iits'in"],
-                "correct_answer": "Nool"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "'Chich' es...",
-                "options": ["Abuelo", "Abuela", "Tío", "Tía"],
-                "correct_answer": "Abuela"
-            },
-            {
-                "type": "translate",
-                "question": "Traduce 'abuela'",
-                "options": ["Chich", "Nool", "Maama", "Iits'in"],
-                "correct_answer": "Chich"
-            }
-        ]
-    },
-    {
-        "id": "u4l3",
-        "unit": 4,
-        "unit_title": "Familia",
-        "order": 3,
-        "title": "Tíos y Primos",
-        "description": "Familia extendida",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "'Tío' en Maya es...",
-                "options": ["Tío (préstamo)", "Nool", "Taata", "Suku'un"],
-                "correct_answer": "Tío (préstamo)"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "Primo se dice...",
-                "options": ["Lak'ech", "Iits'in", "Suku'un", "Ki'ichpan"],
-                "correct_answer": "Lak'ech"
-            },
-            {
-                "type": "matching",
-                "question": "Empareja",
-                "pairs": [
-                    {"maya": "Lak'ech", "spanish": "Primo"},
-                    {"maya": "Iits'in", "spanish": "Hermano menor"},
-                    {"maya": "Ki'ichpan", "spanish": "Hermana"}
-                ],
-                "correct_answer": "matched"
-            }
-        ]
-    },
-    {
-        "id": "u4l4",
-        "unit": 4,
-        "unit_title": "Familia",
-        "order": 4,
-        "title": "Repaso Familia",
-        "description": "Toda la familia junta",
-        "xp_reward": 15,
-        "exercises": [
-            {
-                "type": "matching",
-                "question": "Empareja toda la familia",
-                "pairs": [
-                    {"maya": "Taata", "spanish": "Padre"},
-                    {"maya": "Maama", "spanish": "Madre"},
-                    {"maya": "Nool", "spanish": "Abuelo"},
-                    {"maya": "Chich", "spanish": "Abuela"}
-                ],
-                "correct_answer": "matched"
-            },
-            {
-                "type": "translate",
-                "question": "'Hermano mayor' es...",
-                "options": ["Suku'un", "Iits'in", "Lak'ech", "Taata"],
-                "correct_answer": "Suku'un"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "¿Quién es 'Iits'in'?",
-                "options": ["Hermano mayor", "Hermano menor", "Primo", "Tío"],
-                "correct_answer": "Hermano menor"
-            }
-        ]
-    },
-    # UNIT 5: COMMON VERBS (5 lessons)
-    {
-        "id": "u5l1",
-        "unit": 5,
-        "unit_title": "Verbos Comunes",
-        "order": 1,
-        "title": "Verbos de Movimiento",
-        "description": "Verbos básicos de acción",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "'Ir' en Maya es...",
-                "options": ["Bin", "Táal", "T'aan", "Uk'ul"],
-                "correct_answer": "Bin"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "'Táal' significa...",
-                "options": ["Ir", "Venir", "Hablar", "Comer"],
-                "correct_answer": "Venir"
-            },
-            {
-                "type": "matching",
-                "question": "Empareja",
-                "pairs": [
-                    {"maya": "Bin", "spanish": "Ir"},
-                    {"maya": "Táal", "spanish": "Venir"},
-                    {"maya": "Xíimbal", "spanish": "Caminar"}
-                ],
-                "correct_answer": "matched"
-            }
-        ]
-    },
-    {
-        "id": "u5l2",
-        "unit": 5,
-        "unit_title": "Verbos Comunes",
-        "order": 2,
-        "title": "Verbos de Comunicación",
-        "description": "Hablar y escuchar",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "'Hablar' en Maya",
-                "options": ["T'aan", "Uk'ul", "Bin", "Cha'ik"],
-                "correct_answer": "T'aan"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "'Uk'ul' significa...",
-                "options": ["Hablar", "Escuchar", "Ver", "Pensar"],
-                "correct_answer": "Escuchar"
-            },
-            {
-                "type": "translate",
-                "question": "Traduce 'ver'",
-                "options": ["Ilik", "T'aan", "Uk'ul", "Bin"],
-                "correct_answer": "Ilik"
-            }
-        ]
-    },
-    {
-        "id": "u5l3",
-        "unit": 5,
-        "unit_title": "Verbos Comunes",
-        "order": 3,
-        "title": "Verbos de Necesidad",
-        "description": "Comer, beber, dormir",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "'Comer' en Maya es...",
-                "options": ["Janal", "Uk'ul", "Wenel", "Cha'ik"],
-                "correct_answer": "Janal"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "'Uk'ul' es...",
-                "options": ["Comer", "Beber", "Dormir", "Despertar"],
-                "correct_answer": "Beber"
-            },
-            {
-                "type": "matching",
-                "question": "Empareja",
-                "pairs": [
-                    {"maya": "Janal", "spanish": "Comer"},
-                    {"maya": "Uk'ul", "spanish": "Beber"},
-                    {"maya": "Wenel", "spanish": "Dormir"}
-                ],
-                "correct_answer": "matched"
-            }
-        ]
-    },
-    {
-        "id": "u5l4",
-        "unit": 5,
-        "unit_title": "Verbos Comunes",
-        "order": 4,
-        "title": "Verbos de Estado",
-        "description": "Ser, estar, tener",
-        "xp_reward": 10,
-        "exercises": [
-            {
-                "type": "translate",
-                "question": "'Querer/Amar' en Maya",
-                "options": ["Yaakun", "K'áat", "Bin", "Táal"],
-                "correct_answer": "Yaakun"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "'K'áat' significa...",
-                "options": ["Amar", "Querer (desear)", "Tener", "Ser"],
-                "correct_answer": "Querer (desear)"
-            },
-            {
-                "type": "translate",
-                "question": "'Saber' en Maya",
-                "options": ["Ojel", "K'áat", "Yaakun", "T'aan"],
-                "correct_answer": "Ojel"
-            }
-        ]
-    },
-    {
-        "id": "u5l5",
-        "unit": 5,
-        "unit_title": "Verbos Comunes",
-        "order": 5,
-        "title": "Repaso de Verbos",
-        "description": "Practica todos los verbos",
-        "xp_reward": 15,
-        "exercises": [
-            {
-                "type": "matching",
-                "question": "Empareja todos",
-                "pairs": [
-                    {"maya": "Bin", "spanish": "Ir"},
-                    {"maya": "Táal", "spanish": "Venir"},
-                    {"maya": "T'aan", "spanish": "Hablar"},
-                    {"maya": "Janal", "spanish": "Comer"}
-                ],
-                "correct_answer": "matched"
-            },
-            {
-                "type": "translate",
-                "question": "'Dormir' es...",
-                "options": ["Wenel", "Uk'ul", "Ilik", "Xíimbal"],
-                "correct_answer": "Wenel"
-            },
-            {
-                "type": "multiple_choice",
-                "question": "Si quieres expresar amor, usas...",
-                "options": ["Yaakun", "K'áat", "Ojel", "Bin"],
-                "correct_answer": "Yaakun"
-            }
-        ]
-    }
-]
-
-# Tips for each unit
-UNIT_TIPS = {
-    1: {
-        "title": "Consejos: Saludos en Maya",
-        "grammar": [
-            "El Maya Yucateco usa sonidos que no existen en español, como la oclusiva glotal (')",
-            "Los saludos varían según el contexto formal o informal",
-            "'Ba'ax ka wa'alik' literalmente significa '¿qué dices?' y es un saludo informal común.",
-            "Para responder a 'Ba'ax ka wa'alik', puedes decir 'Ma'alob' (Bien) o 'Mix ba'al' (Nada nuevo)."
-        ],
-        "pronunciation": [
-            "' (apóstrofe): representa una pausa glotal, un corte repentino de aire (como en 'uh-oh').",
-            "x: se pronuncia como 'sh' en inglés (ej. 'Xen' suena como 'Shen').",
-            "k': se pronuncia con más fuerza que una 'k' normal, desde la garganta."
-        ],
-        "vocabulary": [
-            "Ba'ax ka wa'alik - Hola / ¿Qué onda?",
-            "Nib óolal - Gracias (literalmente 'gran corazón')",
-            "Bix a beel - ¿Cómo estás? (más formal)",
-            "Ma'alob - Bien / Bueno",
-            "Xen ich utsil - Adiós (Que te vaya bien)"
-        ]
-    },
-    2: {
-        "title": "Consejos: Números en Maya",
-        "grammar": [
-            "El sistema numérico maya es vigesimal (base 20)",
-            "Los números básicos se combinan para formar números mayores",
-            "El cero fue inventado por los mayas"
-        ],
-        "pronunciation": [
-            "': pausa glotal importante en números",
-            "Jum: se pronuncia 'hum'",
-            "Ka': 'ka' con pausa al final"
-        ],
-        "vocabulary": [
-            "Jum - 1",
-            "Ka' - 2",
-            "Óox - 3",
-            "Kan - 4",
-            "Jo' - 5",
-            "Wakak - 6",
-            "Wuk - 7",
-            "Waxak - 8",
-            "Bolon - 9",
-            "Láhun - 10"
-        ]
-    },
-    3: {
-        "title": "Consejos: Colores en Maya",
-        "grammar": [
-            "Los colores en maya tienen significados cosmológicos",
-            "Los cuatro colores principales representan direcciones cardinales",
-            "Chak (rojo) = Este, Sak (blanco) = Norte, Box (negro) = Oeste, K'an (amarillo) = Sur"
-        ],
-        "pronunciation": [
-            "Ya'ax: 'yah-ash'",
-            "K'an: 'k'ahn' con k' explosiva",
-            "Chak: 'chahk'"
-        ],
-        "vocabulary": [
-            "Chak - Rojo",
-            "Sak - Blanco",
-            "Box - Negro",
-            "K'an - Amarillo",
-            "Ya'ax - Verde/Azul"
-        ]
-    },
-    4: {
-        "title": "Consejos: Familia en Maya",
-        "grammar": [
-            "La familia es central en la cultura maya",
-            "Existen términos específicos para hermanos mayores y menores",
-            "El respeto a los mayores se refleja en el lenguaje"
-        ],
-        "pronunciation": [
-            "Suku'un: 'suku-un' con pausa glotal",
-            "Iits'in: 'iits-in'",
-            "Nool: 'nohl'"
-        ],
-        "vocabulary": [
-            "Taata - Padre",
-            "Maama - Madre",
-            "Suku'un - Hermano mayor",
-            "Iits'in - Hermano menor",
-            "Nool - Abuelo",
-            "Chich - Abuela"
-        ]
-    },
-    5: {
-        "title": "Consejos: Verbos Comunes",
-        "grammar": [
-            "Los verbos mayas se conjugan con prefijos y sufijos",
-            "El tiempo verbal se marca con partículas especiales",
-            "Muchos verbos tienen raíces de dos consonantes"
-        ],
-        "pronunciation": [
-            "T'aan: 't'ahn' con t' explosiva",
-            "Uk'ul: 'u-k'ul'",
-            "Xíimbal: 'shim-bal'"
-        ],
-        "vocabulary": [
-            "Bin - Ir",
-            "Táal - Venir",
-            "T'aan - Hablar",
-            "Uk'ul - Beber/Escuchar",
-            "Janal - Comer",
-            "Wenel - Dormir",
-            "Ilik - Ver",
-            "Yaakun - Amar"
-        ]
-    }
-}
-
-# Dictionary data
-DICTIONARY = [
-    # Greetings
-    {"maya": "Ba'ax ka wa'alik", "spanish": "Hola", "category": "Saludos"},
-    {"maya": "Nib óolal", "spanish": "Gracias", "category": "Saludos"},
-    {"maya": "Bix a beel", "spanish": "¿Cómo estás?", "category": "Saludos"},
-    {"maya": "Ma'alob", "spanish": "Bien", "category": "Saludos"},
-    {"maya": "Xen ich utsil", "spanish": "Adiós", "category": "Saludos"},
-    {"maya": "P'áatal", "spanish": "Perdón/Disculpa", "category": "Saludos"},
-    # Numbers
-    {"maya": "Jum", "spanish": "Uno", "category": "Números"},
-    {"maya": "Ka'", "spanish": "Dos", "category": "Números"},
-    {"maya": "Óox", "spanish": "Tres", "category": "Números"},
-    {"maya": "Kan", "spanish": "Cuatro", "category": "Números"},
-    {"maya": "Jo'", "spanish": "Cinco", "category": "Números"},
-    {"maya": "Wakak", "spanish": "Seis", "category": "Números"},
-    {"maya": "Wuk", "spanish": "Siete", "category": "Números"},
-    {"maya": "Waxak", "spanish": "Ocho", "category": "Números"},
-    {"maya": "Bolon", "spanish": "Nueve", "category": "Números"},
-    {"maya": "Láhun", "spanish": "Diez", "category": "Números"},
-    # Colors
-    {"maya": "Chak", "spanish": "Rojo", "category": "Colores"},
-    {"maya": "Sak", "spanish": "Blanco", "category": "Colores"},
-    {"maya": "Box", "spanish": "Negro", "category": "Colores"},
-    {"maya": "K'an", "spanish": "Amarillo", "category": "Colores"},
-    {"maya": "Ya'ax", "spanish": "Verde/Azul", "category": "Colores"},
-    # Family
-    {"maya": "Taata", "spanish": "Padre", "category": "Familia"},
-    {"maya": "Maama", "spanish": "Madre", "category": "Familia"},
-    {"maya": "Suku'un", "spanish": "Hermano mayor", "category": "Familia"},
-    {"maya": "Iits'in", "spanish": "Hermano menor", "category": "Familia"},
-    {"maya": "Nool", "spanish": "Abuelo", "category": "Familia"},
-    {"maya": "Chich", "spanish": "Abuela", "category": "Familia"},
-    # Verbs
-    {"maya": "Bin", "spanish": "Ir", "category": "Verbos"},
-    {"maya": "Táal", "spanish": "Venir", "category": "Verbos"},
-    {"maya": "T'aan", "spanish": "Hablar", "category": "Verbos"},
-    {"maya": "Uk'ul", "spanish": "Beber/Escuchar", "category": "Verbos"},
-    {"maya": "Janal", "spanish": "Comer", "category": "Verbos"},
-    {"maya": "Wenel", "spanish": "Dormir", "category": "Verbos"},
-    {"maya": "Ilik", "spanish": "Ver", "category": "Verbos"},
-    {"maya": "Yaakun", "spanish": "Amar", "category": "Verbos"},
-    {"maya": "Xíimbal", "spanish": "Caminar", "category": "Verbos"}
-    ,{"maya": "Balam", "spanish": "Jaguar", "category": "Animales"}
-    ,{"maya": "P'éek", "spanish": "Perro", "category": "Animales"}
-    ,{"maya": "Míis", "spanish": "Gato", "category": "Animales"}
-    ,{"maya": "Ch'íich", "spanish": "Pájaro", "category": "Animales"}
-    ,{"maya": "Kaay", "spanish": "Pez", "category": "Animales"}
-    ,{"maya": "Ha'", "spanish": "Agua", "category": "Naturaleza"}
-    ,{"maya": "K'áak'", "spanish": "Fuego", "category": "Naturaleza"}
-    ,{"maya": "Ik'", "spanish": "Aire", "category": "Naturaleza"}
-    ,{"maya": "Lu'um", "spanish": "Tierra", "category": "Naturaleza"}
-    ,{"maya": "K'iin", "spanish": "Sol", "category": "Naturaleza"}
-    ,{"maya": "Uh", "spanish": "Luna", "category": "Naturaleza"}
-    ,{"maya": "Ek'", "spanish": "Estrella", "category": "Naturaleza"}
-    ,{"maya": "Che'", "spanish": "Árbol", "category": "Naturaleza"}
-    ,{"maya": "Nikté'", "spanish": "Flor", "category": "Naturaleza"}
-    ,{"maya": "Ixim", "spanish": "Maíz", "category": "Comida"}
-    ,{"maya": "Waaj", "spanish": "Tortilla", "category": "Comida"}
-    ,{"maya": "Naj", "spanish": "Casa", "category": "Objetos"}
-    ,{"maya": "U k'áat", "spanish": "Por favor", "category": "Saludos"}
-    ,{"maya": "Ma' k'áatchi'", "spanish": "De nada", "category": "Saludos"}
-    ,{"maya": "Noj", "spanish": "Grande", "category": "Adjetivos"}
-    ,{"maya": "Chan", "spanish": "Pequeño", "category": "Adjetivos"}
-]
+# Lessons, tips and dictionary live in versioned packs under content/ and can be
+# reloaded without a restart (file watcher or /api/admin/content/reload)
+content = ContentRegistry(ROOT_DIR / "content")
+CONTENT_WATCH_SECONDS = float(os.environ.get("CONTENT_WATCH_SECONDS", "10"))
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
+# Content only changes with a new pack; ETags include the pack version
+LESSON_CACHE_CONTROL = "private, max-age=300, stale-while-revalidate=86400"
+TIPS_CACHE_CONTROL = "private, max-age=300, stale-while-revalidate=86400"
+DICTIONARY_CACHE_CONTROL = "private, max-age=60, stale-while-revalidate=3600"
+
+# Lesson progress lives on the user document, keyed by lesson ordinal
+progress_store = ProgressStore(db.users, db.progress, lambda: content.current.catalog.ordinals)
+
+# XP and lives are changed with atomic server-side updates
+user_counters = UserCounters(db.users)
+
+# Lessons started and graded on the server (answers submitted once at the end)
+lesson_sessions = LessonSessions(
+    db.users,
+    progress_store,
+    secret=SECRET_KEY,
+    ttl_seconds=float(os.environ.get("LESSON_SESSION_TTL_SECONDS", "3600")),
+)
+
+# Offline events synced in batches, deduplicated by event id
+event_sync = EventSync(
+    db.users,
+    db.sync_events,
+    progress_store,
+    ttl_seconds=float(os.environ.get("SYNC_EVENT_TTL_DAYS", "30")) * 24 * 3600,
+)
+SYNC_MAX_EVENTS = int(os.environ.get("SYNC_MAX_EVENTS", "200"))
+
+# Responses of mutating requests sent with an Idempotency-Key, replayed on retries
+idempotency_store = IdempotencyStore(
+    db.idempotency_keys,
+    ttl_seconds=float(os.environ.get("IDEMPOTENCY_TTL_HOURS", "24")) * 3600,
+    max_entries=int(os.environ.get("IDEMPOTENCY_CACHE_MAX_ENTRIES", "10000")),
+)
+# Token responses must not be persisted; proxies and admin calls have no side effects worth deduplicating
+IDEMPOTENCY_EXCLUDED_PATHS = ("/api/auth/", "/api/speak", "/api/translate", "/api/admin/")
 
 # ============= HELPER FUNCTIONS =============
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password, hashed_password):
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordPoolSaturated:
+        raise HTTPException(status_code=503, detail="Server busy, try again", headers={"Retry-After": "1"})
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password):
+    try:
+        return await password_hasher.hash(password)
+    except PasswordPoolSaturated:
+        raise HTTPException(status_code=503, detail="Server busy, try again", headers={"Retry-After": "1"})
 
-def create_access_token(data: dict):
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire})
+    now = datetime.utcnow()
+    expire = now + (expires_delta or timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS))
+    # Fractional "iat", so a logout-all only catches tokens issued before it, even within the same second
+    to_encode.update({"exp": expire, "iat": time.time()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
+def user_claims(user: dict) -> dict:
+    """User fields embedded in access tokens: only the ones that never change"""
+    return {"email": user["email"], "username": user["username"]}
+
+# Everything /auth/me needs besides the token claims
+USER_MUTABLE_FIELDS = {"xp": 1, "lives": 1, "streak": 1, "profile_image_url": 1, "last_activity": 1}
+
+async def issue_tokens(user: dict, refresh_token: Optional[str] = None) -> dict:
+    """Short-lived access token plus a refresh token, or a legacy long-lived token without Mongo"""
+    user_id = str(user["_id"])
+    if refresh_token is None:
+        try:
+            refresh_token = await refresh_tokens.issue(user_id)
+        except Exception as e:
+            print(f"Refresh token store unavailable, issuing long-lived token: {e}")
+            return {"access_token": create_access_token(data={"sub": user_id}), "token_type": "bearer"}
+    expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user_id, "jti": uuid.uuid4().hex, "user": user_claims(user)},
+        expires_delta=expires,
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+        "expires_in": int(expires.total_seconds()),
+    }
+
+def decode_access_token(token: str) -> dict:
+    """Verified claims of ``token``, from the token cache when possible"""
+    payload = token_cache.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
             raise HTTPException(status_code=401, detail="Invalid authentication")
-    except JWTError:
+        token_cache.put(token, payload)
+    return payload
+
+async def idempotency_user(authorization: Optional[bytes]) -> Optional[str]:
+    """User id of a valid, non-revoked bearer token, the scope of idempotency keys"""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    try:
+        # A revoked token must not replay stored responses either
+        payload = await authenticate(HTTPAuthorizationCredentials(scheme=scheme, credentials=token.strip()))
+    except HTTPException:
+        return None
+    return payload["sub"]
+
+async def authenticate(credentials: HTTPAuthorizationCredentials) -> dict:
+    """Verified, non-revoked claims of the bearer token"""
+    payload = decode_access_token(credentials.credentials)
+    if payload.get("sub") is None:
         raise HTTPException(status_code=401, detail="Invalid authentication")
+    # Tokens from before "iat" was added: assume they were issued as late as possible
+    issued_at = payload.get("iat", payload["exp"] - ACCESS_TOKEN_EXPIRE_DAYS * 24 * 3600)
+    try:
+        revoked = await revoked_tokens.is_revoked(payload["sub"], payload.get("jti"), issued_at)
+    except Exception as e:
+        print(f"Revocation check failed: {e}")
+        raise HTTPException(status_code=503, detail="Token service unavailable")
+    if revoked:
+        raise HTTPException(status_code=401, detail="Token revoked")
+    return payload
+
+async def get_current_identity(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Only the authenticated user id, for endpoints that never read the user document"""
+    payload = await authenticate(credentials)
+    return {"_id": payload["sub"]}
+
+async def get_token_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """User with email and username from the token claims and the rest read fresh.
+
+    XP, lives and streak change on every lesson, so they come from the user
+    cache or, on a miss, one projected fetch (never from the token). Legacy
+    tokens without claims and file DB users fall back to ``load_user``.
+    """
+    payload = await authenticate(credentials)
+    user_id = payload["sub"]
+    claims = payload.get("user")
+    if not isinstance(claims, dict):
+        return await load_user(user_id)
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    try:
+        fields = await db.users.find_one({"_id": ObjectId(user_id)}, USER_MUTABLE_FIELDS)
+    except Exception:
+        fields = None
+    if fields is None:
+        return await load_user(user_id)
+    return {**fields, "email": claims["email"], "username": claims["username"]}
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    payload = await authenticate(credentials)
+    return await load_user(payload["sub"])
+
+async def load_user(user_id: str) -> dict:
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
     # Try DB first
     try:
         user = await db.users.find_one({"_id": ObjectId(user_id)})
         if user is not None:
+            user_cache.put(user_id, user)
             return user
     except Exception:
         pass
@@ -941,6 +384,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     user = next((u for u in users if u.get('_id') == user_id), None)
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
+    user_cache.put(user_id, user)
     return user
 
 def calculate_level(xp: int) -> int:
@@ -957,7 +401,7 @@ async def signup(user_data: UserSignup):
         existing_user = await db.users.find_one({"email": email})
         if existing_user:
             raise HTTPException(status_code=400, detail="Email already registered")
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash(user_data.password)
         user_doc = {
             "email": email,
             "username": user_data.username,
@@ -969,16 +413,17 @@ async def signup(user_data: UserSignup):
             "created_at": datetime.utcnow()
         }
         result = await db.users.insert_one(user_doc)
-        user_id = str(result.inserted_id)
-        access_token = create_access_token(data={"sub": user_id})
-        return {"access_token": access_token, "token_type": "bearer"}
+        user_doc["_id"] = result.inserted_id
+        return await issue_tokens(user_doc)
     except Exception as e:
+        if isinstance(e, HTTPException) and e.status_code == 503:
+            raise
         users = filedb_load(USERS_FILE)
         if any(u.get('email') == email for u in users):
             raise HTTPException(status_code=400, detail="Email already registered")
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash(user_data.password)
         user_id = str(uuid.uuid4())
-        users.append({
+        user_doc = {
             "_id": user_id,
             "email": email,
             "username": user_data.username,
@@ -988,17 +433,17 @@ async def signup(user_data: UserSignup):
             "streak": 0,
             "last_activity": datetime.utcnow().isoformat(),
             "created_at": datetime.utcnow().isoformat(),
-        })
+        }
+        users.append(user_doc)
         filedb_save(USERS_FILE, users)
-        access_token = create_access_token(data={"sub": user_id})
-        return {"access_token": access_token, "token_type": "bearer"}
+        return await issue_tokens(user_doc)
 
 @api_router.post("/auth/login", response_model=Token)
 async def login(user_data: UserLogin):
     email = user_data.email.strip().lower()
     try:
         user = await db.users.find_one({"email": email})
-        if not user or not verify_password(user_data.password, user["password"]):
+        if not user or not await verify_password(user_data.password, user["password"]):
             raise HTTPException(status_code=401, detail="Incorrect email or password")
         last_activity = user.get("last_activity")
         current_streak = user.get("streak", 0)
@@ -1010,28 +455,80 @@ async def login(user_data: UserLogin):
                 current_streak = 1
         else:
             current_streak = 1
-        await db.users.update_one(
-            {"_id": user["_id"]},
-            {"$set": {"last_activity": datetime.utcnow(), "streak": current_streak}}
-        )
-        access_token = create_access_token(data={"sub": str(user["_id"])})
-        return {"access_token": access_token, "token_type": "bearer"}
+        activity = {"last_activity": datetime.utcnow(), "streak": current_streak}
+        await db.users.update_one({"_id": user["_id"]}, {"$set": activity})
+        user_cache.update(str(user["_id"]), activity)
+        return await issue_tokens({**user, **activity})
     except Exception as e:
+        if isinstance(e, HTTPException) and e.status_code == 503:
+            raise
         users = filedb_load(USERS_FILE)
         user = next((u for u in users if u.get('email') == email), None)
-        if not user or not verify_password(user_data.password, user.get("password", "")):
+        if not user or not await verify_password(user_data.password, user.get("password", "")):
             raise HTTPException(status_code=401, detail="Incorrect email or password")
-        access_token = create_access_token(data={"sub": user.get("_id")})
-        return {"access_token": access_token, "token_type": "bearer"}
+        return await issue_tokens(user)
+
+@api_router.post("/auth/refresh", response_model=Token)
+async def refresh(body: RefreshRequest):
+    """Exchange a refresh token for a new token pair (the old one is consumed)"""
+    try:
+        user_id, refresh_token = await refresh_tokens.rotate(body.refresh_token)
+    except RefreshTokenError:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    except Exception as e:
+        print(f"Refresh token store error: {e}")
+        raise HTTPException(status_code=503, detail="Token service unavailable")
+    # Fresh claims: the new access token must reflect the current user document
+    user_cache.invalidate(user_id)
+    try:
+        user = await db.users.find_one({"_id": ObjectId(user_id)})
+    except Exception:
+        user = None
+    if user is None:
+        await refresh_tokens.revoke(refresh_token)
+        raise HTTPException(status_code=401, detail="User not found")
+    user_cache.put(user_id, user)
+    return await issue_tokens(user, refresh_token)
+
+@api_router.post("/auth/logout")
+async def logout(body: Optional[LogoutRequest] = None, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Revoke the current access token (and its refresh token, if sent)"""
+    payload = await authenticate(credentials)
+    try:
+        if payload.get("jti"):
+            await revoked_tokens.revoke_token(payload["jti"], datetime.utcfromtimestamp(payload["exp"]))
+        if body is not None and body.refresh_token:
+            await refresh_tokens.revoke(body.refresh_token)
+    except Exception as e:
+        print(f"Logout failed: {e}")
+        raise HTTPException(status_code=503, detail="Token service unavailable")
+    return {"message": "Logged out"}
+
+@api_router.post("/auth/logout-all")
+async def logout_all(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Revoke every access and refresh token of the current user"""
+    payload = await authenticate(credentials)
+    user_id = payload["sub"]
+    now = datetime.utcnow()
+    try:
+        # Cubre también los tokens heredados de 30 días
+        await revoked_tokens.revoke_user(user_id, time.time(), now + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS))
+        await refresh_tokens.revoke_user(user_id)
+    except Exception as e:
+        print(f"Logout of all devices failed: {e}")
+        raise HTTPException(status_code=503, detail="Token service unavailable")
+    user_cache.invalidate(user_id)
+    return {"message": "Logged out of all devices"}
 
 @api_router.get("/auth/me", response_model=UserResponse)
-async def get_me(current_user: dict = Depends(get_current_user)):
+async def get_me(current_user: dict = Depends(get_token_user)):
     la = current_user.get("last_activity")
     if isinstance(la, datetime):
         la_str = la.isoformat()
     else:
         la_str = la if isinstance(la, str) else None
-    return {
+    # Built field by field with the right types, so UserResponse validation is skipped
+    return ORJSONResponse({
         "id": str(current_user.get("_id")),
         "email": current_user["email"],
         "username": current_user["username"],
@@ -1041,48 +538,118 @@ async def get_me(current_user: dict = Depends(get_current_user)):
         "level": calculate_level(int(current_user.get("xp", 0))),
         "profile_image_url": current_user.get("profile_image_url"),
         "last_activity": la_str,
-    }
+    })
 
 # ============= AUDIO PROXY ENDPOINT =============
 
 class SpeakRequest(BaseModel):
     text: str
 
-@api_router.post("/speak")
-async def speak_proxy(request: SpeakRequest):
-    url = "https://api.cognitive.microsofttranslator.com/speak"
-    params = {
-        "api-version": "3.0",
-        "language": "yua-MX",
-        "format": "audio/mp3",
-        "options": "Male"
-    }
-    az_key = os.getenv("AZURE_TRANSLATOR_KEY", "")
-    az_region = os.getenv("AZURE_TRANSLATOR_REGION", "centralus")
-    if not az_key:
-        raise HTTPException(status_code=500, detail="Missing AZURE_TRANSLATOR_KEY in environment")
+async def cached_audio_response(cached, http_request: Request):
+    """Serve a cache hit straight from disk, honouring If-None-Match and Range."""
     headers = {
-        "Ocp-Apim-Subscription-Key": az_key,
-        "Ocp-Apim-Subscription-Region": az_region,
-        "Content-Type": "application/json"
+        "ETag": cached.etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "public, max-age=31536000, immutable",
     }
-    
+    if etag_matches(http_request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = http_request.headers.get("range")
+    if range_header:
+        byte_range = parse_byte_range(range_header, cached.size)
+        if byte_range is None:
+            headers["Content-Range"] = f"bytes */{cached.size}"
+            return Response(status_code=416, headers=headers)
+        if byte_range:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{cached.size}"
+            data = await run_in_threadpool(read_range, cached.path, start, end)
+            return Response(content=data, status_code=206, media_type=SPEAK_FORMAT, headers=headers)
+    return FileResponse(cached.path, media_type=SPEAK_FORMAT, headers=headers)
+
+# Peticiones idénticas en vuelo comparten una sola llamada a Azure
+speak_flights: Dict[str, StreamFanout] = {}
+speak_flight_stats = {"leaders": 0, "coalesced": 0}
+_speak_pumps = set()
+
+async def pump_speech(text: str, key: str, flight: StreamFanout):
+    """Call Azure TTS, read the audio into the cache and fan it out to every waiting client."""
     try:
-        # Microsoft Translator Speak API expects body with [{"Text": "..."}]
-        body = [{"Text": request.text}]
-        
-        # We use stream=True to pass the audio data directly to the client
-        response = requests.post(url, params=params, headers=headers, json=body, stream=True)
-        
-        if response.status_code != 200:
-            print(f"Error from Microsoft: {response.text}")
-            raise HTTPException(status_code=response.status_code, detail="Error from Microsoft API")
-            
-        return StreamingResponse(response.iter_content(chunk_size=1024), media_type="audio/mp3")
-        
-    except Exception as e:
-        print(f"Proxy error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        response = await azure_client.open_speech(
+            text, language=SPEAK_LANGUAGE, audio_format=SPEAK_FORMAT, voice=SPEAK_VOICE,
+            timeout=SPEAK_TIMEOUT_SECONDS,
+        )
+    except BaseException as e:
+        flight.finish(e)
+        speak_flights.pop(key, None)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+        return
+    flight.start()
+    writer = audio_cache.writer(key)
+    try:
+        async for chunk in azure_client.iter_speech(response):
+            writer.write(chunk)
+            flight.publish(chunk)
+    except BaseException as e:
+        writer.abort()
+        flight.finish(e)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+        print(f"Speak stream error: {e}")
+    else:
+        writer.commit()
+        flight.finish()
+    finally:
+        speak_flights.pop(key, None)
+
+async def start_speech_flight(text: str, key: str) -> StreamFanout:
+    flight = StreamFanout()
+    speak_flights[key] = flight
+    speak_flight_stats["leaders"] += 1
+    # The pump (Azure call included) outlives the leader's request, so a leader
+    # disconnect, even before Azure answers, does not cut off the waiters
+    task = asyncio.create_task(pump_speech(text, key, flight))
+    _speak_pumps.add(task)
+    task.add_done_callback(_speak_pumps.discard)
+    await flight.wait_started()
+    return flight
+
+async def speak(text: str, http_request: Request):
+    key = audio_key(text, SPEAK_LANGUAGE, SPEAK_VOICE, SPEAK_FORMAT)
+    baked = baked_audio.get(key)
+    if baked is not None:
+        return await cached_audio_response(baked, http_request)
+    cached = audio_cache.get(key)
+    if cached is not None:
+        return await cached_audio_response(cached, http_request)
+
+    if not azure_client.configured:
+        raise HTTPException(status_code=500, detail="Missing AZURE_TRANSLATOR_KEY in environment")
+    try:
+        flight = speak_flights.get(key)
+        if flight is None:
+            flight = await start_speech_flight(text, key)
+        else:
+            speak_flight_stats["coalesced"] += 1
+            await flight.wait_started()
+    except AzureTranslatorError as e:
+        print(f"Error from Microsoft: {e.detail}")
+        raise HTTPException(status_code=e.status_code, detail="Error from Microsoft API")
+
+    # Pasamos el audio al cliente chunk por chunk, conforme llega de Azure
+    # (se guarda en cache para la siguiente vez)
+    return StreamingResponse(flight.subscribe(), media_type=SPEAK_FORMAT)
+
+@api_router.post("/speak")
+async def speak_proxy(request: SpeakRequest, http_request: Request):
+    return await speak(request.text, http_request)
+
+@api_router.get("/speak")
+async def speak_get(text: str, http_request: Request):
+    """Same as POST /speak, usable directly as an <audio> src (supports Range)"""
+    return await speak(text, http_request)
 
 class TranslateRequest(BaseModel):
     text: str
@@ -1090,184 +657,237 @@ class TranslateRequest(BaseModel):
     to_lang: str = "yua"
 
 # ----------------- FUNCIÓN MEJORADA DE TRADUCCIÓN -----------------
+class TranslateBatchRequest(BaseModel):
+    texts: List[str] = Field(..., max_length=1000)
+    from_lang: str = "es"
+    to_lang: str = "yua"
+
+def translate_locally(text: str, from_lang: str, to_lang: str) -> Optional[dict]:
+    """Dictionary answer for ``text`` (ignoring case, accents and apostrophe style), or None"""
+    local = content.current.dictionary_index.translate(text, from_lang, to_lang)
+    return {"text": local} if local is not None else None
+
+def with_suggestion(result: dict, text: str, from_lang: str, to_lang: str) -> dict:
+    """Add the closest dictionary entry as ``did_you_mean``.
+
+    Only a hint next to the real answer: a near miss is as likely to be a
+    different word (noche / ocho) as a typo, so it is never used as the translation.
+    """
+    fuzzy = content.current.dictionary_index.translate_fuzzy(text, from_lang, to_lang)
+    if fuzzy is not None:
+        result["did_you_mean"] = fuzzy[1]
+    return result
+
+async def translate_with_azure(text: str, from_lang: str, to_lang: str) -> Optional[str]:
+    """Azure translation of ``text``, cached either way; None if Azure failed"""
+    try:
+        translated = await azure_client.translate(text, from_lang, to_lang, timeout=TRANSLATE_TIMEOUT_SECONDS)
+    except AzureTranslatorError as e:
+        print(f"Error from Microsoft: {e.detail}")
+        translation_cache.put_failure(from_lang, to_lang, text)
+        return None
+    await translation_cache.put(from_lang, to_lang, text, translated)
+    return translated
+
 @api_router.post("/translate")
 async def translate_proxy(request: TranslateRequest):
-    print(f"--- DEBUG: Recibí petición para traducir: '{request.text}' ---")
-    
-    # 1. Limpiamos el texto
-    search_term = request.text.lower().strip()
-    
-    # 2. Buscamos en el diccionario local
-    for entry in DICTIONARY:
-        # Español -> Maya
-        if request.from_lang == "es" and request.to_lang == "yua":
-            if entry["spanish"].lower() == search_term:
-                print(f"DEBUG: ¡ENCONTRADO LOCAMENTE! La traducción es: {entry['maya']}")
-                return {"text": entry["maya"]}
-        
-        # Maya -> Español (por si acaso quieres traducir al revés)
-        elif request.from_lang == "yua" and request.to_lang == "es":
-            if entry["maya"].lower() == search_term:
-                print(f"DEBUG: ¡ENCONTRADO LOCAMENTE! La traducción es: {entry['spanish']}")
-                return {"text": entry["spanish"]}
-    
-    print("DEBUG: No estaba en el diccionario local. Intentando conectar a Azure...")
-
-    # 3. Si no está, vamos a Azure
-    url = "https://api.cognitive.microsofttranslator.com/translate"
-    params = {
-        "api-version": "3.0",
-        "to": request.to_lang,
-        "from": request.from_lang,
-    }
-    az_key = os.getenv("AZURE_TRANSLATOR_KEY", "")
-    az_region = os.getenv("AZURE_TRANSLATOR_REGION", "centralus")
-    
-    if not az_key:
+    # 1. Buscamos en el diccionario local (ignora mayúsculas, acentos y tipo de apóstrofe)
+    local = translate_locally(request.text, request.from_lang, request.to_lang)
+    if local is not None:
+        return local
+
+    # 2. Revisamos el cache de traducciones (memoria y luego Mongo)
+    hit, cached_translation = await translation_cache.get(request.from_lang, request.to_lang, request.text)
+    if hit:
+        # None = Azure falló hace poco para este texto, devolvemos el original
+        text = cached_translation if cached_translation is not None else request.text
+        return with_suggestion({"text": text}, request.text, request.from_lang, request.to_lang)
+
+    # 3. Si no está, vamos a Azure (con "¿quisiste decir...?" del diccionario como sugerencia)
+    if not azure_client.configured:
         print("ERROR: No hay AZURE_TRANSLATOR_KEY configurada.")
-        return {"text": request.text}
+        return with_suggestion({"text": request.text}, request.text, request.from_lang, request.to_lang)
 
-    headers = {
-        "Ocp-Apim-Subscription-Key": az_key,
-        "Ocp-Apim-Subscription-Region": az_region,
-        "Content-Type": "application/json"
-    }
-    try:
-        body = [{"Text": request.text}]
-        response = requests.post(url, params=params, headers=headers, json=body)
-        
-        if response.status_code != 200:
-             print(f"Error from Microsoft: {response.text}")
-             # Si falla Azure, devolvemos el original
-             return {"text": request.text}
-
-        data = response.json()
-        translated = data[0]["translations"][0]["text"] if data and data[0].get("translations") else request.text
-        print(f"DEBUG: Respuesta de Azure: {translated}")
-        return {"text": translated}
-    except Exception as e:
-        print(f"Translate proxy error: {str(e)}")
-        return {"text": request.text}
+    # Solo el líder escribe en el cache; los que esperan reciben el mismo resultado
+    translated = await translate_flights.do(
+        translation_key(request.from_lang, request.to_lang, request.text),
+        lambda: translate_with_azure(request.text, request.from_lang, request.to_lang),
+    )
+    # Si falla Azure, devolvemos el original
+    text = translated if translated is not None else request.text
+    return with_suggestion({"text": text}, request.text, request.from_lang, request.to_lang)
 # -----------------------------------------------------------------
 
+@api_router.post("/translate/batch")
+async def translate_batch(request: TranslateBatchRequest):
+    """Translate many texts at once; results come back in the original order"""
+    from_lang, to_lang = request.from_lang, request.to_lang
+
+    # Textos iguales (ignorando mayúsculas/espacios) se resuelven una sola vez
+    unique: Dict[str, str] = {}
+    for text in request.texts:
+        unique.setdefault(translation_key(from_lang, to_lang, text), text)
+
+    resolved: Dict[str, dict] = {}
+    pending: List[str] = []
+    for key, text in unique.items():
+        local = translate_locally(text, from_lang, to_lang)
+        if local is not None:
+            resolved[key] = local
+            continue
+        hit, cached_translation = await translation_cache.get(from_lang, to_lang, text)
+        if hit:
+            resolved[key] = {"text": cached_translation if cached_translation is not None else text}
+        else:
+            pending.append(key)
+
+    if pending and azure_client.configured:
+        batches = pack_texts([unique[key] for key in pending])
+
+        async def run(batch: List[str]):
+            try:
+                translations = await azure_client.translate_many(batch, from_lang, to_lang, timeout=TRANSLATE_TIMEOUT_SECONDS)
+            except AzureTranslatorError as e:
+                print(f"Error from Microsoft: {e.detail}")
+                for text in batch:
+                    translation_cache.put_failure(from_lang, to_lang, text)
+                return
+            for text, translated in zip(batch, translations):
+                resolved[translation_key(from_lang, to_lang, text)] = {"text": translated}
+                await translation_cache.put(from_lang, to_lang, text, translated)
+
+        await asyncio.gather(*(run(batch) for batch in batches))
+
+    return {
+        "translations": [
+            resolved.get(translation_key(from_lang, to_lang, text), {"text": text})
+            for text in request.texts
+        ]
+    }
+
 
 # ============= LESSON ENDPOINTS =============
 
+async def load_progress(user_id: str, user: Optional[dict] = None) -> dict:
+    """Progress sub-document of the user, migrating it from db.progress if needed"""
+    if user is None:
+        user = user_cache.get(user_id)
+    progress = await progress_store.load(user_id, user)
+    if user is not None and "progress" not in user:
+        user_cache.update(user_id, {"progress": progress})
+    return progress
+
 @api_router.get("/lessons")
-async def get_lessons(current_user: dict = Depends(get_current_user)):
+async def get_lessons(current_user: dict = Depends(get_current_identity)):
     """Get all lessons with user progress"""
     user_id = str(current_user["_id"])
     
     # Get user progress
-    progress_docs = await db.progress.find({"user_id": user_id}).to_list(1000)
-    progress_map = {p["lesson_id"]: p for p in progress_docs}
-    
-    # Organize lessons by unit
-    units = {}
-    for lesson in MAYA_LESSONS:
-        unit_num = lesson["unit"]
-        if unit_num not in units:
-            units[unit_num] = {
-                "unit": unit_num,
-                "title": lesson["unit_title"],
-                "lessons": []
-            }
-        
-        lesson_progress = progress_map.get(lesson["id"], {})
-        lesson_data = {
-            "id": lesson["id"],
-            "order": lesson["order"],
-            "title": lesson["title"],
-            "description": lesson["description"],
-            "xp_reward": lesson["xp_reward"],
-            "completed": lesson_progress.get("completed", False),
-            "score": lesson_progress.get("score", 0),
-            "locked": False  # Will calculate below
-        }
-        units[unit_num]["lessons"].append(lesson_data)
-    
-    # Calculate locked status (sequential unlocking)
-    units_list = sorted(units.values(), key=lambda x: x["unit"])
-    for unit in units_list:
-        unit["lessons"] = sorted(unit["lessons"], key=lambda x: x["order"])
-        for i, lesson in enumerate(unit["lessons"]):
-            if i == 0:
-                lesson["locked"] = False  # First lesson is always unlocked
-            else:
-                # Locked if previous lesson not completed
-                prev_lesson = unit["lessons"][i - 1]
-                lesson["locked"] = not prev_lesson["completed"]
-    
-    return units_list
+    catalog = content.current.catalog
+    mask, scores, _ = decode_progress(await load_progress(user_id))
+    body = catalog.render(mask & catalog.all_mask, catalog.scores_vector(scores))
+    return Response(content=body, media_type="application/json")
 
 @api_router.get("/lessons/{lesson_id}")
-async def get_lesson(lesson_id: str, current_user: dict = Depends(get_current_user)):
+async def get_lesson(lesson_id: str, request: Request, current_user: dict = Depends(get_current_identity)):
     """Get specific lesson details"""
-    lesson = next((l for l in MAYA_LESSONS if l["id"] == lesson_id), None)
-    if not lesson:
+    prepared = content.current.lesson_content.get(lesson_id)
+    if not prepared:
         raise HTTPException(status_code=404, detail="Lesson not found")
     
-    return lesson
+    return prepared.response(request.headers.get("if-none-match"), LESSON_CACHE_CONTROL,
+                            request.headers.get("accept-encoding"))
 
 @api_router.post("/lessons/{lesson_id}/complete")
-async def complete_lesson(lesson_id: str, progress: LessonProgress, current_user: dict = Depends(get_current_user)):
+async def complete_lesson(lesson_id: str, progress: LessonProgress, current_user: dict = Depends(get_current_identity)):
     """Mark lesson as complete and award XP"""
     user_id = str(current_user["_id"])
     
     # Find lesson
-    lesson = next((l for l in MAYA_LESSONS if l["id"] == lesson_id), None)
+    catalog = content.current.catalog
+    lesson = catalog.by_id.get(lesson_id)
     if not lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
     
-    # Update or create progress
-    await db.progress.update_one(
-        {"user_id": user_id, "lesson_id": lesson_id},
-        {
-            "$set": {
-                "completed": True,
-                "score": progress.score,
-                "completed_at": datetime.utcnow()
-            },
-            "$inc": {"attempts": 1}
-        },
-        upsert=True
-    )
-    
-    # Award XP
-    new_xp = current_user.get("xp", 0) + progress.xp_earned
-    await db.users.update_one(
-        {"_id": current_user["_id"]},
-        {"$set": {"xp": new_xp}}
-    )
+    # Ungraded (older clients): never more than the lesson awards; /submit grades on the server
+    score, xp_earned = clamp_result(lesson, progress.score, progress.xp_earned)
+    # Progress bit, score, attempts and XP in one atomic update
+    updated = await progress_store.complete(user_id, catalog.ordinals[lesson_id], score, xp=xp_earned)
+    if updated is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    new_xp = updated.get("xp", 0)
+    # Concurrent updates can finish out of order, so drop the cached copy instead of overwriting it
+    user_cache.invalidate(user_id)
     
     return {
         "success": True,
-        "xp_earned": progress.xp_earned,
+        "xp_earned": xp_earned,
         "total_xp": new_xp,
         "level": calculate_level(new_xp)
     }
 
+@api_router.post("/lessons/{lesson_id}/start")
+async def start_lesson(lesson_id: str, current_user: dict = Depends(get_current_identity)):
+    """Start a lesson session: the lesson plus the token to submit its answers with"""
+    pack = content.current
+    lesson = pack.catalog.by_id.get(lesson_id)
+    if not lesson:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    token = lesson_sessions.start(str(current_user["_id"]), lesson)
+    # The lesson body is already serialized, only the envelope is built per request
+    body = b"".join((
+        b'{"session_token":', orjson.dumps(token),
+        b',"expires_in":', str(int(lesson_sessions.ttl_seconds)).encode(),
+        b',"lesson":', pack.lesson_content[lesson_id].body, b"}",
+    ))
+    return Response(content=body, media_type="application/json")
+
+@api_router.post("/lessons/{lesson_id}/submit")
+async def submit_lesson(lesson_id: str, submission: LessonSubmission, current_user: dict = Depends(get_current_identity)):
+    """Grade a whole lesson session and apply hearts, XP and progress at once"""
+    user_id = str(current_user["_id"])
+    catalog = content.current.catalog
+    lesson = catalog.by_id.get(lesson_id)
+    if not lesson:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    try:
+        result = await lesson_sessions.submit(user_id, lesson, catalog.ordinals[lesson_id],
+                                              submission.session_token, submission.answers)
+    except LessonSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    user_cache.invalidate(user_id)
+    
+    return ORJSONResponse({
+        "success": True,
+        "results": result["results"],
+        "correct": result["correct"],
+        "total": result["total"],
+        "score": result["score"],
+        "xp_earned": result["xp_earned"],
+        "total_xp": result["total_xp"],
+        "level": calculate_level(result["total_xp"]),
+        "lives": result["lives"],
+    })
+
 @api_router.post("/lessons/review")
-async def review_lesson(review: ReviewLesson, current_user: dict = Depends(get_current_user)):
+async def review_lesson(review: ReviewLesson, current_user: dict = Depends(get_current_identity)):
     """Review a completed lesson to earn back a heart"""
     user_id = str(current_user["_id"])
-    
-    # Check if lesson is completed
-    progress = await db.progress.find_one({"user_id": user_id, "lesson_id": review.lesson_id})
-    if not progress or not progress.get("completed"):
+    ordinal = content.current.catalog.ordinals.get(review.lesson_id)
+    if ordinal is None:
         raise HTTPException(status_code=400, detail="Can only review completed lessons")
     
-    # Check current lives
-    current_lives = current_user.get("lives", 5)
-    if current_lives >= 5:
-        raise HTTPException(status_code=400, detail="Lives are already full")
-    
-    # Award one heart
-    new_lives = min(current_lives + 1, 5)
-    await db.users.update_one(
-        {"_id": current_user["_id"]},
-        {"$set": {"lives": new_lives}}
-    )
+    # Award one heart, only if the lesson is completed and lives are not full
+    new_lives = await user_counters.gain_life(user_id, completed_ordinal=ordinal)
+    if new_lives is None:
+        # Find out why (this also migrates old progress, then it is worth one more try)
+        mask, _, _ = decode_progress(await load_progress(user_id))
+        if not mask >> ordinal & 1:
+            raise HTTPException(status_code=400, detail="Can only review completed lessons")
+        new_lives = await user_counters.gain_life(user_id, completed_ordinal=ordinal)
+        if new_lives is None:
+            raise HTTPException(status_code=400, detail="Lives are already full")
+    user_cache.invalidate(user_id)
     
     return {
         "success": True,
@@ -1276,33 +896,55 @@ async def review_lesson(review: ReviewLesson, current_user: dict = Depends(get_c
     }
 
 @api_router.post("/lessons/lose-life")
-async def lose_life(current_user: dict = Depends(get_current_user)):
+async def lose_life(current_user: dict = Depends(get_current_identity)):
     """Lose a heart for wrong answer"""
-    current_lives = current_user.get("lives", 5)
-    new_lives = max(current_lives - 1, 0)
-    
-    await db.users.update_one(
-        {"_id": current_user["_id"]},
-        {"$set": {"lives": new_lives}}
-    )
+    user_id = str(current_user["_id"])
+    new_lives = await user_counters.lose_life(user_id)
+    if new_lives is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    user_cache.invalidate(user_id)
     
     return {
         "success": True,
         "lives": new_lives
     }
 
+@api_router.post("/sync")
+async def sync_events(batch: SyncBatch, current_user: dict = Depends(get_current_identity)):
+    """Apply events queued offline, in order, and return the reconciled user state"""
+    user_id = str(current_user["_id"])
+    if len(batch.events) > SYNC_MAX_EVENTS:
+        raise HTTPException(status_code=413, detail=f"At most {SYNC_MAX_EVENTS} events per sync")
+    catalog = content.current.catalog
+    try:
+        results, user = await event_sync.apply(user_id, [event.model_dump() for event in batch.events], catalog)
+    except Exception as e:
+        print(f"Sync failed: {e}")
+        raise HTTPException(status_code=503, detail="Sync unavailable, try again")
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    user_cache.invalidate(user_id)
+    
+    mask, scores, _ = decode_progress(user.get("progress"))
+    xp = int(user.get("xp", 0))
+    return ORJSONResponse({
+        "results": results,
+        "xp": xp,
+        "lives": int(user.get("lives", MAX_LIVES)),
+        "streak": int(user.get("streak", 0)),
+        "level": calculate_level(xp),
+        "completed_lessons": [lesson["id"] for ordinal, lesson in enumerate(catalog.lessons) if mask >> ordinal & 1],
+        "scores": {catalog.lessons[ordinal]["id"]: score for ordinal, score in scores.items() if ordinal < len(catalog.lessons)},
+    })
+
 @api_router.post("/user/gain-life")
-async def gain_life(current_user: dict = Depends(get_current_user)):
+async def gain_life(current_user: dict = Depends(get_current_identity)):
     """Gain a heart from mini-game"""
-    current_lives = current_user.get("lives", 5)
-    if current_lives >= 5:
-        return {"success": False, "message": "Lives full", "lives": 5}
-    
-    new_lives = current_lives + 1
-    await db.users.update_one(
-        {"_id": current_user["_id"]},
-        {"$set": {"lives": new_lives}}
-    )
+    user_id = str(current_user["_id"])
+    new_lives = await user_counters.gain_life(user_id)
+    if new_lives is None:
+        return {"success": False, "message": "Lives full", "lives": MAX_LIVES}
+    user_cache.invalidate(user_id)
     
     return {
         "success": True,
@@ -1313,26 +955,58 @@ async def gain_life(current_user: dict = Depends(get_current_user)):
 # ============= TIPS ENDPOINT =============
 
 @api_router.get("/tips/{unit}")
-async def get_unit_tips(unit: int, current_user: dict = Depends(get_current_user)):
+async def get_unit_tips(unit: int, request: Request, current_user: dict = Depends(get_current_identity)):
     """Get tips and grammar rules for a unit"""
-    tips = UNIT_TIPS.get(unit)
-    if not tips:
+    prepared = content.current.tips_content.get(unit)
+    if not prepared:
         raise HTTPException(status_code=404, detail="Tips not found for this unit")
-    return tips
+    return prepared.response(request.headers.get("if-none-match"), TIPS_CACHE_CONTROL,
+                            request.headers.get("accept-encoding"))
 
 # ============= DICTIONARY ENDPOINT =============
 
 @api_router.get("/dictionary")
-async def get_dictionary(search: Optional[str] = None, current_user: dict = Depends(get_current_user)):
-    """Get dictionary entries, optionally filtered by search"""
+async def get_dictionary(
+    request: Request,
+    search: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    current_user: dict = Depends(get_current_identity),
+):
+    """Get dictionary entries, optionally filtered by search (best matches first) and category"""
+    pack = content.current
+    if not search and not category and not offset and limit is None:
+        full = pack.dictionary_content.response(request.headers.get("if-none-match"), DICTIONARY_CACHE_CONTROL,
+                                                request.headers.get("accept-encoding"))
+        full.headers["X-Total-Count"] = str(len(pack.dictionary))
+        return full
+    # The result only depends on the content pack and the query: answer revalidations before searching
+    etag = content_etag(pack.dictionary_version, search or "", category or "", limit or "", offset)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, DICTIONARY_CACHE_CONTROL)
+    headers = {"ETag": etag, "Cache-Control": DICTIONARY_CACHE_CONTROL}
+    index = pack.dictionary_index
     if search:
-        search_lower = search.lower()
-        filtered = [
-            entry for entry in DICTIONARY
-            if search_lower in entry["maya"].lower() or search_lower in entry["spanish"].lower()
-        ]
-        return sorted(filtered, key=lambda e: e["maya"].lower())
-    return sorted(DICTIONARY, key=lambda e: e["maya"].lower())
+        entries = index.search(search)
+        if not entries:
+            # Nothing contains the term: fall back to the closest spellings on either side
+            suggestions = index.suggest(search, "yua") + index.suggest(search, "es")
+            suggestions.sort(key=lambda s: s[1])
+            entries = []
+            for entry, _ in suggestions:
+                if entry not in entries:
+                    entries.append(entry)
+            headers["X-Did-You-Mean"] = "true"
+        if category:
+            entries = [entry for entry in entries if entry.get("category") == category]
+    elif category:
+        entries = pack.dictionary_by_category.get(category, ())
+    else:
+        entries = index.sorted_entries
+    headers["X-Total-Count"] = str(len(entries))
+    end = offset + limit if limit is not None else None
+    return ORJSONResponse(list(entries[offset:end]), headers=headers)
 
 # ============= STATS ENDPOINT =============
 
@@ -1342,15 +1016,14 @@ async def get_user_stats(current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])
     
     # Count completed lessons
-    completed_count = await db.progress.count_documents({
-        "user_id": user_id,
-        "completed": True
-    })
+    mask, _, _ = decode_progress(await load_progress(user_id, current_user))
+    catalog = content.current.catalog
+    completed_count = popcount(mask & catalog.all_mask)
     
-    total_lessons = len(MAYA_LESSONS)
+    total_lessons = len(catalog)
     xp = current_user.get("xp", 0)
     
-    return {
+    return ORJSONResponse({
         "username": current_user["username"],
         "xp": xp,
         "level": calculate_level(xp),
@@ -1359,31 +1032,7 @@ async def get_user_stats(current_user: dict = Depends(get_current_user)):
         "lessons_completed": completed_count,
         "total_lessons": total_lessons,
         "progress_percentage": round((completed_count / total_lessons) * 100, 1) if total_lessons > 0 else 0
-    }
-
-# Include the router in the main app
-app.include_router(api_router)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.mount("/static", StaticFiles(directory=ROOT_DIR / "static"), name="static")
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
+    })
 
 # ============= USER PROFILE IMAGE =============
 @api_router.post("/user/profile-image")
@@ -1413,7 +1062,194 @@ async def upload_profile_image(file: UploadFile = File(...), current_user: dict
                 u['profile_image_url'] = url_path
                 break
         filedb_save(USERS_FILE, users)
+    user_cache.update(str(current_user.get("_id")), {"profile_image_url": url_path})
     return {"url": url_path}
+
+# ============= CONTENT ADMIN =============
+
+def require_admin(request: Request):
+    token = request.headers.get("x-admin-token", "")
+    # Disabled unless ADMIN_TOKEN is configured
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not secrets.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+@api_router.get("/admin/content", dependencies=[Depends(require_admin)])
+async def get_content_status():
+    """Active content pack and the packs available on disk"""
+    return content.stats()
+
+@api_router.post("/admin/content/reload", dependencies=[Depends(require_admin)])
+async def reload_content(pack: Optional[str] = None):
+    """Rebuild the content indexes (optionally switching pack) and swap them in"""
+    try:
+        new_pack = await content.reload(pack)
+    except ContentPackError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return new_pack.summary()
+
+# ============= METRICS ENDPOINT =============
+
+@api_router.get("/metrics")
+async def get_metrics():
+    """Cache, coalescing and circuit breaker counters for the proxy endpoints"""
+    return {
+        "audio_cache": audio_cache.stats(),
+        "baked_audio": len(baked_audio),
+        "translation_cache": translation_cache.stats(),
+        "speak_singleflight": {"in_flight": len(speak_flights), **speak_flight_stats},
+        "translate_singleflight": translate_flights.stats(),
+        "azure_circuit": azure_breaker.stats(),
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "content": content.stats(),
+        "lesson_catalog": content.current.catalog.stats(),
+        "progress_store": progress_store.stats(),
+        "lesson_sessions": lesson_sessions.stats(),
+        "sync": event_sync.stats(),
+        "idempotency": idempotency_store.stats(),
+        "compression": compression_stats.stats(),
+        "token_revocation": revoked_tokens.stats(),
+        "password_pool": password_hasher.stats(),
+    }
+
+# Include the router in the main app
+app.include_router(api_router)
+
+# Innermost, so stored responses are the uncompressed ones
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=idempotency_store,
+    identify=idempotency_user,
+    exclude=IDEMPOTENCY_EXCLUDED_PATHS,
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_credentials=True,
+    allow_origins=["*"],
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Did-You-Mean", "ETag", "Idempotent-Replayed"],
+)
+
+# Respuestas dinámicas grandes (JSON) se comprimen con gzip/brotli
+compression_stats = CompressionStats()
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get("COMPRESSION_MIN_BYTES", "1024")),
+    stats=compression_stats,
+)
+
+app.mount("/static", StaticFiles(directory=ROOT_DIR / "static"), name="static")
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+@app.on_event("startup")
+async def start_password_pool():
+    password_hasher.start()
+
+@app.on_event("shutdown")
+async def shutdown_password_pool():
+    password_hasher.shutdown()
+
+@app.on_event("startup")
+async def start_azure_client():
+    await azure_client.start()
+
+@app.on_event("startup")
+async def create_translation_cache_indexes():
+    await translation_cache.ensure_indexes()
+
+@app.on_event("startup")
+async def create_refresh_token_indexes():
+    try:
+        await refresh_tokens.ensure_indexes()
+    except Exception as e:
+        print(f"Refresh tokens: could not create indexes: {e}")
+
+@app.on_event("startup")
+async def create_sync_event_indexes():
+    try:
+        await event_sync.ensure_indexes()
+    except Exception as e:
+        print(f"Sync events: could not create indexes: {e}")
+
+@app.on_event("startup")
+async def create_idempotency_indexes():
+    try:
+        await idempotency_store.ensure_indexes()
+    except Exception as e:
+        print(f"Idempotency keys: could not create indexes: {e}")
+
+@app.on_event("startup")
+async def load_revoked_tokens():
+    try:
+        await revoked_tokens.ensure_indexes()
+        await revoked_tokens.load()
+    except Exception as e:
+        print(f"Revoked tokens: could not load: {e}")
+    app.state.revocation_sync = asyncio.create_task(sync_revoked_tokens())
+
+async def sync_revoked_tokens():
+    """Pick up revocations made by other workers"""
+    while True:
+        await asyncio.sleep(REVOCATION_SYNC_SECONDS)
+        try:
+            await revoked_tokens.sync()
+        except Exception as e:
+            print(f"Revoked tokens: sync failed: {e}")
+
+@app.on_event("shutdown")
+async def stop_revocation_sync():
+    task = getattr(app.state, "revocation_sync", None)
+    if task is not None:
+        task.cancel()
+
+@app.on_event("startup")
+async def start_content_watcher():
+    if CONTENT_WATCH_SECONDS > 0:
+        app.state.content_watcher = asyncio.create_task(watch_content())
+
+async def watch_content():
+    """Reload the active pack when its files change on disk"""
+    while True:
+        await asyncio.sleep(CONTENT_WATCH_SECONDS)
+        if not content.changed():
+            continue
+        try:
+            new_pack = await content.reload()
+            print(f"Content reloaded: {new_pack.name} {new_pack.version}")
+        except ContentPackError as e:
+            print(f"Content reload rejected: {e}")
+        except Exception as e:
+            print(f"Content reload failed: {e}")
+
+@app.on_event("shutdown")
+async def stop_content_watcher():
+    task = getattr(app.state, "content_watcher", None)
+    if task is not None:
+        task.cancel()
+
+@app.on_event("startup")
+async def load_audio_manifest():
+    baked_audio.clear()
+    baked_audio.update(load_baked_audio())
+
+@app.on_event("shutdown")
+async def shutdown_db_client():
+    client.close()
+
+@app.on_event("shutdown")
+async def shutdown_azure_client():
+    await azure_client.close()
+
 # ============= SIMPLE FILE DB FALLBACK =============
 FILEDB_DIR = ROOT_DIR / 'filedb'
 USERS_FILE = FILEDB_DIR / 'users.json'
@@ -0,0 +1,207 @@
+"""Content-addressed on-disk cache for synthesized audio.
+
+Files are named after a SHA-256 of the normalized text plus the voice/format
+parameters, so the same phrase is only ever synthesized once. The total size
+on disk is bounded with an LRU policy: the least recently served files are
+deleted first when a new entry pushes the cache over ``max_bytes``.
+"""
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from text_normalize import normalize_text
+
+
+def audio_key(text: str, language: str, voice: str, audio_format: str) -> str:
+    raw = "\x1f".join([normalize_text(text), language, voice, audio_format])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def parse_byte_range(header: str, size: int):
+    """Parse a single ``Range: bytes=...`` header into an inclusive (start, end).
+
+    Returns ``None`` when the range cannot be satisfied and ``()`` when the
+    header should be ignored (malformed or multi-range) and the full body sent.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return ()
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return ()
+    try:
+        if first == "":
+            length = int(last)
+            if length <= 0:
+                return None
+            start, end = max(size - length, 0), size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else size - 1
+    except ValueError:
+        return ()
+    if start >= size or start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def read_range(path: Path, start: int, end: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start + 1)
+
+
+class CachedAudio:
+    def __init__(self, key: str, path: Path, size: int):
+        self.key = key
+        self.path = path
+        self.size = size
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.key[:32]}"'
+
+
+class AudioCache:
+    def __init__(self, directory: Path, max_bytes: int, suffix: str = ".mp3"):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def _load(self):
+        """Rebuild the LRU order from the files left by a previous run (oldest access first)."""
+        for leftover in self.directory.glob("*.part"):
+            try:
+                leftover.unlink()
+            except OSError:
+                pass
+        files = []
+        for path in self.directory.glob(f"*/*{self.suffix}"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, path.stem, st.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    def get(self, key: str) -> Optional[CachedAudio]:
+        size = self._entries.get(key)
+        if size is None:
+            self.misses += 1
+            return None
+        path = self._path(key)
+        if not path.exists():
+            # Someone removed the file behind our back
+            self._forget(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return CachedAudio(key, path, size)
+
+    def writer(self, key: str) -> "AudioCacheWriter":
+        return AudioCacheWriter(self, key)
+
+    def put(self, key: str, data: bytes) -> CachedAudio:
+        with self.writer(key) as w:
+            w.write(data)
+        return CachedAudio(key, self._path(key), len(data))
+
+    def _commit(self, key: str, tmp_path: Path, size: int):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, path)
+        if key in self._entries:
+            self.total_bytes -= self._entries[key]
+        self._entries[key] = size
+        self._entries.move_to_end(key)
+        self.total_bytes += size
+        self._evict()
+
+    def _forget(self, key: str):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self.total_bytes -= size
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class AudioCacheWriter:
+    """Accumulates a streamed body in a temp file and publishes it atomically.
+
+    Nothing becomes visible in the cache unless ``commit()`` runs (or the
+    ``with`` block exits cleanly), so an aborted upstream stream never leaves
+    a truncated file behind.
+    """
+
+    def __init__(self, cache: AudioCache, key: str):
+        self.cache = cache
+        self.key = key
+        self.size = 0
+        fd, name = tempfile.mkstemp(dir=cache.directory, suffix=".part")
+        self._tmp_path = Path(name)
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self):
+        self._file.close()
+        self.cache._commit(self.key, self._tmp_path, self.size)
+
+    def abort(self):
+        self._file.close()
+        try:
+            self._tmp_path.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
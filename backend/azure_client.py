@@ -0,0 +1,226 @@
+"""Shared async client for the Azure Translator REST API.
+
+A single instance is created at application startup and keeps a pool of
+keep-alive connections open, so /api/speak and /api/translate never block
+the event loop and never pay a fresh TLS handshake per request. Every call
+goes through a circuit breaker so a slow or failing Azure is answered with
+an immediate 503 instead of a timeout.
+"""
+import os
+import time
+from typing import List, Optional
+
+import httpx
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+
+AZURE_TRANSLATOR_ENDPOINT = "https://api.cognitive.microsofttranslator.com"
+AZURE_API_VERSION = "3.0"
+
+# Default timeouts (seconds). TTS can take a while to start streaming, so the
+# read timeout is larger than the connect/pool ones.
+CONNECT_TIMEOUT = 3.0
+READ_TIMEOUT = 10.0
+WRITE_TIMEOUT = 5.0
+POOL_TIMEOUT = 2.0
+
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 30.0
+
+SPEAK_CHUNK_SIZE = 1024
+
+# Per-request limits of the /translate operation
+TRANSLATE_MAX_ELEMENTS = 1000
+TRANSLATE_MAX_CHARACTERS = 50_000
+
+
+def pack_texts(texts: List[str], max_elements: int = TRANSLATE_MAX_ELEMENTS,
+               max_characters: int = TRANSLATE_MAX_CHARACTERS) -> List[List[str]]:
+    """Split ``texts`` into as few /translate requests as the service limits allow."""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    characters = 0
+    for text in texts:
+        if current and (len(current) >= max_elements or characters + len(text) > max_characters):
+            batches.append(current)
+            current, characters = [], 0
+        current.append(text)
+        characters += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def read_translations(data, texts: List[str]) -> List[str]:
+    """First translation of each text in a /translate response body (the text itself when missing)."""
+    results = []
+    for i, text in enumerate(texts):
+        item = data[i] if i < len(data) else {}
+        results.append(item["translations"][0]["text"] if item.get("translations") else text)
+    return results
+
+
+class AzureTranslatorError(Exception):
+    """Raised when Azure answers with a non-200 status or cannot be reached."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AzureTranslatorClient:
+    """Thin wrapper around a pooled ``httpx.AsyncClient``."""
+
+    def __init__(self, endpoint: Optional[str] = None, key: Optional[str] = None,
+                 region: Optional[str] = None, transport: Optional[httpx.AsyncBaseTransport] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.endpoint = (endpoint or os.getenv("AZURE_TRANSLATOR_ENDPOINT") or AZURE_TRANSLATOR_ENDPOINT).rstrip("/")
+        self.breaker = breaker or CircuitBreaker("azure_translator")
+        self._key = key
+        self._region = region
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def key(self) -> str:
+        return self._key if self._key is not None else os.getenv("AZURE_TRANSLATOR_KEY", "")
+
+    @property
+    def region(self) -> str:
+        return self._region if self._region is not None else os.getenv("AZURE_TRANSLATOR_REGION", "centralus")
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.key)
+
+    async def start(self):
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=self.endpoint,
+            timeout=httpx.Timeout(CONNECT_TIMEOUT, read=READ_TIMEOUT, write=WRITE_TIMEOUT, pool=POOL_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            transport=self._transport,
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _headers(self) -> dict:
+        return {
+            "Ocp-Apim-Subscription-Key": self.key,
+            "Ocp-Apim-Subscription-Region": self.region,
+            "Content-Type": "application/json",
+        }
+
+    def _before_call(self):
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError as e:
+            raise AzureTranslatorError(503, str(e)) from e
+
+    def _after_call(self, started: float, status_code: Optional[int]):
+        """Throttling, 5xx and transport errors (``status_code=None``) count against the circuit."""
+        failed = status_code is None or status_code >= 500 or status_code == 429
+        self.breaker.record(time.monotonic() - started, failed)
+
+    async def _ensure_started(self) -> httpx.AsyncClient:
+        if self._client is None:
+            await self.start()
+        return self._client
+
+    async def translate(self, text: str, from_lang: str, to_lang: str, timeout: Optional[float] = None) -> str:
+        """Translate ``text`` and return the first translation Azure offers."""
+        return (await self.translate_many([text], from_lang, to_lang, timeout=timeout))[0]
+
+    async def translate_many(self, texts: List[str], from_lang: str, to_lang: str,
+                             timeout: Optional[float] = None) -> List[str]:
+        """Translate several texts in a single request (see ``pack_texts`` for the limits)."""
+        client = await self._ensure_started()
+        params = {"api-version": AZURE_API_VERSION, "to": to_lang, "from": from_lang}
+        self._before_call()
+        started = time.monotonic()
+        try:
+            response = await client.post(
+                "/translate",
+                params=params,
+                headers=self._headers(),
+                json=[{"Text": text} for text in texts],
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            )
+        except httpx.HTTPError as e:
+            self._after_call(started, None)
+            raise AzureTranslatorError(503, f"Azure unreachable: {e}") from e
+        except BaseException:
+            # Cancelled by the caller: no verdict on Azure, but the slot must be freed
+            self.breaker.release()
+            raise
+        if response.status_code != 200:
+            self._after_call(started, response.status_code)
+            raise AzureTranslatorError(response.status_code, response.text)
+        try:
+            results = read_translations(response.json(), texts)
+        except (ValueError, LookupError, TypeError, AttributeError) as e:
+            # A 200 we cannot read is as broken as a 5xx
+            self._after_call(started, None)
+            raise AzureTranslatorError(502, f"Unexpected response from Azure: {e!r}") from e
+        self._after_call(started, response.status_code)
+        return results
+
+    async def open_speech(self, text: str, language: str = "yua-MX", audio_format: str = "audio/mp3",
+                          voice: str = "Male", timeout: Optional[float] = None) -> httpx.Response:
+        """Start a TTS request and return the response with its body still unread.
+
+        The caller owns the response: iterate it with ``iter_speech`` and
+        make sure ``aclose()`` runs (e.g. as a ``StreamingResponse`` background task).
+        """
+        client = await self._ensure_started()
+        params = {
+            "api-version": AZURE_API_VERSION,
+            "language": language,
+            "format": audio_format,
+            "options": voice,
+        }
+        request = client.build_request(
+            "POST",
+            "/speak",
+            params=params,
+            headers=self._headers(),
+            json=[{"Text": text}],
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+        self._before_call()
+        started = time.monotonic()
+        try:
+            response = await client.send(request, stream=True)
+        except httpx.HTTPError as e:
+            self._after_call(started, None)
+            raise AzureTranslatorError(503, f"Azure unreachable: {e}") from e
+        except BaseException:
+            # Cancelled by the caller: no verdict on Azure, but the slot must be freed
+            self.breaker.release()
+            raise
+        # Time to first byte is what the latency budget applies to for TTS
+        self._after_call(started, response.status_code)
+        if response.status_code != 200:
+            body = await response.aread()
+            await response.aclose()
+            raise AzureTranslatorError(response.status_code, body.decode("utf-8", "replace"))
+        return response
+
+    @staticmethod
+    async def iter_speech(response: httpx.Response, chunk_size: int = SPEAK_CHUNK_SIZE):
+        """Yield audio chunks as they arrive from Azure, closing the response at the end."""
+        try:
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
@@ -0,0 +1,234 @@
+"""Pre-synthesize the audio for every Maya string in the course.
+
+Walks the lessons and dictionary of the active content pack, collects every distinct Maya string
+(translate options, matching pairs, dictionary entries, ...) and writes one
+MP3 per string into static/audio together with a manifest.json that maps
+each text to its file. Files are served by the /static mount, so lessons can
+play them without going through /api/speak.
+
+    python bake_audio.py                       # uses AZURE_TRANSLATOR_* from .env
+    python bake_audio.py --concurrency 8
+    python bake_audio.py --endpoint http://127.0.0.1:9000   # fake_azure.py
+
+Re-running is cheap: strings whose file is already listed in the manifest
+are skipped, so an interrupted bake resumes where it stopped.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from audio_cache import audio_key
+from azure_client import AzureTranslatorClient, AzureTranslatorError
+from content_registry import ContentRegistry
+from text_normalize import normalize_text
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+AUDIO_DIR = ROOT_DIR / "static" / "audio"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_CONCURRENCY = 4
+MAX_ATTEMPTS = 3
+
+
+def slugify(text: str) -> str:
+    """"Ba'ax ka wa'alik" -> "baax_ka_waalik" (same scheme as the lesson audio_file names)."""
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    folded = re.sub(r"['’`´]", "", folded)
+    return re.sub(r"[^a-z0-9]+", "_", folded).strip("_") or "audio"
+
+
+def collect_maya_texts(lessons: List[dict], dictionary: List[dict]) -> Dict[str, Optional[str]]:
+    """Return every distinct Maya string mapped to its preferred file name (if any).
+
+    Options of ``translate`` exercises are always Maya; ``multiple_choice``
+    options are Maya only when the exercise asks for a Maya word, which we
+    detect by any option being a known Maya string.
+    """
+    texts: Dict[str, Optional[str]] = {}
+
+    def add(text: str, filename: Optional[str] = None):
+        text = text.strip()
+        if text and (text not in texts or (filename and not texts[text])):
+            texts[text] = filename
+
+    for entry in dictionary:
+        add(entry["maya"])
+    for lesson in lessons:
+        for exercise in lesson["exercises"]:
+            if exercise["type"] == "translate":
+                add(exercise["correct_answer"], exercise.get("audio_file"))
+                for option in exercise.get("options", []):
+                    add(option)
+            for pair in exercise.get("pairs", []):
+                add(pair["maya"])
+
+    known = {normalize_text(t) for t in texts}
+    for lesson in lessons:
+        for exercise in lesson["exercises"]:
+            options = exercise.get("options", [])
+            if exercise["type"] == "multiple_choice" and any(normalize_text(o) in known for o in options):
+                for option in options:
+                    add(option)
+    return texts
+
+
+def assign_filenames(texts: Dict[str, Optional[str]]) -> Dict[str, str]:
+    """Give each text a stable file name; slug collisions (K'an / Kan) get a hash suffix."""
+    by_slug: Dict[str, List[str]] = {}
+    for text, filename in texts.items():
+        if not filename:
+            by_slug.setdefault(slugify(text), []).append(text)
+    taken = {filename for filename in texts.values() if filename}
+    names = {text: filename for text, filename in texts.items() if filename}
+    for slug, group in by_slug.items():
+        for text in group:
+            name = f"{slug}.mp3"
+            if len(group) > 1 or name in taken:
+                digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:8]
+                name = f"{slug}_{digest}.mp3"
+            names[text] = name
+    return names
+
+
+def load_manifest(audio_dir: Path) -> dict:
+    path = audio_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_manifest(audio_dir: Path, manifest: dict):
+    path = audio_dir / MANIFEST_NAME
+    tmp = path.with_suffix(".json.part")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+async def synthesize(azure: AzureTranslatorClient, text: str, dest: Path,
+                     language: str, voice: str, audio_format: str) -> int:
+    """Stream one text into ``dest`` atomically and return its size."""
+    tmp = dest.with_suffix(dest.suffix + ".part")
+    size = 0
+    response = await azure.open_speech(text, language=language, audio_format=audio_format, voice=voice)
+    try:
+        with open(tmp, "wb") as f:
+            async for chunk in azure.iter_speech(response):
+                f.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, dest)
+    return size
+
+
+async def bake(azure: AzureTranslatorClient, texts: Dict[str, str], audio_dir: Path,
+               language: str, voice: str, audio_format: str,
+               concurrency: int = DEFAULT_CONCURRENCY, force: bool = False) -> dict:
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(audio_dir)
+    same_params = manifest.get("params") == {"language": language, "voice": voice, "format": audio_format}
+    entries = manifest.get("entries", {}) if same_params and not force else {}
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "params": {"language": language, "voice": voice, "format": audio_format},
+        "entries": entries,
+    }
+
+    def is_done(text: str, filename: str) -> bool:
+        entry = entries.get(text)
+        path = audio_dir / filename
+        return bool(entry) and entry["file"] == filename and path.exists() and path.stat().st_size == entry["bytes"]
+
+    pending = [(text, filename) for text, filename in texts.items() if not is_done(text, filename)]
+    stats = {"total": len(texts), "skipped": len(texts) - len(pending), "baked": 0, "failed": 0}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def worker(text: str, filename: str):
+        async with semaphore:
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                try:
+                    size = await synthesize(azure, text, audio_dir / filename, language, voice, audio_format)
+                    break
+                except (AzureTranslatorError, httpx.HTTPError) as e:
+                    if attempt == MAX_ATTEMPTS:
+                        print(f"FAILED: {text!r}: {e}")
+                        stats["failed"] += 1
+                        return
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+        entries[text] = {
+            "file": filename,
+            "key": audio_key(text, language, voice, audio_format),
+            "bytes": size,
+        }
+        stats["baked"] += 1
+        # Save as we go so that an interrupted run can resume
+        if stats["baked"] % 25 == 0:
+            save_manifest(audio_dir, manifest)
+
+    try:
+        await asyncio.gather(*(worker(text, filename) for text, filename in pending))
+    finally:
+        # Drop entries for texts that no longer exist in the content
+        for text in list(entries):
+            if text not in texts:
+                del entries[text]
+        save_manifest(audio_dir, manifest)
+    return stats
+
+
+def maya_texts_from_content() -> Dict[str, str]:
+    pack = ContentRegistry().current
+    return assign_filenames(collect_maya_texts(list(pack.lessons), list(pack.dictionary)))
+
+
+async def main():
+    from app import SPEAK_LANGUAGE, SPEAK_VOICE, SPEAK_FORMAT
+
+    parser = argparse.ArgumentParser(description="Bake TTS audio for every Maya string in the course")
+    parser.add_argument("--endpoint", help="Azure Translator endpoint (default: AZURE_TRANSLATOR_ENDPOINT)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--out", type=Path, default=AUDIO_DIR)
+    parser.add_argument("--force", action="store_true", help="re-synthesize everything")
+    parser.add_argument("--dry-run", action="store_true", help="only list the texts that would be baked")
+    args = parser.parse_args()
+
+    texts = maya_texts_from_content()
+    if args.dry_run:
+        for text, filename in sorted(texts.items()):
+            print(f"{filename:<40} {text}")
+        print(f"{len(texts)} textos")
+        return
+
+    azure = AzureTranslatorClient(endpoint=args.endpoint)
+    if not azure.configured:
+        raise SystemExit("Missing AZURE_TRANSLATOR_KEY in environment")
+    started = time.perf_counter()
+    try:
+        stats = await bake(azure, texts, args.out, SPEAK_LANGUAGE, SPEAK_VOICE, SPEAK_FORMAT,
+                           concurrency=args.concurrency, force=args.force)
+    finally:
+        await azure.close()
+    print(f"{stats} en {time.perf_counter() - started:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
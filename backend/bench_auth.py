@@ -0,0 +1,43 @@
+"""Microbenchmark: per-request token verification cost with and without the cache.
+
+Runs in-process (no server or database needed):
+
+    python bench_auth.py
+
+"uncached" is what get_current_user used to do on every request
+(python-jose ``jwt.decode``); "cached" is ``decode_access_token`` once the
+token has been seen.
+"""
+import os
+import time
+
+import app
+from token_cache import TokenCache
+
+ITERATIONS = int(os.environ.get("ITERATIONS", "20000"))
+
+
+def per_call_us(fn, iterations: int = ITERATIONS) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main():
+    token = app.create_access_token(data={"sub": "64b000000000000000000001"})
+
+    uncached = per_call_us(lambda: app.jwt.decode(token, app.SECRET_KEY, algorithms=[app.ALGORITHM]))
+
+    app.token_cache = TokenCache()
+    app.decode_access_token(token)
+    cached = per_call_us(lambda: app.decode_access_token(token))
+
+    print(f"jwt.decode (uncached):      {uncached:8.2f} us/request")
+    print(f"decode_access_token (hit):  {cached:8.2f} us/request")
+    print(f"speedup:                    {uncached / cached:8.1f}x")
+    print(app.token_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: bytes on the wire and CPU cost per request for each encoding.
+
+Runs in-process (no server or database needed):
+
+    python bench_compression.py
+
+The first table compresses the real payloads at the levels used for
+precompressed content (gzip 9 / brotli 11, paid once per deploy) and for
+dynamic responses (gzip 6 / brotli 4, paid per request). The second one
+times whole requests through the app: identity, precompressed variants
+(lesson, full dictionary) and middleware compression (dictionary search).
+Request times include the test client's own overhead, so compare them with
+each other rather than reading them as absolute server cost.
+"""
+import gzip
+import json
+import os
+import time
+
+from fastapi.testclient import TestClient
+
+import app
+import compression
+
+ITERATIONS = int(os.environ.get("ITERATIONS", "300"))
+
+
+def per_call_us(fn, iterations: int = ITERATIONS) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def payloads() -> dict:
+    pack = app.content.current
+    catalog = pack.catalog
+    return {
+        "dictionary": pack.dictionary_content.body,
+        "lesson (largest)": max((c.body for c in pack.lesson_content.values()), key=len),
+        "lessons overview": catalog.render(0, catalog.scores_vector({})),
+        "tips (all units)": json.dumps({str(k): v for k, v in pack.tips.items()}, ensure_ascii=False).encode("utf-8"),
+    }
+
+
+def codecs() -> dict:
+    result = {
+        "gzip 6": lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+        "gzip 9": lambda body: gzip.compress(body, compresslevel=9, mtime=0),
+    }
+    if compression.brotli is not None:
+        result["br 4"] = lambda body: compression.brotli.compress(body, quality=4)
+        result["br 11"] = lambda body: compression.brotli.compress(body, quality=11)
+    return result
+
+
+def main():
+    print(f"{'payload':<20} {'identity':>9}" + "".join(f" {name:>16}" for name in codecs()))
+    for name, body in payloads().items():
+        row = f"{name:<20} {len(body):>8}B"
+        for codec in codecs().values():
+            size = len(codec(body))
+            row += f" {size:>6}B {per_call_us(lambda: codec(body), 100):>6.0f}us"
+        print(row)
+
+    client = TestClient(app.app)
+    headers = {"Authorization": "Bearer " + app.create_access_token(data={"sub": "64b000000000000000000001"})}
+    print()
+    print(f"{'request':<32} {'encoding':<10} {'bytes':>7} {'us/request':>11}")
+    lessons = app.content.current.lesson_content
+    largest = max(lessons, key=lambda lesson_id: len(lessons[lesson_id].body))
+    for label, url in [("GET /lessons/{id} (precompressed)", f"/api/lessons/{largest}"),
+                       ("GET /dictionary (precompressed)", "/api/dictionary"),
+                       ("GET /dictionary?search (dynamic)", "/api/dictionary?search=a")]:
+        for accept in ["identity", "gzip", "br"]:
+            request_headers = {**headers, "Accept-Encoding": accept}
+            response = client.get(url, headers=request_headers)
+            cost = per_call_us(lambda: client.get(url, headers=request_headers))
+            encoding = response.headers.get("content-encoding", "identity")
+            # response.content is already decoded: report what went over the wire
+            wire_bytes = int(response.headers.get("content-length", len(response.content)))
+            print(f"{label:<32} {encoding:<10} {wire_bytes:>7} {cost:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Microbenchmark: response serialization cost per endpoint.
+
+Runs in-process (no server or database needed):
+
+    python bench_json.py
+
+"before" is what FastAPI did for these endpoints: ``jsonable_encoder`` plus
+stdlib json through ``JSONResponse`` (and ``UserResponse`` validation for
+/auth/me). "after" is the current path: pre-serialized bytes for content
+that only changes on deploy, the memoized /lessons body, and
+``ORJSONResponse`` without validation for the rest.
+"""
+import os
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+import app
+
+ITERATIONS = int(os.environ.get("ITERATIONS", "2000"))
+
+
+def per_call_us(fn, iterations: int = ITERATIONS) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def stdlib(data):
+    return JSONResponse(jsonable_encoder(data))
+
+
+def main():
+    me = {
+        "id": "64b000000000000000000001", "email": "ana@example.com", "username": "ana",
+        "xp": 120, "lives": 4, "streak": 3, "level": 1, "profile_image_url": None,
+        "last_activity": "2024-05-01T12:00:00",
+    }
+    stats = {
+        "username": "ana", "xp": 120, "level": 1, "lives": 4, "streak": 3,
+        "lessons_completed": 6, "total_lessons": 20, "progress_percentage": 30.0,
+    }
+    lesson_id = "u1l1"
+    pack = app.content.current
+    catalog = pack.catalog
+    mask, scores = 0b111, catalog.scores_vector({0: 90, 1: 80, 2: 100})
+    catalog.render(mask, scores)
+    search = pack.dictionary_index.search("a")
+
+    cases = [
+        ("GET /auth/me",
+         lambda: stdlib(app.UserResponse.model_validate(me)),
+         lambda: ORJSONResponse(me)),
+        ("GET /user/stats",
+         lambda: stdlib(stats),
+         lambda: ORJSONResponse(stats)),
+        ("GET /lessons",
+         lambda: stdlib(catalog.build(mask, scores)),
+         lambda: Response(catalog.render(mask, scores), media_type="application/json")),
+        ("GET /lessons/{id}",
+         lambda: stdlib(catalog.by_id[lesson_id]),
+         lambda: pack.lesson_content[lesson_id].response(None, app.LESSON_CACHE_CONTROL)),
+        ("GET /tips/{unit}",
+         lambda: stdlib(pack.tips[1]),
+         lambda: pack.tips_content[1].response(None, app.TIPS_CACHE_CONTROL)),
+        ("GET /dictionary",
+         lambda: stdlib(pack.dictionary_index.sorted_entries),
+         lambda: pack.dictionary_content.response(None, app.DICTIONARY_CACHE_CONTROL)),
+        ("GET /dictionary?search=",
+         lambda: stdlib(search),
+         lambda: ORJSONResponse(search)),
+    ]
+    print(f"{'endpoint':<24} {'before':>10} {'after':>10} {'speedup':>8}")
+    for name, before, after in cases:
+        before_us = per_call_us(before)
+        after_us = per_call_us(after)
+        print(f"{name:<24} {before_us:>8.1f}us {after_us:>8.1f}us {before_us / after_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
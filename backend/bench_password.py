@@ -0,0 +1,63 @@
+"""Benchmark: bcrypt verification inline on the event loop vs. on the process pool.
+
+Runs in-process (no server or database needed):
+
+    python bench_password.py
+
+For each mode it runs LOGINS concurrent verifications and reports the
+throughput (total and per core) and the worst event-loop stall seen by a
+10 ms ticker, which is what every other request experiences during a login burst.
+"""
+import asyncio
+import os
+import time
+
+from password_pool import PasswordHasher, pwd_context
+
+LOGINS = int(os.environ.get("LOGINS", "32"))
+TICK = 0.01
+
+
+async def ticker(stop: asyncio.Event, stalls: list):
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(TICK)
+        now = time.perf_counter()
+        stalls.append(now - last - TICK)
+        last = now
+
+
+async def run(label: str, verify, cores: int):
+    hashed = pwd_context.hash("MayaLearner2024!")
+    stop = asyncio.Event()
+    stalls = [0.0]
+    tick_task = asyncio.create_task(ticker(stop, stalls))
+    await asyncio.sleep(TICK * 2)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(verify("MayaLearner2024!", hashed) for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await tick_task
+    assert all(results)
+    print(f"{label:<8} {LOGINS / elapsed:7.1f} logins/s  {LOGINS / elapsed / cores:6.1f} per core  "
+          f"max event-loop stall {max(stalls) * 1000:8.1f} ms")
+
+
+async def main():
+    async def inline(plain, hashed):
+        return pwd_context.verify(plain, hashed)
+
+    await run("inline", inline, 1)
+
+    hasher = PasswordHasher(max_pending=LOGINS)
+    hasher.start()
+    try:
+        await hasher.verify("warm", pwd_context.hash("warm"))
+        await run("pool", hasher.verify, hasher.workers)
+    finally:
+        hasher.shutdown()
+    print(f"pool workers: {hasher.workers}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""Benchmark: /api/lessons latency while /api/speak is saturated.
+
+Run the backend against the local Azure stand-in first:
+
+    python -m uvicorn fake_azure:app --port 9000
+    AZURE_TRANSLATOR_ENDPOINT=http://127.0.0.1:9000 AZURE_TRANSLATOR_KEY=fake \\
+        python -m uvicorn app:app --port 8001
+
+then ``python bench_speak.py``. The script measures /api/lessons latency
+alone and again with SPEAK_WORKERS clients hammering /api/speak. With the
+old blocking ``requests.post`` the second run degrades to the Azure latency;
+with the async client both runs should be close.
+"""
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:8001/api")
+SPEAK_WORKERS = int(os.environ.get("SPEAK_WORKERS", "32"))
+LESSON_REQUESTS = int(os.environ.get("LESSON_REQUESTS", "200"))
+LESSON_CONCURRENCY = int(os.environ.get("LESSON_CONCURRENCY", "8"))
+
+
+async def get_token(client: httpx.AsyncClient) -> str:
+    creds = {"email": "bench_speak@example.com", "password": "bench-password", "username": "bench"}
+    response = await client.post(f"{BASE_URL}/auth/signup", json=creds)
+    if response.status_code != 200:
+        response = await client.post(f"{BASE_URL}/auth/login", json={"email": creds["email"], "password": creds["password"]})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def measure_lessons(client: httpx.AsyncClient, token: str) -> list:
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    remaining = iter(range(LESSON_REQUESTS))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get(f"{BASE_URL}/lessons", headers=headers)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(LESSON_CONCURRENCY)))
+    return latencies
+
+
+async def saturate_speak(client: httpx.AsyncClient, stop: asyncio.Event, counter: list):
+    i = 0
+    while not stop.is_set():
+        i += 1
+        async with client.stream("POST", f"{BASE_URL}/speak", json={"text": f"Ba'ax ka wa'alik {i}"}) as response:
+            async for _ in response.aiter_bytes():
+                pass
+        counter[0] += 1
+
+
+def report(label: str, latencies: list):
+    latencies = sorted(latencies)
+    p = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+    print(f"{label:<28} n={len(latencies):<5} p50={statistics.median(latencies):7.1f}ms "
+          f"p95={p(0.95):7.1f}ms p99={p(0.99):7.1f}ms max={latencies[-1]:7.1f}ms")
+
+
+async def main():
+    limits = httpx.Limits(max_connections=SPEAK_WORKERS + LESSON_CONCURRENCY + 4)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        token = await get_token(client)
+        report("lessons (idle)", await measure_lessons(client, token))
+
+        stop = asyncio.Event()
+        counter = [0]
+        speakers = [asyncio.create_task(saturate_speak(client, stop, counter)) for _ in range(SPEAK_WORKERS)]
+        await asyncio.sleep(1)
+        started = time.perf_counter()
+        latencies = await measure_lessons(client, token)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*speakers, return_exceptions=True)
+        report(f"lessons ({SPEAK_WORKERS} speak workers)", latencies)
+        print(f"speak throughput: {counter[0] / elapsed:.1f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+"""Bloom filter for fast negative membership checks.
+
+``key in bloom`` is never a false negative, and its false-positive rate stays
+close to ``error_rate`` until ``capacity`` items have been added. Probe
+positions come from one BLAKE2b digest split into two 64-bit halves (double
+hashing), so every lookup costs a single hash.
+"""
+import hashlib
+import math
+
+
+class BloomFilter:
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / self.capacity * math.log(2))), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def stats(self) -> dict:
+        return {
+            "items": self.count,
+            "capacity": self.capacity,
+            "bits": self.size,
+            "hash_count": self.hash_count,
+            # Expected false-positive rate at the current fill
+            "estimated_error_rate": round((1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count, 6),
+        }
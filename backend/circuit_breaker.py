@@ -0,0 +1,112 @@
+"""Circuit breaker for upstream calls.
+
+Keeps a rolling window of recent calls. When too many of them failed or were
+slower than the latency budget, the circuit opens and calls fail immediately
+instead of waiting for a timeout. After ``open_seconds`` a limited number of
+probe calls are let through (half-open); if they succeed the circuit closes
+again, otherwise it re-opens.
+"""
+import time
+from collections import deque
+from typing import Callable, Deque, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, window_seconds: float = 30.0, min_calls: int = 10,
+                 error_rate_threshold: float = 0.5, slow_call_seconds: float = 2.0,
+                 slow_rate_threshold: float = 0.5, open_seconds: float = 15.0,
+                 half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate_threshold = slow_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self.state = CLOSED
+        # (timestamp, failed, slow)
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _trim(self, now: float):
+        while self._calls and self._calls[0][0] < now - self.window_seconds:
+            self._calls.popleft()
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self._opened_at = now
+        self._probes_in_flight = 0
+        self.times_opened += 1
+
+    def before_call(self):
+        """Reserve a call slot or raise ``CircuitOpenError``."""
+        now = self._clock()
+        if self.state == OPEN:
+            if now - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} circuit open")
+            self.state = HALF_OPEN
+            self._probes_in_flight = 0
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_max_calls:
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} circuit half-open, probe in flight")
+            self._probes_in_flight += 1
+
+    def release(self):
+        """Give back a slot reserved by ``before_call`` for a call with no outcome (e.g. cancelled)."""
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+
+    def record(self, duration: float, failed: bool):
+        now = self._clock()
+        slow = duration >= self.slow_call_seconds
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+            if failed or slow:
+                self._open(now)
+            else:
+                self.state = CLOSED
+                self._calls.clear()
+            return
+        if self.state == OPEN:
+            # A call started before the circuit opened; it no longer matters
+            return
+        self._calls.append((now, failed, slow))
+        self._trim(now)
+        total = len(self._calls)
+        if total < self.min_calls:
+            return
+        failures = sum(1 for _, f, _ in self._calls if f)
+        slow_calls = sum(1 for _, _, s in self._calls if s)
+        if failures / total >= self.error_rate_threshold or slow_calls / total >= self.slow_rate_threshold:
+            self._open(now)
+
+    def stats(self) -> dict:
+        now = self._clock()
+        self._trim(now)
+        total = len(self._calls)
+        failures = sum(1 for _, f, _ in self._calls if f)
+        slow_calls = sum(1 for _, _, s in self._calls if s)
+        return {
+            "state": self.state,
+            "window_calls": total,
+            "window_error_rate": round(failures / total, 4) if total else 0.0,
+            "window_slow_rate": round(slow_calls / total, 4) if total else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "open_for_seconds": round(max(self.open_seconds - (now - self._opened_at), 0), 1) if self.state == OPEN else 0,
+        }
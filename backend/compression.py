@@ -0,0 +1,171 @@
+"""gzip / brotli content negotiation.
+
+``CompressedBody`` compresses a fixed body at most once per encoding, at the
+highest levels, and keeps the bytes (used for content that only changes on
+deploy). ``CompressionMiddleware`` compresses dynamic responses above a size
+threshold at cheaper levels. Brotli is used when the ``brotli`` package is
+installed; otherwise only gzip is offered.
+"""
+import gzip
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+MINIMUM_SIZE = 1024
+# Precompression is paid once, so smaller bodies are still worth it
+STATIC_MINIMUM_SIZE = 256
+# Precompressed bodies are compressed once, so they get the best ratio
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+# Per-request compression has to stay cheap
+DYNAMIC_GZIP_LEVEL = 6
+DYNAMIC_BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def available_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported coding the client accepts (brotli first), or None for identity"""
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, static: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=STATIC_BROTLI_QUALITY if static else DYNAMIC_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=STATIC_GZIP_LEVEL if static else DYNAMIC_GZIP_LEVEL, mtime=0)
+
+
+class CompressedBody:
+    """A fixed body plus its compressed variants, each computed on first use"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._variants: Dict[str, bytes] = {}
+
+    def variant(self, accept_encoding: Optional[str]):
+        """``(encoding, bytes)``; encoding is None when sent uncompressed"""
+        encoding = choose_encoding(accept_encoding) if len(self.body) >= STATIC_MINIMUM_SIZE else None
+        if encoding is None:
+            return None, self.body
+        data = self._variants.get(encoding)
+        if data is None:
+            data = self._variants[encoding] = compress(self.body, encoding, static=True)
+        return encoding, data
+
+
+class CompressionStats:
+    def __init__(self):
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def record(self, bytes_in: int, bytes_out: int):
+        self.compressed += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+
+    def stats(self) -> dict:
+        return {
+            "compressed_responses": self.compressed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else 0.0,
+        }
+
+
+class CompressionMiddleware:
+    """Compresses complete (non-streaming) responses of compressible types above ``minimum_size``"""
+
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE, stats: Optional[CompressionStats] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.stats = stats or CompressionStats()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = None
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = {k.lower(): v for k, v in message.get("headers", [])}
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                passthrough = (
+                    b"content-encoding" in headers
+                    or message["status"] < 200 or message["status"] in (204, 206, 304)
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streaming or small: not worth it
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+            data = compress(body, encoding)
+            self.stats.record(len(body), len(data))
+            headers = []
+            vary = b"Accept-Encoding"
+            for k, v in start_message.get("headers", []):
+                name = k.lower()
+                if name == b"content-length":
+                    continue
+                if name == b"vary":
+                    vary = v + b", Accept-Encoding"
+                    continue
+                if name == b"etag" and v.startswith(b'"'):
+                    # Same content, different bytes: only weakly equal to the identity ETag
+                    v = b"W/" + v
+                headers.append((k, v))
+            headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(data)).encode("latin-1")),
+                (b"vary", vary),
+            ]
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": data})
+
+        await self.app(scope, receive, send_wrapper)
+
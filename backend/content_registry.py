@@ -0,0 +1,181 @@
+"""Course content loaded from versioned content packs.
+
+A pack is a directory under ``content/`` holding ``pack.json`` (version and
+description), ``lessons.json``, ``tips.json`` and ``dictionary.json``. Loading
+one builds every derived structure up front (lesson catalog, dictionary
+search index, pre-serialized bodies with their ETags) into an immutable
+``ContentPack``. ``ContentRegistry.reload`` does that in a worker thread and
+then swaps the reference in one assignment, so a request that read
+``registry.current`` keeps a consistent snapshot while new requests see the
+new pack.
+
+Lesson progress is stored by lesson ordinal (position in ``lessons.json``),
+so a new pack must keep the lessons of the current one in place and only
+append; packs that break this are rejected.
+"""
+import hashlib
+import os
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+from starlette.concurrency import run_in_threadpool
+
+from dictionary_index import DictionaryIndex
+from http_cache import PreparedContent, content_etag
+from lesson_catalog import LessonCatalog
+
+DEFAULT_CONTENT_DIR = Path(__file__).parent / "content"
+PACK_FILES = ("pack.json", "lessons.json", "tips.json", "dictionary.json")
+
+
+class ContentPackError(Exception):
+    """The pack is missing, malformed or incompatible with the current one."""
+
+
+class ContentPack:
+    def __init__(self, name: str, version: str, lessons: List[dict], tips: Dict[int, dict], dictionary: List[dict]):
+        self.name = name
+        self.version = version
+        self.lessons: Tuple[dict, ...] = tuple(lessons)
+        self.tips = MappingProxyType(dict(tips))
+        self.dictionary: Tuple[dict, ...] = tuple(dictionary)
+        self.loaded_at = time.time()
+
+        self.catalog = LessonCatalog(self.lessons)
+        self.lessons_by_unit = MappingProxyType({
+            unit: tuple(self.lessons[ordinal] for ordinal in ordinals)
+            for unit, _, ordinals in self.catalog.units
+        })
+        self.dictionary_index = DictionaryIndex(self.dictionary)
+        by_category: Dict[str, List[dict]] = {}
+        for entry in self.dictionary_index.sorted_entries:
+            by_category.setdefault(entry.get("category", ""), []).append(entry)
+        self.dictionary_by_category = MappingProxyType({k: tuple(v) for k, v in by_category.items()})
+
+        # Bodies and ETags for the content endpoints, computed once per pack
+        self.lesson_content = MappingProxyType({
+            lesson["id"]: PreparedContent(lesson, version) for lesson in self.lessons
+        })
+        self.tips_content = MappingProxyType({unit: PreparedContent(t, version) for unit, t in self.tips.items()})
+        self.dictionary_content = PreparedContent(self.dictionary_index.sorted_entries, version)
+        self.dictionary_version = content_etag(version, self.dictionary_content.body)
+
+    def check_compatible(self, previous: "ContentPack"):
+        """Reject packs that would move lessons to another ordinal"""
+        previous_ids = [lesson["id"] for lesson in previous.lessons]
+        ids = [lesson["id"] for lesson in self.lessons[:len(previous_ids)]]
+        if ids != previous_ids:
+            raise ContentPackError(
+                f"pack {self.name!r} reorders or removes lessons of {previous.name!r}; new lessons can only be appended"
+            )
+
+    def summary(self) -> dict:
+        return {
+            "pack": self.name,
+            "version": self.version,
+            "lessons": len(self.lessons),
+            "units": len(self.lessons_by_unit),
+            "tips": len(self.tips),
+            "dictionary_entries": len(self.dictionary),
+            "loaded_at": self.loaded_at,
+        }
+
+
+def _read_json(path: Path):
+    try:
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        raise ContentPackError(f"missing {path.name} in {path.parent}")
+    except orjson.JSONDecodeError as e:
+        raise ContentPackError(f"{path}: {e}")
+
+
+def pack_fingerprint(directory: Path) -> str:
+    """Changes whenever any file of the pack changes (size or mtime)"""
+    digest = hashlib.sha256()
+    for name in PACK_FILES:
+        try:
+            stat = (directory / name).stat()
+        except FileNotFoundError:
+            continue
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_pack(directory: Path) -> ContentPack:
+    meta = _read_json(directory / "pack.json")
+    lessons = _read_json(directory / "lessons.json")
+    tips = _read_json(directory / "tips.json")
+    dictionary = _read_json(directory / "dictionary.json")
+    ids = [lesson.get("id") for lesson in lessons]
+    if None in ids or len(set(ids)) != len(ids):
+        raise ContentPackError(f"{directory}: lesson ids must be present and unique")
+    try:
+        tips = {int(unit): value for unit, value in tips.items()}
+    except ValueError:
+        raise ContentPackError(f"{directory}: tips must be keyed by unit number")
+    # The declared version plus a hash of the files, so an edit without a bump still changes every ETag
+    digest = hashlib.sha256()
+    for name in PACK_FILES:
+        digest.update((directory / name).read_bytes())
+    version = f"{meta.get('version', directory.name)}+{digest.hexdigest()[:12]}"
+    return ContentPack(directory.name, version, lessons, tips, dictionary)
+
+
+class ContentRegistry:
+    def __init__(self, root: Path = DEFAULT_CONTENT_DIR, pack: Optional[str] = None):
+        self.root = Path(root)
+        self.pack_name = pack or os.environ.get("CONTENT_PACK") or self.latest()
+        self.current = load_pack(self.root / self.pack_name)
+        self._fingerprint = pack_fingerprint(self.root / self.pack_name)
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.last_error: Optional[str] = None
+
+    def available(self) -> List[str]:
+        return sorted(p.name for p in self.root.iterdir() if (p / "pack.json").exists())
+
+    def latest(self) -> str:
+        packs = self.available()
+        if not packs:
+            raise ContentPackError(f"no content packs in {self.root}")
+        return packs[-1]
+
+    def changed(self) -> bool:
+        return pack_fingerprint(self.root / self.pack_name) != self._fingerprint
+
+    async def reload(self, pack: Optional[str] = None) -> ContentPack:
+        """Build ``pack`` (default: the active one) off the event loop and swap it in"""
+        name = pack or self.pack_name
+        directory = self.root / name
+        if not (directory / "pack.json").exists():
+            raise ContentPackError(f"unknown content pack {name!r}")
+        fingerprint = pack_fingerprint(directory)
+        try:
+            new_pack = await run_in_threadpool(load_pack, directory)
+            new_pack.check_compatible(self.current)
+        except ContentPackError as e:
+            self.failed_reloads += 1
+            self.last_error = str(e)
+            if name == self.pack_name:
+                # Do not retry these files until they change again
+                self._fingerprint = fingerprint
+            raise
+        self.current = new_pack
+        self.pack_name = name
+        self._fingerprint = fingerprint
+        self.reloads += 1
+        self.last_error = None
+        return new_pack
+
+    def stats(self) -> dict:
+        return {
+            **self.current.summary(),
+            "available": self.available(),
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+            "last_error": self.last_error,
+        }
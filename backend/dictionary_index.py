@@ -0,0 +1,157 @@
+"""Hash indexes over the dictionary for constant-time exact lookups and search.
+
+Keys are folded with ``fold_text`` so case, accents, punctuation and the
+different apostrophes used for the glottal stop (' vs ’) all match. Spanish
+glosses with alternatives ("Verde/Azul") are also indexed per alternative.
+
+Substring search uses an inverted index of 1- to 3-grams over both fields:
+the candidates for a query are the intersection of the posting lists of its
+n-grams, which are then verified and ranked exact > prefix > infix.
+
+Misspellings are caught by a symmetric-delete index per language over the
+folded text with glottal stops removed, so a missing apostrophe costs
+nothing and each remaining typo costs one edit.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+
+from fuzzy_index import SymmetricDeleteIndex
+from text_normalize import fold_text
+
+SPANISH = "es"
+MAYA = "yua"
+MAX_NGRAM = 3
+
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_INFIX = 2
+
+
+def skeleton(text: str) -> str:
+    return fold_text(text).replace("'", "")
+
+
+def ngrams(text: str, n: int) -> Set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def dedupe_entries(entries: List[dict]) -> List[dict]:
+    """Drop repeated (maya, spanish) pairs, keeping the first occurrence."""
+    seen = set()
+    unique = []
+    for entry in entries:
+        key = (fold_text(entry["maya"]), fold_text(entry["spanish"]))
+        if key not in seen:
+            seen.add(key)
+            unique.append(entry)
+    return unique
+
+
+class DictionaryIndex:
+    def __init__(self, entries: List[dict]):
+        self.entries = dedupe_entries(entries)
+        self.by_spanish: Dict[str, List[dict]] = {}
+        self.by_maya: Dict[str, List[dict]] = {}
+        for entry in self.entries:
+            self.by_maya.setdefault(fold_text(entry["maya"]), []).append(entry)
+            self.by_spanish.setdefault(fold_text(entry["spanish"]), []).append(entry)
+        # Alternatives go last so a full-gloss match always wins
+        for entry in self.entries:
+            if "/" in entry["spanish"]:
+                for alternative in entry["spanish"].split("/"):
+                    candidates = self.by_spanish.setdefault(fold_text(alternative), [])
+                    if entry not in candidates:
+                        candidates.append(entry)
+
+        # Typo-tolerant lookups; Spanish alternatives are indexed too
+        self._by_skeleton: Dict[str, Dict[str, List[dict]]] = {SPANISH: {}, MAYA: {}}
+        for entry in self.entries:
+            self._by_skeleton[MAYA].setdefault(skeleton(entry["maya"]), []).append(entry)
+            glosses = [entry["spanish"]] + (entry["spanish"].split("/") if "/" in entry["spanish"] else [])
+            for gloss in glosses:
+                candidates = self._by_skeleton[SPANISH].setdefault(skeleton(gloss), [])
+                if entry not in candidates:
+                    candidates.append(entry)
+        self._fuzzy = {lang: SymmetricDeleteIndex(keys) for lang, keys in self._by_skeleton.items()}
+
+        # Alphabetical view served when there is no search term
+        self.sorted_entries = sorted(self.entries, key=lambda e: e["maya"].lower())
+        self._folded: List[Tuple[str, str]] = [(fold_text(e["maya"]), fold_text(e["spanish"])) for e in self.sorted_entries]
+        self._postings: Dict[str, Set[int]] = {}
+        for i, fields in enumerate(self._folded):
+            for field in fields:
+                for n in range(1, MAX_NGRAM + 1):
+                    for gram in ngrams(field, n):
+                        self._postings.setdefault(gram, set()).add(i)
+
+    def find(self, text: str, from_lang: str) -> List[dict]:
+        """All entries whose ``from_lang`` side matches ``text``, best first."""
+        if from_lang == SPANISH:
+            return self.by_spanish.get(fold_text(text), [])
+        if from_lang == MAYA:
+            return self.by_maya.get(fold_text(text), [])
+        return []
+
+    def translate(self, text: str, from_lang: str, to_lang: str) -> Optional[str]:
+        if (from_lang, to_lang) == (SPANISH, MAYA):
+            matches = self.find(text, SPANISH)
+            return matches[0]["maya"] if matches else None
+        if (from_lang, to_lang) == (MAYA, SPANISH):
+            matches = self.find(text, MAYA)
+            return matches[0]["spanish"] if matches else None
+        return None
+
+    def suggest(self, text: str, from_lang: str, limit: int = 5) -> List[Tuple[dict, int]]:
+        """Closest entries on the ``from_lang`` side within the typo budget, as (entry, distance)."""
+        if from_lang not in self._fuzzy:
+            return []
+        results = []
+        seen = set()
+        for key, distance in self._fuzzy[from_lang].lookup(skeleton(text)):
+            for entry in self._by_skeleton[from_lang][key]:
+                if id(entry) not in seen:
+                    seen.add(id(entry))
+                    results.append((entry, distance))
+            if len(results) >= limit:
+                break
+        return results[:limit]
+
+    def translate_fuzzy(self, text: str, from_lang: str, to_lang: str) -> Optional[Tuple[str, str]]:
+        """Best (translation, matched source text) for a probably misspelled ``text``."""
+        if (from_lang, to_lang) not in ((SPANISH, MAYA), (MAYA, SPANISH)):
+            return None
+        suggestions = self.suggest(text, from_lang, limit=1)
+        if not suggestions:
+            return None
+        entry = suggestions[0][0]
+        source, target = ("spanish", "maya") if from_lang == SPANISH else ("maya", "spanish")
+        return entry[target], entry[source]
+
+    def _rank(self, query: str, i: int) -> Optional[int]:
+        best = None
+        for field in self._folded[i]:
+            if field == query:
+                return RANK_EXACT
+            if field.startswith(query) or f" {query}" in f" {field}".replace("/", " "):
+                rank = RANK_PREFIX
+            elif query in field:
+                rank = RANK_INFIX
+            else:
+                continue
+            best = rank if best is None else min(best, rank)
+        return best
+
+    def search(self, text: str) -> List[dict]:
+        """Entries containing ``text`` in either field, ranked exact > prefix > infix."""
+        query = fold_text(text)
+        if not query:
+            return self.sorted_entries
+        grams = ngrams(query, MAX_NGRAM) if len(query) >= MAX_NGRAM else {query}
+        postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:]) if postings else set()
+        ranked = []
+        for i in candidates:
+            rank = self._rank(query, i)
+            if rank is not None:
+                ranked.append((rank, i))
+        ranked.sort()
+        return [self.sorted_entries[i] for _, i in ranked]
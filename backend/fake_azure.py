@@ -0,0 +1,80 @@
+"""Local stand-in for the Azure Translator API.
+
+Implements just enough of ``/translate`` and ``/speak`` to exercise the proxy
+endpoints, benchmarks and the audio bake pipeline without a real key:
+
+    python -m uvicorn fake_azure:app --port 9000
+    AZURE_TRANSLATOR_ENDPOINT=http://127.0.0.1:9000 AZURE_TRANSLATOR_KEY=fake \\
+        python -m uvicorn app:app --port 8001
+
+Latency is configurable through FAKE_AZURE_LATENCY_MS (time to first byte)
+and FAKE_AZURE_CHUNK_DELAY_MS (delay between audio chunks).
+"""
+import asyncio
+import hashlib
+import os
+from typing import List
+
+from fastapi import FastAPI, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+LATENCY_MS = float(os.environ.get("FAKE_AZURE_LATENCY_MS", "300"))
+CHUNK_DELAY_MS = float(os.environ.get("FAKE_AZURE_CHUNK_DELAY_MS", "20"))
+AUDIO_CHUNKS = 16
+AUDIO_CHUNK_SIZE = 1024
+
+app = FastAPI()
+app.state.calls = {"translate": 0, "speak": 0}
+# Upstream calls per text, to check request coalescing
+app.state.calls_by_text = {"translate": {}, "speak": {}}
+
+
+def count_call(kind: str, texts: List[str]):
+    app.state.calls[kind] += 1
+    by_text = app.state.calls_by_text[kind]
+    for text in texts:
+        by_text[text] = by_text.get(text, 0) + 1
+
+
+class TextItem(BaseModel):
+    Text: str
+
+
+def fake_audio(text: str) -> bytes:
+    """Deterministic pseudo-MP3 payload for ``text``."""
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    return b"ID3" + (seed * (AUDIO_CHUNKS * AUDIO_CHUNK_SIZE // len(seed) + 1))[: AUDIO_CHUNKS * AUDIO_CHUNK_SIZE]
+
+
+@app.post("/translate")
+async def translate(body: List[TextItem], to: str = Query(...), from_: str = Query("es", alias="from")):
+    count_call("translate", [item.Text for item in body])
+    await asyncio.sleep(LATENCY_MS / 1000)
+    return [{"translations": [{"text": f"[{to}] {item.Text}", "to": to}]} for item in body]
+
+
+@app.post("/speak")
+async def speak(body: List[TextItem]):
+    count_call("speak", [item.Text for item in body])
+    audio = fake_audio(body[0].Text if body else "")
+    await asyncio.sleep(LATENCY_MS / 1000)
+
+    async def chunks():
+        for i in range(0, len(audio), AUDIO_CHUNK_SIZE):
+            yield audio[i:i + AUDIO_CHUNK_SIZE]
+            await asyncio.sleep(CHUNK_DELAY_MS / 1000)
+
+    return StreamingResponse(chunks(), media_type="audio/mp3")
+
+
+@app.get("/calls")
+async def calls():
+    return {**app.state.calls, "by_text": app.state.calls_by_text}
+
+
+@app.post("/calls/reset")
+async def reset_calls():
+    app.state.calls = {"translate": 0, "speak": 0}
+    app.state.calls_by_text = {"translate": {}, "speak": {}}
+    return app.state.calls
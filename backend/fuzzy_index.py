@@ -0,0 +1,87 @@
+"""Symmetric-delete index for fuzzy (typo tolerant) term lookups.
+
+Every indexed term is stored under all the strings obtained by deleting up
+to ``max_distance`` characters from it. A query generates its own deletes the
+same way, so any term within that edit distance shares at least one key with
+it; only those few candidates are checked with a real edit distance.
+"""
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def deletes(term: str, max_distance: int) -> Set[str]:
+    result = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for word in frontier:
+            for i in range(len(word)):
+                next_frontier.add(word[:i] + word[i + 1:])
+        result |= next_frontier
+        frontier = next_frontier
+    return result
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent swaps cost 1), capped at ``limit + 1``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def distance_budget(term: str) -> int:
+    """Short words tolerate fewer typos, otherwise everything matches everything."""
+    if len(term) <= 2:
+        return 0
+    if len(term) <= 4:
+        return 1
+    return 2
+
+
+class SymmetricDeleteIndex:
+    def __init__(self, terms: Iterable[str], max_distance: int = 2):
+        self.max_distance = max_distance
+        # Longer queries cannot be within reach of any term, and their deletes are costly
+        self.max_length = 0
+        self.terms: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._deletes: Dict[str, Set[int]] = {}
+        for term in terms:
+            if term in self._ids:
+                continue
+            term_id = len(self.terms)
+            self._ids[term] = term_id
+            self.terms.append(term)
+            self.max_length = max(self.max_length, len(term))
+            for key in deletes(term, max_distance):
+                self._deletes.setdefault(key, set()).add(term_id)
+
+    def lookup(self, query: str, max_distance: int = None) -> List[Tuple[str, int]]:
+        """Indexed terms within ``max_distance`` of ``query``, closest first."""
+        if max_distance is None:
+            max_distance = distance_budget(query)
+        max_distance = min(max_distance, self.max_distance)
+        if len(query) > self.max_length + max_distance:
+            return []
+        candidates: Set[int] = set()
+        for key in deletes(query, max_distance):
+            candidates |= self._deletes.get(key, set())
+        matches = []
+        for term_id in candidates:
+            term = self.terms[term_id]
+            distance = edit_distance(query, term, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, term_id))
+        matches.sort()
+        return [(self.terms[term_id], distance) for distance, term_id in matches]
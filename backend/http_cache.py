@@ -0,0 +1,55 @@
+"""Content-hash ETags and conditional GET for content that only changes on deploy.
+
+Bodies are serialized and hashed once (``PreparedContent``); a request whose
+``If-None-Match`` lists the current ETag gets an empty 304 instead.
+"""
+import hashlib
+import orjson
+from typing import Optional
+
+from fastapi.responses import Response
+
+from compression import CompressedBody
+
+
+def content_etag(*parts) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    strip_weak = lambda tag: tag[2:] if tag.startswith("W/") else tag
+    return strip_weak(etag) in (strip_weak(tag.strip()) for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+class PreparedContent:
+    """A JSON body serialized once, with its ETag and precompressed variants"""
+
+    def __init__(self, data, version: str = ""):
+        self.body = orjson.dumps(data)
+        # The content version is part of the ETag, so a new pack revalidates everything
+        self.etag = content_etag(version, self.body)
+        self.compressed = CompressedBody(self.body)
+
+    def response(self, if_none_match: Optional[str], cache_control: str,
+                 accept_encoding: Optional[str] = None) -> Response:
+        if etag_matches(if_none_match, self.etag):
+            return not_modified(self.etag, cache_control)
+        encoding, body = self.compressed.variant(accept_encoding)
+        headers = {"ETag": self.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+            headers["ETag"] = f"W/{self.etag}"
+        return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,278 @@
+"""Idempotency keys for mutating requests.
+
+A client that may retry a request sends an ``Idempotency-Key`` header. The
+first request with a key claims it in a TTL-indexed Mongo collection, runs,
+and stores its response there; any repeat (same user, method, path and key)
+gets that stored response back with ``Idempotent-Replayed: true`` instead of
+running again. Recently completed keys are also kept in an in-process LRU,
+so the common retry never reaches Mongo.
+
+A repeat that arrives while the first request is still running gets a 409,
+and reusing a key with a different body gets a 422. Server errors and
+responses the client is expected to retry (401, 408, 409, 429) are not
+stored, so the key can be used again. Without Mongo the in-process cache
+still deduplicates retries that land on the same worker.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional, Tuple
+
+import orjson
+from pymongo.errors import DuplicateKeyError
+
+MUTATING_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+MAX_KEY_LENGTH = 255
+# Larger requests (uploads) and responses (audio) are passed through untouched
+MAX_REQUEST_BYTES = 64 * 1024
+MAX_RESPONSE_BYTES = 256 * 1024
+# A claim older than this is taken to belong to a request that died
+LOCK_SECONDS = 60
+NOT_REPLAYABLE = (401, 408, 409, 429)
+
+NEW = "new"
+REPLAY = "replay"
+BUSY = "busy"
+
+
+def request_key(user: str, method: str, path: str, key: str) -> str:
+    return hashlib.sha256(f"{user}\0{method}\0{path}\0{key}".encode("utf-8")).hexdigest()
+
+
+def request_fingerprint(query_string: bytes, body: bytes) -> str:
+    return hashlib.sha256(query_string + b"\0" + body).hexdigest()
+
+
+def replayable(status: int) -> bool:
+    return status < 500 and status not in NOT_REPLAYABLE
+
+
+class IdempotencyStore:
+    def __init__(self, collection, ttl_seconds: float, max_entries: int = 10000,
+                 lock_seconds: float = LOCK_SECONDS):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lock_seconds = lock_seconds
+        # key -> (expires_at, response record)
+        self._recent: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._in_flight = set()
+        self.executed = 0
+        self.replayed_local = 0
+        self.replayed_store = 0
+        self.conflicts = 0
+        self.unavailable = 0
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("created_at", expireAfterSeconds=int(self.ttl_seconds))
+
+    def _remember(self, key: str, record: dict):
+        self._recent[key] = (time.monotonic() + self.ttl_seconds, record)
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_entries:
+            self._recent.popitem(last=False)
+
+    def recent(self, key: str) -> Optional[dict]:
+        entry = self._recent.get(key)
+        if entry is None:
+            return None
+        expires_at, record = entry
+        if expires_at <= time.monotonic():
+            del self._recent[key]
+            return None
+        self._recent.move_to_end(key)
+        return record
+
+    async def begin(self, key: str, fingerprint: str) -> Tuple[str, Optional[dict]]:
+        """Claim ``key`` (NEW), or return the stored response (REPLAY) or BUSY"""
+        record = self.recent(key)
+        if record is not None:
+            self.replayed_local += 1
+            return REPLAY, record
+        if key in self._in_flight:
+            self.conflicts += 1
+            return BUSY, None
+        self._in_flight.add(key)
+        now = datetime.utcnow()
+        try:
+            try:
+                await self.collection.insert_one({
+                    "_id": key, "state": "in_progress", "fingerprint": fingerprint,
+                    "created_at": now, "started_at": now,
+                })
+                self.executed += 1
+                return NEW, None
+            except DuplicateKeyError:
+                doc = await self.collection.find_one({"_id": key})
+                if doc is not None and doc["state"] == "done":
+                    record = {k: doc[k] for k in ("fingerprint", "status", "headers", "body")}
+                    self._remember(key, record)
+                    self._in_flight.discard(key)
+                    self.replayed_store += 1
+                    return REPLAY, record
+                if doc is not None and doc["started_at"] < now - timedelta(seconds=self.lock_seconds):
+                    # Take over the claim of a request that never finished
+                    taken = await self.collection.find_one_and_update(
+                        {"_id": key, "state": "in_progress", "started_at": doc["started_at"]},
+                        {"$set": {"started_at": now, "fingerprint": fingerprint}},
+                    )
+                    if taken is not None:
+                        self.executed += 1
+                        return NEW, None
+                self._in_flight.discard(key)
+                self.conflicts += 1
+                return BUSY, None
+        except Exception as e:
+            # Keep serving: only the in-process cache deduplicates until Mongo is back
+            print(f"Idempotency store unavailable: {e}")
+            self.unavailable += 1
+            self.executed += 1
+            return NEW, None
+
+    async def finish(self, key: str, record: dict):
+        """Store the response of a claimed key"""
+        self._remember(key, record)
+        self._in_flight.discard(key)
+        try:
+            await self.collection.update_one({"_id": key}, {"$set": {"state": "done", **record}})
+        except Exception as e:
+            print(f"Idempotency store unavailable: {e}")
+            self.unavailable += 1
+
+    async def abandon(self, key: str):
+        """Release a claimed key without a stored response, so it can be used again"""
+        self._in_flight.discard(key)
+        try:
+            await self.collection.delete_one({"_id": key, "state": "in_progress"})
+        except Exception as e:
+            print(f"Idempotency store unavailable: {e}")
+            self.unavailable += 1
+
+    def stats(self) -> dict:
+        return {
+            "executed": self.executed,
+            "replayed_local": self.replayed_local,
+            "replayed_store": self.replayed_store,
+            "conflicts": self.conflicts,
+            "in_flight": len(self._in_flight),
+            "recent_entries": len(self._recent),
+            "store_errors": self.unavailable,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+async def send_json(send, status: int, data: dict, headers: Optional[list] = None):
+    body = orjson.dumps(data)
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())] + (headers or []),
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """Replays stored responses for repeated ``Idempotency-Key`` requests.
+
+    ``identify`` is awaited with the Authorization header and returns a user
+    id (None when the request is not authenticated, or the token is revoked;
+    those are passed through untouched).
+    Paths starting with one of ``exclude`` are never deduplicated.
+    """
+
+    def __init__(self, app, store: IdempotencyStore, identify: Callable[[Optional[bytes]], Awaitable[Optional[str]]],
+                 exclude: Tuple[str, ...] = ()):
+        self.app = app
+        self.store = store
+        self.identify = identify
+        self.exclude = exclude
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] not in MUTATING_METHODS
+                or not scope["path"].startswith("/api/") or scope["path"].startswith(self.exclude)):
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers", []))
+        raw_key = headers.get(b"idempotency-key")
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+        key_text = raw_key.decode("latin-1").strip()
+        if not 0 < len(key_text) <= MAX_KEY_LENGTH:
+            await send_json(send, 400, {"detail": f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"})
+            return
+        user = await self.identify(headers.get(b"authorization"))
+        if user is None:
+            await self.app(scope, receive, send)
+            return
+
+        # The body is read up front to fingerprint it, then handed to the app as is
+        messages = []
+        size = 0
+        more_body = True
+        while more_body and size <= MAX_REQUEST_BYTES:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            size += len(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        async def replay_receive():
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        if more_body:
+            await self.app(scope, replay_receive, send)
+            return
+        body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.request")
+        fingerprint = request_fingerprint(scope.get("query_string", b""), body)
+        key = request_key(user, scope["method"], scope["path"], key_text)
+
+        state, record = await self.store.begin(key, fingerprint)
+        if state == BUSY:
+            await send_json(send, 409, {"detail": "A request with this Idempotency-Key is still in progress"},
+                            [(b"retry-after", b"1")])
+            return
+        if state == REPLAY:
+            if record["fingerprint"] != fingerprint:
+                await send_json(send, 422, {"detail": "Idempotency-Key was already used with a different request"})
+                return
+            await send({
+                "type": "http.response.start",
+                "status": record["status"],
+                "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in record["headers"]]
+                           + [(b"idempotent-replayed", b"true")],
+            })
+            await send({"type": "http.response.body", "body": bytes(record["body"])})
+            return
+
+        start_message = None
+        chunks = []
+        response_size = 0
+
+        async def send_wrapper(message):
+            nonlocal start_message, response_size
+            if message["type"] == "http.response.start":
+                start_message = message
+            elif message["type"] == "http.response.body" and response_size <= MAX_RESPONSE_BYTES:
+                chunks.append(message.get("body", b""))
+                response_size += len(chunks[-1])
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+        except BaseException:
+            await self.store.abandon(key)
+            raise
+        if start_message is not None and response_size <= MAX_RESPONSE_BYTES and replayable(start_message["status"]):
+            await self.store.finish(key, {
+                "fingerprint": fingerprint,
+                "status": start_message["status"],
+                "headers": [(k.decode("latin-1"), v.decode("latin-1")) for k, v in start_message.get("headers", [])],
+                "body": b"".join(chunks),
+            })
+        else:
+            await self.store.abandon(key)
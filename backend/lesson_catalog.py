@@ -0,0 +1,87 @@
+"""Lesson catalog compiled once from the static lesson list.
+
+Each lesson gets a fixed ordinal (its position in the lesson list, so new
+lessons must be appended), and a user's progress reduces to a completion
+bitmask plus a score per ordinal. The
+``/lessons`` response only depends on that pair, and most users share a few
+states (nothing done, first lesson done, ...), so the serialized JSON is
+memoized per state in a small LRU.
+"""
+import orjson
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+DEFAULT_MAX_RESPONSES = 4096
+
+
+class LessonCatalog:
+    def __init__(self, lessons: List[dict], max_responses: int = DEFAULT_MAX_RESPONSES):
+        self.lessons = list(lessons)
+        self.by_id: Dict[str, dict] = {lesson["id"]: lesson for lesson in self.lessons}
+        self.ordinals: Dict[str, int] = {lesson["id"]: i for i, lesson in enumerate(self.lessons)}
+        self.all_mask = (1 << len(self.lessons)) - 1
+        # [(unit, title, [ordinal, ...]), ...] in display order (unit, then lesson order)
+        self.units: List[Tuple[int, str, List[int]]] = []
+        display = sorted(range(len(self.lessons)), key=lambda i: (self.lessons[i]["unit"], self.lessons[i]["order"]))
+        for i in display:
+            lesson = self.lessons[i]
+            if not self.units or self.units[-1][0] != lesson["unit"]:
+                self.units.append((lesson["unit"], lesson["unit_title"], []))
+            self.units[-1][2].append(i)
+        self.max_responses = max_responses
+        self._responses: "OrderedDict[Tuple[int, Tuple[int, ...]], bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.lessons)
+
+    def scores_vector(self, scores: Dict[int, int]) -> Tuple[int, ...]:
+        """Scores by ordinal as a hashable tuple (0 for lessons never finished)"""
+        return tuple(scores.get(i, 0) for i in range(len(self.lessons)))
+
+    def build(self, mask: int, scores: Tuple[int, ...]) -> list:
+        units = []
+        for unit, title, ordinals in self.units:
+            lessons = []
+            for position, ordinal in enumerate(ordinals):
+                lesson = self.lessons[ordinal]
+                lessons.append({
+                    "id": lesson["id"],
+                    "order": lesson["order"],
+                    "title": lesson["title"],
+                    "description": lesson["description"],
+                    "xp_reward": lesson["xp_reward"],
+                    "completed": bool(mask >> ordinal & 1),
+                    "score": scores[ordinal],
+                    # Sequential unlocking: the first lesson of a unit is always open
+                    "locked": position > 0 and not mask >> ordinals[position - 1] & 1,
+                })
+            units.append({"unit": unit, "title": title, "lessons": lessons})
+        return units
+
+    def render(self, mask: int, scores: Tuple[int, ...]) -> bytes:
+        """Serialized ``build(mask, scores)``, memoized per progress state"""
+        key = (mask, scores)
+        body = self._responses.get(key)
+        if body is not None:
+            self._responses.move_to_end(key)
+            self.hits += 1
+            return body
+        self.misses += 1
+        body = orjson.dumps(self.build(mask, scores))
+        self._responses[key] = body
+        while len(self._responses) > self.max_responses:
+            self._responses.popitem(last=False)
+        return body
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "lessons": len(self.lessons),
+            "units": len(self.units),
+            "memoized_responses": len(self._responses),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,168 @@
+"""Lesson sessions graded on the server.
+
+``start`` hands out a signed session token together with the lesson; at the
+end the client sends every answer in one ``submit``. The server grades them
+against ``correct_answer`` and applies hearts, XP and progress in a single
+update, so a lesson costs two requests and XP is never taken from the client.
+
+Session tokens are JWTs signed with their own key (so they never pass as an
+access token) and bind the user, the lesson, a digest of its exercises and
+the start time. The user document keeps the start time of the last graded
+session of every lesson (``lesson_sessions.<ordinal>``) and the update only
+applies to a later one, so each session is graded at most once.
+"""
+import hashlib
+import time
+from typing import Any, List, Optional, Tuple
+
+import orjson
+from jose import JWTError, jwt
+from pymongo import ReturnDocument
+
+from http_cache import content_etag
+from progress_store import WORD_BITS, ProgressStore, user_query_id
+from user_counters import MAX_LIVES
+
+ALGORITHM = "HS256"
+
+
+class LessonSessionError(Exception):
+    """The session token or the answers cannot be graded."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def exercises_digest(lesson: dict) -> str:
+    """Changes whenever the exercises (and so the right answers) change"""
+    return content_etag(orjson.dumps(lesson.get("exercises", []))).strip('"')
+
+
+def grade_exercise(exercise: dict, answer: Any) -> bool:
+    """Same rules as the lesson screen: exact option, or every pair matched"""
+    if exercise.get("type") in ("translate", "multiple_choice"):
+        return isinstance(answer, str) and answer == exercise.get("correct_answer")
+    if exercise.get("type") == "matching":
+        pairs = exercise.get("pairs") or []
+        return isinstance(answer, dict) and all(answer.get(p["maya"]) == p["spanish"] for p in pairs)
+    return False
+
+
+def grade(lesson: dict, answers: List[Any]) -> Tuple[List[bool], int, int]:
+    """(result per exercise, score percent, XP earned)"""
+    exercises = lesson.get("exercises", [])
+    if len(answers) != len(exercises):
+        raise LessonSessionError(400, f"Expected {len(exercises)} answers, got {len(answers)}")
+    results = [grade_exercise(exercise, answer) for exercise, answer in zip(exercises, answers)]
+    fraction = sum(results) / len(results) if results else 1.0
+    # Rounded half up, like Math.round in the old client-side computation
+    return results, int(fraction * 100 + 0.5), int(fraction * lesson.get("xp_reward", 0) + 0.5)
+
+
+def clamp_result(lesson: dict, score: int, xp: int) -> Tuple[int, int]:
+    """Score and XP reported by a client (ungraded) kept within what the lesson can award"""
+    return min(max(int(score), 0), 100), min(max(int(xp), 0), int(lesson.get("xp_reward", 0)))
+
+
+def submission_pipeline(ordinal: int, score: int, xp: int, lives_lost: int, started_at: int) -> list:
+    """Completion, score, attempts, XP and hearts of one graded session as one update.
+
+    ``$bit`` cannot be combined with the clamped lives computation, so the
+    completion bit is set arithmetically (add it unless it is already set).
+    """
+    word, bit = divmod(ordinal, WORD_BITS)
+    completed = f"progress.completed.{word}"
+    current = {"$ifNull": [f"${completed}", 0]}
+    bit_set = {"$eq": [{"$mod": [{"$floor": {"$divide": [current, 1 << bit]}}, 2]}, 1]}
+    return [{"$set": {
+        completed: {"$cond": [bit_set, current, {"$add": [current, 1 << bit]}]},
+        f"progress.scores.{ordinal}": {"$literal": score},
+        f"progress.attempts.{ordinal}": {"$add": [{"$ifNull": [f"$progress.attempts.{ordinal}", 0]}, 1]},
+        "xp": {"$add": [{"$ifNull": ["$xp", 0]}, xp]},
+        "lives": {"$max": [{"$subtract": [{"$ifNull": ["$lives", MAX_LIVES]}, lives_lost]}, 0]},
+        f"lesson_sessions.{ordinal}": {"$literal": started_at},
+    }}]
+
+
+class LessonSessions:
+    def __init__(self, users, progress: ProgressStore, secret: str, ttl_seconds: float = 3600):
+        self.users = users
+        self.progress = progress
+        # Derived key: a session token is useless as an access token and vice versa
+        self._key = hashlib.sha256(f"lesson-session:{secret}".encode("utf-8")).hexdigest()
+        self.ttl_seconds = ttl_seconds
+        self.started = 0
+        self.graded = 0
+        self.rejected = 0
+
+    def start(self, user_id: str, lesson: dict) -> str:
+        now = time.time()
+        self.started += 1
+        return jwt.encode({
+            "sub": user_id,
+            "lesson": lesson["id"],
+            "digest": exercises_digest(lesson),
+            "started_at": int(now * 1000),
+            "exp": int(now + self.ttl_seconds),
+        }, self._key, algorithm=ALGORITHM)
+
+    def verify(self, token: str, user_id: str, lesson: dict) -> int:
+        """Start time (ms) of a valid session of ``user_id`` on ``lesson``"""
+        try:
+            claims = jwt.decode(token, self._key, algorithms=[ALGORITHM])
+        except JWTError:
+            raise LessonSessionError(400, "Invalid or expired lesson session")
+        if claims.get("sub") != user_id or claims.get("lesson") != lesson["id"]:
+            raise LessonSessionError(400, "Lesson session belongs to another lesson")
+        if claims.get("digest") != exercises_digest(lesson):
+            raise LessonSessionError(409, "Lesson changed since the session started")
+        return int(claims["started_at"])
+
+    async def submit(self, user_id: str, lesson: dict, ordinal: int, token: str, answers: List[Any]) -> dict:
+        """Grade ``answers`` and apply the result; returns the grading and the new counters"""
+        try:
+            started_at = self.verify(token, user_id, lesson)
+            results, score, xp = grade(lesson, answers)
+        except LessonSessionError:
+            self.rejected += 1
+            raise
+        lives_lost = results.count(False)
+        doc = await self._apply(user_id, ordinal, score, xp, lives_lost, started_at)
+        if doc is None:
+            self.rejected += 1
+            raise LessonSessionError(409, "Lesson session already submitted")
+        self.graded += 1
+        return {
+            "results": results,
+            "correct": len(results) - lives_lost,
+            "total": len(results),
+            "score": score,
+            "xp_earned": xp,
+            "total_xp": doc.get("xp", 0),
+            "lives": doc.get("lives", MAX_LIVES),
+        }
+
+    async def _apply(self, user_id: str, ordinal: int, score: int, xp: int,
+                     lives_lost: int, started_at: int) -> Optional[dict]:
+        update = submission_pipeline(ordinal, score, xp, lives_lost, started_at)
+        for _ in range(2):
+            # Migrated users only (see ProgressStore.complete), and only sessions newer than the last graded one
+            doc = await self.users.find_one_and_update(
+                {
+                    "_id": user_query_id(user_id),
+                    "progress": {"$exists": True},
+                    f"lesson_sessions.{ordinal}": {"$not": {"$gte": started_at}},
+                },
+                update,
+                projection={"xp": 1, "lives": 1},
+                return_document=ReturnDocument.AFTER,
+            )
+            if doc is not None:
+                return doc
+            await self.progress.migrate_user(user_id)
+        return None
+
+    def stats(self) -> dict:
+        return {"started": self.started, "graded": self.graded, "rejected": self.rejected}
@@ -0,0 +1,64 @@
+"""Load test: concurrent identical /api/speak and /api/translate misses.
+
+Fires BURST concurrent requests for each of KEYS unique texts (never seen
+before, so nothing is cached) and then asks the Azure stand-in how many
+upstream calls each text caused. With request coalescing every text should
+be fetched exactly once, and every client must still get the full audio.
+
+    python -m uvicorn fake_azure:app --port 9000
+    AZURE_TRANSLATOR_ENDPOINT=http://127.0.0.1:9000 AZURE_TRANSLATOR_KEY=fake \\
+        python -m uvicorn app:app --port 8001
+    python load_singleflight.py
+"""
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:8001/api")
+FAKE_AZURE_URL = os.environ.get("FAKE_AZURE_URL", "http://127.0.0.1:9000")
+KEYS = int(os.environ.get("KEYS", "10"))
+BURST = int(os.environ.get("BURST", "50"))
+
+
+async def speak(client: httpx.AsyncClient, text: str) -> str:
+    response = await client.post(f"{BASE_URL}/speak", json={"text": text})
+    response.raise_for_status()
+    return hashlib.sha256(response.content).hexdigest()
+
+
+async def translate(client: httpx.AsyncClient, text: str) -> str:
+    response = await client.post(f"{BASE_URL}/translate", json={"text": text})
+    response.raise_for_status()
+    return response.json()["text"]
+
+
+async def burst(client: httpx.AsyncClient, kind: str, fn):
+    run_id = uuid.uuid4().hex[:8]
+    texts = [f"frase de prueba {run_id} {i}" for i in range(KEYS)]
+    await client.post(f"{FAKE_AZURE_URL}/calls/reset")
+    started = time.perf_counter()
+    results = await asyncio.gather(*(fn(client, text) for text in texts for _ in range(BURST)))
+    elapsed = time.perf_counter() - started
+
+    calls = (await client.get(f"{FAKE_AZURE_URL}/calls")).json()["by_text"][kind]
+    per_key = Counter(calls.get(text, 0) for text in texts)
+    print(f"{kind}: {KEYS * BURST} requests for {KEYS} keys in {elapsed:.2f}s")
+    print(f"  upstream calls per key: {dict(sorted(per_key.items()))}  (expected {{1: {KEYS}}})")
+    print(f"  distinct responses: {len(set(results))}  (expected {KEYS})")
+
+
+async def main():
+    limits = httpx.Limits(max_connections=KEYS * BURST)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        await burst(client, "speak", speak)
+        await burst(client, "translate", translate)
+        print((await client.get(f"{BASE_URL}/metrics")).json())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+"""Backfill the embedded progress field for every user still on db.progress.
+
+The API migrates users lazily the first time it reads their progress; this
+script does the rest in the background, so ``db.progress`` can eventually be
+dropped. It is safe to run while the API is serving traffic and to re-run:
+users that already have a ``progress`` field are never touched.
+
+    python migrate_progress.py
+    python migrate_progress.py --concurrency 16 --dry-run
+"""
+import argparse
+import asyncio
+import time
+
+
+async def main():
+    from app import db, progress_store
+
+    parser = argparse.ArgumentParser(description="Move lesson progress from db.progress into the user documents")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--dry-run", action="store_true", help="only count the users that need migrating")
+    args = parser.parse_args()
+
+    pending = [str(doc["_id"]) async for doc in db.users.find({"progress": {"$exists": False}}, {"_id": 1})]
+    print(f"{len(pending)} usuarios sin migrar")
+    if args.dry_run:
+        return
+
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def migrate(user_id: str):
+        async with semaphore:
+            await progress_store.migrate_user(user_id)
+
+    await asyncio.gather(*(migrate(user_id) for user_id in pending))
+    print(f"{progress_store.stats()} en {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
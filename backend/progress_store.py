@@ -0,0 +1,141 @@
+"""Per-user lesson progress embedded in the user document.
+
+Replaces one ``db.progress`` document per (user, lesson) with a single
+``progress`` field on the user, keyed by lesson ordinal (see
+``LessonCatalog``)::
+
+    "progress": {
+        "completed": {"0": <bits 0-31>, "1": <bits 32-63>, ...},
+        "scores":    {"<ordinal>": <last score>, ...},
+        "attempts":  {"<ordinal>": <completions>, ...},
+    }
+
+Sub-documents keyed by ordinal (rather than arrays or packed binary) keep
+every change a single atomic operator (``$bit``, ``$set``, ``$inc``) on
+paths that are created on demand.
+
+Users that still have their progress in ``db.progress`` are migrated the
+first time their progress is read; ``migrate_progress.py`` backfills the rest.
+``ordinals`` is a callable so migrations always use the current content pack.
+"""
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+WORD_BITS = 32
+
+
+def popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def decode_progress(progress: Optional[dict]) -> Tuple[int, Dict[int, int], Dict[int, int]]:
+    """(completion bitmask, scores by ordinal, attempts by ordinal)"""
+    progress = progress or {}
+    mask = 0
+    for word, bits in (progress.get("completed") or {}).items():
+        mask |= int(bits) << (int(word) * WORD_BITS)
+    scores = {int(k): int(v) for k, v in (progress.get("scores") or {}).items()}
+    attempts = {int(k): int(v) for k, v in (progress.get("attempts") or {}).items()}
+    return mask, scores, attempts
+
+
+def encode_progress(mask: int, scores: Dict[int, int], attempts: Dict[int, int]) -> dict:
+    completed = {}
+    word = 0
+    while mask >> (word * WORD_BITS):
+        bits = (mask >> (word * WORD_BITS)) & ((1 << WORD_BITS) - 1)
+        if bits:
+            completed[str(word)] = bits
+        word += 1
+    return {
+        "completed": completed,
+        "scores": {str(k): v for k, v in scores.items()},
+        "attempts": {str(k): v for k, v in attempts.items()},
+    }
+
+
+def progress_from_records(records: Iterable[dict], ordinals: Dict[str, int]) -> dict:
+    """Encode legacy ``db.progress`` documents (unknown lessons are dropped)"""
+    mask = 0
+    scores: Dict[int, int] = {}
+    attempts: Dict[int, int] = {}
+    for record in records:
+        ordinal = ordinals.get(record.get("lesson_id"))
+        if ordinal is None:
+            continue
+        if record.get("completed"):
+            mask |= 1 << ordinal
+        scores[ordinal] = int(record.get("score", 0))
+        attempts[ordinal] = int(record.get("attempts", 0))
+    return encode_progress(mask, scores, attempts)
+
+
+def completion_update(ordinal: int, score: int) -> dict:
+    """Mongo update recording one completion of lesson ``ordinal``"""
+    word, bit = divmod(ordinal, WORD_BITS)
+    return {
+        "$bit": {f"progress.completed.{word}": {"or": 1 << bit}},
+        "$set": {f"progress.scores.{ordinal}": score},
+        "$inc": {f"progress.attempts.{ordinal}": 1},
+    }
+
+
+def user_query_id(user_id: str):
+    """Mongo users have ObjectId keys; file DB users have UUID strings"""
+    return ObjectId(user_id) if ObjectId.is_valid(user_id) else user_id
+
+
+class ProgressStore:
+    def __init__(self, users, legacy, ordinals: Callable[[], Dict[str, int]]):
+        self.users = users
+        self.legacy = legacy
+        self.ordinals = ordinals
+        self.migrated = 0
+
+    async def migrate_user(self, user_id: str) -> dict:
+        """Copy ``db.progress`` into the user document unless it is already there"""
+        records = await self.legacy.find({"user_id": user_id}).to_list(None)
+        progress = progress_from_records(records, self.ordinals())
+        # Only if nobody migrated (or wrote progress) in the meantime
+        doc = await self.users.find_one_and_update(
+            {"_id": user_query_id(user_id), "progress": {"$exists": False}},
+            {"$set": {"progress": progress}},
+            projection={"progress": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is not None:
+            self.migrated += 1
+            return doc["progress"]
+        doc = await self.users.find_one({"_id": user_query_id(user_id)}, {"progress": 1})
+        return (doc or {}).get("progress") or progress
+
+    async def load(self, user_id: str, user: Optional[dict] = None) -> dict:
+        """The user's progress, from ``user`` when given, else one projected fetch"""
+        if user is None:
+            user = await self.users.find_one({"_id": user_query_id(user_id)}, {"progress": 1}) or {}
+        if "progress" in user:
+            return user["progress"]
+        return await self.migrate_user(user_id)
+
+    async def complete(self, user_id: str, ordinal: int, score: int, xp: int = 0) -> Optional[dict]:
+        """Record a completion (and award ``xp``) in one update; returns the new progress and xp"""
+        update = completion_update(ordinal, score)
+        if xp:
+            update["$inc"]["xp"] = xp
+        for _ in range(2):
+            # Only on migrated users, or the update would create a progress field that hides db.progress
+            doc = await self.users.find_one_and_update(
+                {"_id": user_query_id(user_id), "progress": {"$exists": True}},
+                update,
+                projection={"progress": 1, "xp": 1},
+                return_document=ReturnDocument.AFTER,
+            )
+            if doc is not None:
+                return doc
+            await self.migrate_user(user_id)
+        return None
+
+    def stats(self) -> dict:
+        return {"migrated_users": self.migrated}
@@ -0,0 +1,73 @@
+"""Refresh tokens stored in Mongo, rotated on every use.
+
+The client only ever sees a random opaque string; the collection stores its
+SHA-256. Each refresh marks the presented token as used and issues a new one
+in the same family. Presenting an already-used token means it leaked (or was
+replayed), so the whole family is revoked and the user has to log in again.
+"""
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+DEFAULT_EXPIRE_DAYS = 30
+
+
+class RefreshTokenError(Exception):
+    """The refresh token is unknown, expired, revoked or was reused."""
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class RefreshTokenStore:
+    def __init__(self, collection, expire_days: float = DEFAULT_EXPIRE_DAYS):
+        self.collection = collection
+        self.expire_days = expire_days
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        await self.collection.create_index("user_id")
+        await self.collection.create_index("family_id")
+
+    async def issue(self, user_id: str, family_id: Optional[str] = None) -> str:
+        token = secrets.token_urlsafe(32)
+        now = datetime.utcnow()
+        await self.collection.insert_one({
+            "_id": hash_refresh_token(token),
+            "user_id": user_id,
+            "family_id": family_id or uuid.uuid4().hex,
+            "created_at": now,
+            "expires_at": now + timedelta(days=self.expire_days),
+            "used_at": None,
+            "revoked": False,
+        })
+        return token
+
+    async def rotate(self, token: str) -> Tuple[str, str]:
+        """Consume ``token`` and return ``(user_id, new_refresh_token)``."""
+        token_hash = hash_refresh_token(token)
+        now = datetime.utcnow()
+        # Atomic: only one concurrent refresh can consume a given token
+        doc = await self.collection.find_one_and_update(
+            {"_id": token_hash, "used_at": None, "revoked": False, "expires_at": {"$gt": now}},
+            {"$set": {"used_at": now}},
+        )
+        if doc is None:
+            stale = await self.collection.find_one({"_id": token_hash})
+            if stale is not None and stale.get("used_at") is not None:
+                await self.revoke_family(stale["family_id"])
+            raise RefreshTokenError("Invalid refresh token")
+        new_token = await self.issue(doc["user_id"], family_id=doc["family_id"])
+        return doc["user_id"], new_token
+
+    async def revoke(self, token: str):
+        await self.collection.update_one({"_id": hash_refresh_token(token)}, {"$set": {"revoked": True}})
+
+    async def revoke_family(self, family_id: str):
+        await self.collection.update_many({"family_id": family_id}, {"$set": {"revoked": True}})
+
+    async def revoke_user(self, user_id: str):
+        await self.collection.update_many({"user_id": user_id, "revoked": False}, {"$set": {"revoked": True}})
@@ -0,0 +1,90 @@
+"""In-flight request coalescing.
+
+When many clients ask for the same thing at the same moment, only the first
+one (the leader) goes upstream; everybody else waits for the leader's result.
+``SingleFlight`` does this for plain awaitables and ``StreamFanout`` lets a
+streamed body (TTS audio) be replayed to every waiter as it arrives.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable]):
+        """Run ``fn()`` once per ``key`` at a time and share its result."""
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # The call runs in its own task (like the /speak pump), so a leader that
+            # is cancelled does not cancel it for everybody waiting on the result
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self.leaders += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Future):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark it retrieved so a flight without waiters does not warn
+            task.exception()
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._calls), "leaders": self.leaders, "coalesced": self.coalesced}
+
+
+class StreamFanout:
+    """Buffers a stream so any number of subscribers can replay it from the start."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._started = asyncio.get_running_loop().create_future()
+        self._changed = asyncio.Event()
+
+    def start(self, error: Optional[BaseException] = None):
+        """Signal that the upstream answered (or failed before sending anything)."""
+        if self._started.done():
+            return
+        if error is None:
+            self._started.set_result(None)
+        else:
+            self._started.set_exception(error)
+            self._started.exception()
+
+    async def wait_started(self):
+        await asyncio.shield(self._started)
+
+    def publish(self, chunk: bytes):
+        self.chunks.append(chunk)
+        self._wake()
+
+    def finish(self, error: Optional[BaseException] = None):
+        self.done = True
+        self.error = error
+        self.start(error)
+        self._wake()
+
+    def _wake(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self):
+        i = 0
+        while True:
+            while i < len(self.chunks):
+                yield self.chunks[i]
+                i += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
@@ -0,0 +1,81 @@
+"""Stress test: concurrent XP and lives updates for a single user.
+
+Signs up a throwaway user and hammers the counter endpoints in parallel.
+Every update is a single atomic MongoDB operation, so no increment may be
+lost and the lives counter must stay within 0..5 whatever the interleaving.
+
+    python -m uvicorn app:app --port 8001
+    python stress_counters.py
+"""
+import asyncio
+import os
+import time
+import uuid
+
+import httpx
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:8001/api")
+BURST = int(os.environ.get("BURST", "50"))
+XP_EARNED = 10
+MAX_LIVES = 5
+
+
+async def signup(client: httpx.AsyncClient) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    response = await client.post(f"{BASE_URL}/auth/signup", json={
+        "email": f"stress-{run_id}@example.com",
+        "password": "stress-test",
+        "username": f"stress_{run_id}",
+    })
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def me(client: httpx.AsyncClient, headers: dict) -> dict:
+    response = await client.get(f"{BASE_URL}/auth/me", headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+async def burst(client: httpx.AsyncClient, method: str, path: str, headers: dict, **kwargs) -> list:
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(
+        client.request(method, f"{BASE_URL}{path}", headers=headers, **kwargs) for _ in range(BURST)
+    ))
+    elapsed = time.perf_counter() - started
+    for response in responses:
+        response.raise_for_status()
+    print(f"{path}: {BURST} concurrent requests in {elapsed:.2f}s")
+    return [response.json() for response in responses]
+
+
+def check(label: str, actual, expected) -> bool:
+    ok = actual == expected
+    print(f"  {label}: {actual}  (expected {expected}) {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+async def main():
+    limits = httpx.Limits(max_connections=BURST)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        headers = await signup(client)
+        ok = True
+
+        # Completing the same lesson again still awards XP, so nothing may be lost
+        await burst(client, "POST", "/lessons/u1l1/complete", headers,
+                    json={"lesson_id": "u1l1", "score": 90, "xp_earned": XP_EARNED})
+        ok &= check("total xp", (await me(client, headers))["xp"], BURST * XP_EARNED)
+
+        results = await burst(client, "POST", "/lessons/lose-life", headers)
+        ok &= check("lowest lives seen", min(r["lives"] for r in results), 0)
+        ok &= check("lives after losing", (await me(client, headers))["lives"], 0)
+
+        results = await burst(client, "POST", "/user/gain-life", headers)
+        ok &= check("hearts gained", sum(1 for r in results if r["success"]), MAX_LIVES)
+        ok &= check("lives after gaining", (await me(client, headers))["lives"], MAX_LIVES)
+
+        print("PASS" if ok else "FAIL")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,163 @@
+"""Offline-first sync of learner events.
+
+While offline the app queues lesson completions, reviews and heart changes
+and later sends them, in order, as one batch. Every event carries an id
+generated on the device. ``EventSync`` claims the (user, event id) pairs with
+one unordered ``insert_many`` into a TTL-indexed collection, so an event that
+was already synced hits the unique ``_id`` and is skipped without touching
+the user. The new events are written in order with ``bulk_write`` on the user
+document, built from the same atomic updates as the one-event endpoints.
+Heart rewards (``gain_life``, ``review``) only apply when lives are below the
+cap (and, for a review, the lesson is completed), so each of them is written
+on its own and reported as ``noop`` when its filter matched nothing.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from lesson_sessions import clamp_result
+from progress_store import ProgressStore, completion_update, user_query_id
+from user_counters import LOSE_LIFE_PIPELINE, gain_life_query
+
+DUPLICATE_KEY = 11000
+
+APPLIED = "applied"
+DUPLICATE = "duplicate"
+REJECTED = "rejected"
+NOOP = "noop"
+
+# Events whose update has a filter that may match nothing
+CONDITIONAL = ("gain_life", "review")
+
+
+def event_update(user_id: str, event: dict, catalog) -> Optional[UpdateOne]:
+    """The user update for one event, or None if it refers to an unknown lesson"""
+    kind = event["type"]
+    if kind == "lose_life":
+        return UpdateOne({"_id": user_query_id(user_id)}, LOSE_LIFE_PIPELINE)
+    if kind == "gain_life":
+        return UpdateOne(gain_life_query(user_id), {"$inc": {"lives": 1}})
+    lesson = catalog.by_id.get(event.get("lesson_id"))
+    if lesson is None:
+        return None
+    ordinal = catalog.ordinals[lesson["id"]]
+    if kind == "review":
+        return UpdateOne(gain_life_query(user_id, ordinal), {"$inc": {"lives": 1}})
+    # complete: offline results cannot be graded, but they can be kept in range
+    score, xp = clamp_result(lesson, event.get("score", 0), event.get("xp_earned", 0))
+    update = completion_update(ordinal, score)
+    update["$inc"]["xp"] = xp
+    return UpdateOne({"_id": user_query_id(user_id)}, update)
+
+
+class EventSync:
+    def __init__(self, users, log, progress: ProgressStore, ttl_seconds: float):
+        self.users = users
+        self.log = log
+        self.progress = progress
+        self.ttl_seconds = ttl_seconds
+        self.batches = 0
+        self.applied = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.noops = 0
+
+    async def ensure_indexes(self):
+        await self.log.create_index("created_at", expireAfterSeconds=int(self.ttl_seconds))
+
+    async def claim(self, user_id: str, event_ids: List[str]) -> Set[str]:
+        """The ids among ``event_ids`` that were never synced before (now marked as synced)"""
+        if not event_ids:
+            return set()
+        now = datetime.utcnow()
+        docs = [{"_id": f"{user_id}:{event_id}", "user_id": user_id, "created_at": now} for event_id in event_ids]
+        try:
+            await self.log.insert_many(docs, ordered=False)
+            return set(event_ids)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            duplicates = {event_ids[error["index"]] for error in errors if error.get("code") == DUPLICATE_KEY}
+            fresh = set(event_ids) - duplicates
+            if len(duplicates) < len(errors):
+                await self.release(user_id, fresh)
+                raise
+            return fresh
+
+    async def release(self, user_id: str, event_ids: Set[str]):
+        """Forget claimed ids whose events could not be applied, so a retry applies them"""
+        if event_ids:
+            await self.log.delete_many({"_id": {"$in": [f"{user_id}:{event_id}" for event_id in event_ids]}})
+
+    async def apply(self, user_id: str, events: List[dict], catalog) -> Tuple[List[dict], Optional[dict]]:
+        """Apply ``events`` in order; returns the status of each event and the resulting user"""
+        self.batches += 1
+        statuses: List[str] = []
+        updates: Dict[int, UpdateOne] = {}
+        seen: Set[str] = set()
+        for i, event in enumerate(events):
+            if event["id"] in seen:
+                statuses.append(DUPLICATE)
+                continue
+            seen.add(event["id"])
+            update = event_update(user_id, event, catalog)
+            if update is None:
+                statuses.append(REJECTED)
+                continue
+            statuses.append(APPLIED)
+            updates[i] = update
+
+        fresh = await self.claim(user_id, [events[i]["id"] for i in updates])
+        for i in list(updates):
+            if events[i]["id"] not in fresh:
+                statuses[i] = DUPLICATE
+                del updates[i]
+
+        order = list(updates)
+        # Position in ``order`` up to which the updates are known to be written
+        written = 0
+        try:
+            if any(events[i]["type"] in ("complete", "review") for i in order):
+                # Progress updates need the user migrated off db.progress first
+                await self.progress.load(user_id)
+            while written < len(order):
+                if events[order[written]]["type"] in CONDITIONAL:
+                    i = order[written]
+                    result = await self.users.bulk_write([updates[i]], ordered=True)
+                    if result.matched_count == 0:
+                        statuses[i] = NOOP
+                    written += 1
+                    continue
+                # Unconditional updates up to the next conditional one go in a single ordered write
+                end = written
+                while end < len(order) and events[order[end]]["type"] not in CONDITIONAL:
+                    end += 1
+                await self.users.bulk_write([updates[i] for i in order[written:end]], ordered=True)
+                written = end
+        except BulkWriteError as e:
+            # An ordered bulk write stops at the first error; everything before it was applied
+            failed = written + e.details["writeErrors"][0]["index"]
+            await self.release(user_id, {events[i]["id"] for i in order[failed:]})
+            raise
+        except Exception:
+            await self.release(user_id, {events[i]["id"] for i in order[written:]})
+            raise
+
+        self.applied += statuses.count(APPLIED)
+        self.duplicates += statuses.count(DUPLICATE)
+        self.rejected += statuses.count(REJECTED)
+        self.noops += statuses.count(NOOP)
+        user = await self.users.find_one({"_id": user_query_id(user_id)}, {"xp": 1, "lives": 1, "streak": 1, "progress": 1})
+        results = [{"id": event["id"], "status": status} for event, status in zip(events, statuses)]
+        return results, user
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "applied": self.applied,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "noops": self.noops,
+            "ttl_seconds": self.ttl_seconds,
+        }
@@ -0,0 +1,22 @@
+"""Text normalization shared by the caches and dictionary lookups."""
+import unicodedata
+
+
+def normalize_text(text: str) -> str:
+    """Case, Unicode form and whitespace differences are not meaningful for lookups."""
+    return " ".join(unicodedata.normalize("NFC", text).casefold().split())
+
+
+# Apostrophe look-alikes used for the glottal stop
+_APOSTROPHES = str.maketrans({"’": "'", "‘": "'", "`": "'", "´": "'", "ʼ": "'"})
+_PUNCTUATION = str.maketrans("", "", "¿?¡!.,;:\"")
+
+
+def fold_text(text: str) -> str:
+    """Aggressive folding for dictionary matching: also drops accents and punctuation.
+
+    "¿Cómo estás?" -> "como estas", "K’iin" -> "k'iin".
+    """
+    decomposed = unicodedata.normalize("NFKD", text.translate(_APOSTROPHES))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.translate(_PUNCTUATION).casefold().split())
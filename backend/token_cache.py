@@ -0,0 +1,67 @@
+"""Bounded cache of verified JWT claims.
+
+Verifying a token (signature + claims) costs far more than a dict lookup and
+the same token is presented on every request of a session. Entries are keyed
+by a SHA-256 of the token, so raw tokens are never kept in memory, and they
+are only valid until the token's own ``exp``.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        key = token_digest(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            claims, expires_at = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return claims
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, token: str, claims: dict):
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        key = token_digest(token)
+        self._entries[key] = (claims, float(expires_at))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, token: str):
+        self._entries.pop(token_digest(token), None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,119 @@
+"""Revoked access tokens, stored in Mongo and mirrored into a Bloom filter.
+
+Two kinds of entries are kept:
+
+* ``jti:<id>``: a single access token (logout on this device).
+* ``user:<id>``: every token of a user issued before ``not_before``
+  (log out on all devices).
+
+The hot path only consults the in-memory filter; the collection is read when
+the filter says "maybe", which for non-revoked tokens happens at about the
+filter's false-positive rate. Other processes pick up new revocations with
+``sync()``, which only reads entries created since the last sync. That window
+starts ``sync_overlap_seconds`` early, since ``created_at`` is set by the
+writer before its write lands (and by its own clock); re-adding an entry is
+harmless.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from bloom_filter import BloomFilter
+
+DEFAULT_CAPACITY = 100_000
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_SYNC_OVERLAP_SECONDS = 30.0
+
+
+class TokenRevocationList:
+    def __init__(self, collection, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE,
+                 sync_overlap_seconds: float = DEFAULT_SYNC_OVERLAP_SECONDS):
+        self.collection = collection
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_overlap_seconds = sync_overlap_seconds
+        self.bloom = BloomFilter(capacity, error_rate)
+        self._synced_until: Optional[datetime] = None
+        # Confirmed user-wide revocations, so their tokens never hit the DB twice
+        self._not_before: Dict[str, float] = {}
+        self.filter_hits = 0
+        self.false_positives = 0
+        self.rejected = 0
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        await self.collection.create_index("created_at")
+
+    def _add(self, doc: dict):
+        self.bloom.add(doc["_id"])
+        if doc["_id"].startswith("user:") and doc.get("not_before") is not None:
+            user_id = doc["_id"][len("user:"):]
+            self._not_before[user_id] = max(self._not_before.get(user_id, 0), doc["not_before"])
+
+    async def load(self):
+        """Rebuild the filter from the collection."""
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        not_before: Dict[str, float] = {}
+        synced_until = datetime.utcnow()
+        async for doc in self.collection.find({}, {"_id": 1, "not_before": 1}):
+            bloom.add(doc["_id"])
+            if doc["_id"].startswith("user:") and doc.get("not_before") is not None:
+                not_before[doc["_id"][len("user:"):]] = doc["not_before"]
+        self.bloom = bloom
+        self._not_before = not_before
+        self._synced_until = synced_until
+
+    async def sync(self):
+        """Mirror revocations written by other processes since the last sync."""
+        if self._synced_until is None:
+            await self.load()
+            return
+        synced_until = datetime.utcnow()
+        since = self._synced_until - timedelta(seconds=self.sync_overlap_seconds)
+        async for doc in self.collection.find({"created_at": {"$gte": since}}, {"_id": 1, "not_before": 1}):
+            self._add(doc)
+        self._synced_until = synced_until
+
+    async def revoke_token(self, jti: str, expires_at: datetime):
+        doc = {"_id": f"jti:{jti}", "created_at": datetime.utcnow(), "expires_at": expires_at}
+        await self.collection.update_one({"_id": doc["_id"]}, {"$set": doc}, upsert=True)
+        self._add(doc)
+
+    async def revoke_user(self, user_id: str, not_before: float, expires_at: datetime):
+        """Revoke every token of ``user_id`` issued before ``not_before`` (a Unix timestamp)."""
+        doc = {"_id": f"user:{user_id}", "not_before": not_before,
+               "created_at": datetime.utcnow(), "expires_at": expires_at}
+        await self.collection.update_one({"_id": doc["_id"]}, {"$set": doc}, upsert=True)
+        self._add(doc)
+
+    async def is_revoked(self, user_id: str, jti: Optional[str], issued_at: float) -> bool:
+        user_key = f"user:{user_id}"
+        if user_key in self.bloom:
+            self.filter_hits += 1
+            not_before = self._not_before.get(user_id)
+            if not_before is None:
+                doc = await self.collection.find_one({"_id": user_key})
+                if doc is None:
+                    self.false_positives += 1
+                else:
+                    not_before = doc["not_before"]
+                    self._not_before[user_id] = not_before
+            if not_before is not None and issued_at < not_before:
+                self.rejected += 1
+                return True
+        if jti is not None:
+            jti_key = f"jti:{jti}"
+            if jti_key in self.bloom:
+                self.filter_hits += 1
+                if await self.collection.find_one({"_id": jti_key}, {"_id": 1}) is not None:
+                    self.rejected += 1
+                    return True
+                self.false_positives += 1
+        return False
+
+    def stats(self) -> dict:
+        return {
+            **self.bloom.stats(),
+            "filter_hits": self.filter_hits,
+            "false_positives": self.false_positives,
+            "rejected": self.rejected,
+        }
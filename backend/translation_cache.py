@@ -0,0 +1,136 @@
+"""Two-level cache for Azure translations.
+
+L1 is an in-process LRU dict; L2 is a Mongo collection with a TTL index so
+translations survive restarts and are shared between workers. Azure failures
+are cached in L1 only, for a short window, so an outage does not turn every
+request into another slow upstream call.
+"""
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from text_normalize import normalize_text
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_NEGATIVE_TTL_SECONDS = 30
+# After a Mongo error, skip L2 for a while instead of waiting on it every request
+L2_RETRY_AFTER_SECONDS = 30
+
+
+def translation_key(from_lang: str, to_lang: str, text: str) -> str:
+    return f"{from_lang}:{to_lang}:{normalize_text(text)}"
+
+
+class TranslationCache:
+    def __init__(self, collection=None, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 negative_ttl_seconds: float = DEFAULT_NEGATIVE_TTL_SECONDS):
+        self.collection = collection
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        # key -> (translation or None for a cached failure, monotonic expiry)
+        self._l1: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        self._l2_disabled_until = 0.0
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.l2_errors = 0
+
+    async def ensure_indexes(self):
+        if self.collection is None:
+            return
+        try:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        except Exception as e:
+            self._l2_failed()
+            print(f"Translation cache: could not create TTL index: {e}")
+
+    def _l2_available(self) -> bool:
+        return self.collection is not None and time.monotonic() >= self._l2_disabled_until
+
+    def _l2_failed(self):
+        self.l2_errors += 1
+        self._l2_disabled_until = time.monotonic() + L2_RETRY_AFTER_SECONDS
+
+    def _l1_set(self, key: str, value: Optional[str], ttl: float):
+        self._l1[key] = (value, time.monotonic() + ttl)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.max_entries:
+            self._l1.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, from_lang: str, to_lang: str, text: str) -> Tuple[bool, Optional[str]]:
+        """Return ``(hit, translation)``; a hit with ``None`` is a cached Azure failure."""
+        key = translation_key(from_lang, to_lang, text)
+        entry = self._l1.get(key)
+        if entry is not None:
+            value, expires = entry
+            if expires > time.monotonic():
+                self._l1.move_to_end(key)
+                if value is None:
+                    self.negative_hits += 1
+                else:
+                    self.l1_hits += 1
+                return True, value
+            del self._l1[key]
+
+        if self._l2_available():
+            try:
+                doc = await self.collection.find_one({"_id": key})
+            except Exception:
+                self._l2_failed()
+                doc = None
+            if doc is not None and doc["expires_at"] > datetime.utcnow():
+                remaining = (doc["expires_at"] - datetime.utcnow()).total_seconds()
+                self._l1_set(key, doc["translation"], remaining)
+                self.l2_hits += 1
+                return True, doc["translation"]
+
+        self.misses += 1
+        return False, None
+
+    async def put(self, from_lang: str, to_lang: str, text: str, translation: str):
+        key = translation_key(from_lang, to_lang, text)
+        self._l1_set(key, translation, self.ttl_seconds)
+        if not self._l2_available():
+            return
+        now = datetime.utcnow()
+        try:
+            await self.collection.update_one(
+                {"_id": key},
+                {"$set": {
+                    "from_lang": from_lang,
+                    "to_lang": to_lang,
+                    "text": normalize_text(text),
+                    "translation": translation,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl_seconds),
+                }},
+                upsert=True,
+            )
+        except Exception:
+            self._l2_failed()
+
+    def put_failure(self, from_lang: str, to_lang: str, text: str):
+        """Remember an Azure failure for ``negative_ttl_seconds`` (L1 only)."""
+        self._l1_set(translation_key(from_lang, to_lang, text), None, self.negative_ttl_seconds)
+
+    def stats(self) -> dict:
+        lookups = self.l1_hits + self.l2_hits + self.negative_hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round((lookups - self.misses) / lookups, 4) if lookups else 0.0,
+            "l1_entries": len(self._l1),
+            "l1_max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "l2_errors": self.l2_errors,
+            "l2_available": self._l2_available(),
+        }
@@ -0,0 +1,63 @@
+"""Short-lived in-process cache of user documents.
+
+get_current_user reads through it, and every endpoint that changes a user
+writes the new field values through it (or invalidates the entry), so a
+worker never serves its own stale data. The TTL bounds how long a change
+made by another worker can go unseen.
+"""
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+DEFAULT_TTL_SECONDS = 30.0
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class UserCache:
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Optional[dict]:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            user, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return user
+            del self._entries[user_id]
+        self.misses += 1
+        return None
+
+    def put(self, user_id: str, user: dict):
+        self._entries[user_id] = (user, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def update(self, user_id: str, fields: dict):
+        """Write-through of a ``$set``: cached copies are replaced, never mutated in place."""
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            user, expires_at = entry
+            self._entries[user_id] = ({**user, **fields}, expires_at)
+
+    def invalidate(self, user_id: str):
+        if self._entries.pop(user_id, None) is not None:
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl_seconds,
+        }
@@ -0,0 +1,58 @@
+"""Atomic XP and lives updates on the user document.
+
+Each mutation is a single ``find_one_and_update`` that computes the new
+value on the server and returns it, so concurrent requests from the same
+learner can neither lose an update nor push lives outside 0..MAX_LIVES,
+and no prior read of the user is needed. A missing ``lives`` field means
+full lives, as everywhere else in the app.
+"""
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+from progress_store import WORD_BITS, user_query_id
+
+MAX_LIVES = 5
+
+# lives = max((lives ?? MAX_LIVES) - 1, 0), evaluated by the server
+LOSE_LIFE_PIPELINE = [
+    {"$set": {"lives": {"$max": [{"$subtract": [{"$ifNull": ["$lives", MAX_LIVES]}, 1]}, 0]}}},
+]
+
+
+def gain_life_query(user_id: str, completed_ordinal: Optional[int] = None) -> dict:
+    """Matches the user only if a life can be added (see ``UserCounters.gain_life``)"""
+    query = {"_id": user_query_id(user_id), "lives": {"$lt": MAX_LIVES}}
+    if completed_ordinal is not None:
+        word, bit = divmod(completed_ordinal, WORD_BITS)
+        query[f"progress.completed.{word}"] = {"$bitsAllSet": 1 << bit}
+    return query
+
+
+class UserCounters:
+    def __init__(self, users):
+        self.users = users
+
+    async def lose_life(self, user_id: str) -> Optional[int]:
+        """New number of lives (never below 0), or None if the user does not exist"""
+        doc = await self.users.find_one_and_update(
+            {"_id": user_query_id(user_id)},
+            LOSE_LIFE_PIPELINE,
+            projection={"lives": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        return None if doc is None else doc["lives"]
+
+    async def gain_life(self, user_id: str, completed_ordinal: Optional[int] = None) -> Optional[int]:
+        """Add a life unless lives are full; returns the new count or None if nothing changed.
+
+        With ``completed_ordinal`` the life is only granted if that lesson is
+        marked complete in the user's progress (reviews).
+        """
+        doc = await self.users.find_one_and_update(
+            gain_life_query(user_id, completed_ordinal),
+            {"$inc": {"lives": 1}},
+            projection={"lives": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        return None if doc is None else doc["lives"]
@@ -160,6 +160,31 @@ export default function ProfileScreen() {
     }
   };
 
+  const handleLogoutAll = async () => {
+    if (Platform.OS === 'web') {
+      if (window.confirm('¿Cerrar sesión en todos tus dispositivos?')) {
+        await logout(true);
+        window.location.href = '/';
+      }
+    } else {
+      Alert.alert(
+        'Cerrar Sesión',
+        '¿Cerrar sesión en todos tus dispositivos?',
+        [
+          { text: 'Cancelar', style: 'cancel' },
+          {
+            text: 'Salir',
+            style: 'destructive',
+            onPress: async () => {
+              await logout(true);
+              router.replace('/');
+            },
+          },
+        ]
+      );
+    }
+  };
+
   return (
     <SafeAreaView style={styles.container} edges={['top']}>
       <View style={styles.header}>
@@ -267,6 +292,10 @@ export default function ProfileScreen() {
           <Text style={styles.logoutText}>Cerrar Sesión</Text>
         </Pressable>
 
+        <Pressable style={styles.logoutAllButton} onPress={handleLogoutAll}>
+          <Text style={styles.logoutAllText}>Cerrar sesión en todos los dispositivos</Text>
+        </Pressable>
+
         <View style={styles.footer}>
           <Text style={styles.footerText}>MayaApp v1.0</Text>
         </View>
@@ -490,6 +519,15 @@ const styles = StyleSheet.create({
     fontWeight: '600',
     color: '#FF4B4B',
   },
+  logoutAllButton: {
+    alignItems: 'center',
+    marginTop: -12,
+    marginBottom: 24,
+  },
+  logoutAllText: {
+    fontSize: 14,
+    color: '#FF4B4B',
+  },
   footer: {
     alignItems: 'center',
     marginBottom: 32,
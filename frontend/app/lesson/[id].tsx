@@ -32,11 +32,13 @@ export default function LessonScreen() {
   const [matchedPairs, setMatchedPairs] = useState<{ [key: string]: string }>({});
   const [showFeedback, setShowFeedback] = useState(false);
   const [isCorrect, setIsCorrect] = useState(false);
-  const [score, setScore] = useState(0);
   const [wrongAnswers, setWrongAnswers] = useState(0);
   const [loading, setLoading] = useState(true);
   const [fadeAnim] = useState(new Animated.Value(1));
   const [selectedSelection, setSelectedSelection] = useState<{ type: 'maya' | 'spanish', value: string } | null>(null);
+  // The server grades the whole session at the end; answers are kept until then
+  const sessionTokenRef = useRef<string | null>(null);
+  const answersRef = useRef<(string | { [key: string]: string })[]>([]);
 
   const PALETTE = ['#1CB0F6', '#FF4B4B', '#FFC800', '#58CC02', '#A970FF', '#FF7F50'];
   const getColorByMaya = (maya: string, pairs: { maya: string; spanish: string }[]) => {
@@ -82,8 +84,10 @@ export default function LessonScreen() {
 
   const loadLesson = useCallback(async () => {
     try {
-      const response = await api.get(`/api/lessons/${lessonId}`);
-      setLesson(response.data);
+      const response = await api.post(`/api/lessons/${lessonId}/start`);
+      sessionTokenRef.current = response.data.session_token;
+      answersRef.current = [];
+      setLesson(response.data.lesson);
     } catch (error) {
       console.error('Error loading lesson:', error);
       Alert.alert('Error', 'No se pudo cargar la lección');
@@ -346,33 +350,25 @@ export default function LessonScreen() {
 
     let correct = false;
 
+    // Immediate feedback only; the server grades the same answers on submit
     if (currentExercise.type === 'translate' || currentExercise.type === 'multiple_choice') {
       correct = selectedAnswer === currentExercise.correct_answer;
+      answersRef.current[currentExerciseIndex] = selectedAnswer;
     } else if (currentExercise.type === 'matching') {
       const expectedPairs = currentExercise.pairs || [];
       correct = expectedPairs.every(pair =>
         matchedPairs[pair.maya] === pair.spanish
       );
+      answersRef.current[currentExerciseIndex] = { ...matchedPairs };
     }
 
     setIsCorrect(correct);
     setShowFeedback(true);
     playFeedback(correct);
 
-    if (correct) {
-      setScore(score + 1);
-    } else {
+    if (!correct) {
+      // Los corazones se descuentan en el servidor al enviar la lección
       setWrongAnswers(wrongAnswers + 1);
-      try {
-        await api.post('/api/lessons/lose-life');
-      } catch (error: any) {
-        console.log('Life lost:', error?.response?.data || error?.message);
-      }
-      try {
-        await refreshUser();
-      } catch {
-        console.log('Refresh user failed after lose-life');
-      }
       // Esperar a que el usuario presione "Continuar" (sin auto-avance)
     }
 
@@ -409,14 +405,11 @@ export default function LessonScreen() {
   const completeLesson = async () => {
     if (!lesson) return;
 
-    const scorePercent = (score / lesson.exercises.length) * 100;
-    const xpEarned = Math.round((scorePercent / 100) * lesson.xp_reward);
-
     try {
-      await api.post(`/api/lessons/${lesson.id}/complete`, {
-        lesson_id: lesson.id,
-        score: scorePercent,
-        xp_earned: xpEarned,
+      // Hearts, XP and progress are computed by the server from the answers
+      await api.post(`/api/lessons/${lesson.id}/submit`, {
+        session_token: sessionTokenRef.current,
+        answers: lesson.exercises.map((_, i) => answersRef.current[i] ?? ''),
       });
 
       await refreshUser();
@@ -577,7 +570,7 @@ export default function LessonScreen() {
 
         <View style={styles.heartsContainer}>
           <Ionicons name="heart" size={24} color="#FF4B4B" />
-          <Text style={styles.heartsText}>{user?.lives || 0}</Text>
+          <Text style={styles.heartsText}>{Math.max((user?.lives || 0) - wrongAnswers, 0)}</Text>
         </View>
 
       </View>
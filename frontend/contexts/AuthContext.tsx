@@ -1,6 +1,6 @@
 import React, { createContext, useState, useContext, useEffect, ReactNode } from 'react';
 import AsyncStorage from '@react-native-async-storage/async-storage';
-import api from '../utils/api';
+import api, { storeTokens, clearTokens } from '../utils/api';
 import { User } from '../types';
 
 interface AuthContextType {
@@ -8,7 +8,7 @@ interface AuthContextType {
   loading: boolean;
   login: (email: string, password: string) => Promise<void>;
   signup: (email: string, password: string, username: string) => Promise<void>;
-  logout: () => Promise<void>;
+  logout: (allDevices?: boolean) => Promise<void>;
   refreshUser: () => Promise<void>;
 }
 
@@ -31,7 +31,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
       }
     } catch (error) {
       console.error('Auth check failed:', error);
-      await AsyncStorage.removeItem('auth_token');
+      await clearTokens();
     } finally {
       setLoading(false);
     }
@@ -39,20 +39,27 @@ export function AuthProvider({ children }: { children: ReactNode }) {
 
   const login = async (email: string, password: string) => {
     const response = await api.post('/api/auth/login', { email, password });
-    await AsyncStorage.setItem('auth_token', response.data.access_token);
+    await storeTokens(response.data);
     const userResponse = await api.get('/api/auth/me');
     setUser(userResponse.data);
   };
 
   const signup = async (email: string, password: string, username: string) => {
     const response = await api.post('/api/auth/signup', { email, password, username });
-    await AsyncStorage.setItem('auth_token', response.data.access_token);
+    await storeTokens(response.data);
     const userResponse = await api.get('/api/auth/me');
     setUser(userResponse.data);
   };
 
-  const logout = async () => {
-    await AsyncStorage.removeItem('auth_token');
+  const logout = async (allDevices = false) => {
+    try {
+      const refreshToken = await AsyncStorage.getItem('refresh_token');
+      await api.post(allDevices ? '/api/auth/logout-all' : '/api/auth/logout', { refresh_token: refreshToken });
+    } catch (error) {
+      // El token se borra localmente de todos modos
+      console.error('Logout request failed:', error);
+    }
+    await clearTokens();
     setUser(null);
   };
 
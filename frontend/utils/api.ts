@@ -10,6 +10,38 @@ const api = axios.create({
   },
 });
 
+// Lessons, tips and the dictionary only change on deploy: keep the last body per URL
+// with its ETag and revalidate with If-None-Match, so repeat visits cost a 304.
+type CachedBody = { etag: string; data: any; headers: Record<string, string> };
+const etagCache = new Map<string, CachedBody>();
+const ETAG_PREFIX = 'etag:';
+
+const getCachedBody = async (key: string): Promise<CachedBody | null> => {
+  const cached = etagCache.get(key);
+  if (cached) {
+    return cached;
+  }
+  try {
+    const stored = await AsyncStorage.getItem(ETAG_PREFIX + key);
+    if (stored) {
+      const parsed = JSON.parse(stored) as CachedBody;
+      etagCache.set(key, parsed);
+      return parsed;
+    }
+  } catch {
+    // Cache corrupto: se vuelve a descargar
+  }
+  return null;
+};
+
+// Mutating requests carry an Idempotency-Key that is kept across retries, so the
+// server answers a retry with the stored response instead of applying it twice.
+const MUTATING_METHODS = ['post', 'put', 'patch', 'delete'];
+const MAX_NETWORK_RETRIES = 2;
+
+const newIdempotencyKey = () =>
+  `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random().toString(36).slice(2)}`;
+
 api.interceptors.request.use(async (config) => {
   const token = await AsyncStorage.getItem('auth_token');
   if (token) {
@@ -18,8 +50,104 @@ api.interceptors.request.use(async (config) => {
     }
     (config.headers as any).Authorization = `Bearer ${token}`;
   }
+  if (MUTATING_METHODS.includes((config.method ?? 'get').toLowerCase())) {
+    config.headers = config.headers ?? ({} as any);
+    if (!(config.headers as any)['Idempotency-Key']) {
+      (config.headers as any)['Idempotency-Key'] = newIdempotencyKey();
+    }
+  }
+  if ((config.method ?? 'get').toLowerCase() === 'get') {
+    const cached = await getCachedBody(api.getUri(config));
+    if (cached) {
+      (config.headers as any)['If-None-Match'] = cached.etag;
+      config.validateStatus = (status) => (status >= 200 && status < 300) || status === 304;
+    }
+  }
   return config;
 });
 
+export const storeTokens = async (data: { access_token: string; refresh_token?: string | null }) => {
+  await AsyncStorage.setItem('auth_token', data.access_token);
+  if (data.refresh_token) {
+    await AsyncStorage.setItem('refresh_token', data.refresh_token);
+  } else {
+    await AsyncStorage.removeItem('refresh_token');
+  }
+};
+
+export const clearTokens = async () => {
+  await AsyncStorage.multiRemove(['auth_token', 'refresh_token']);
+};
+
+// Access tokens are short-lived: on a 401, rotate the refresh token once and retry.
+// Concurrent 401s share the same refresh request (a refresh token can only be used once).
+let refreshing: Promise<string | null> | null = null;
+
+const refreshAccessToken = async (): Promise<string | null> => {
+  const refreshToken = await AsyncStorage.getItem('refresh_token');
+  if (!refreshToken) {
+    return null;
+  }
+  try {
+    const response = await axios.post(`${API_URL}/api/auth/refresh`, { refresh_token: refreshToken });
+    await storeTokens(response.data);
+    return response.data.access_token;
+  } catch (error) {
+    await clearTokens();
+    return null;
+  }
+};
+
+api.interceptors.response.use(
+  async (response) => {
+    if ((response.config.method ?? 'get').toLowerCase() !== 'get') {
+      return response;
+    }
+    const key = api.getUri(response.config);
+    if (response.status === 304) {
+      const cached = await getCachedBody(key);
+      if (cached) {
+        return { ...response, status: 200, data: cached.data, headers: { ...cached.headers, ...response.headers } };
+      }
+      return response;
+    }
+    const etag = response.headers?.etag;
+    if (etag) {
+      const entry: CachedBody = { etag, data: response.data, headers: { ...response.headers } as Record<string, string> };
+      etagCache.set(key, entry);
+      AsyncStorage.setItem(ETAG_PREFIX + key, JSON.stringify(entry)).catch(() => {});
+    }
+    return response;
+  },
+  async (error) => {
+    const config = error.config;
+    // Sin respuesta (red inestable): reintentar con la misma Idempotency-Key
+    if (!error.response && config?.headers?.['Idempotency-Key']) {
+      const attempt = (config._networkRetries ?? 0) + 1;
+      if (attempt <= MAX_NETWORK_RETRIES) {
+        config._networkRetries = attempt;
+        await new Promise((resolve) => setTimeout(resolve, 500 * 2 ** (attempt - 1)));
+        return api(config);
+      }
+    }
+    if (error.response?.status !== 401 || !config || config._retried) {
+      throw error;
+    }
+    if (!refreshing) {
+      refreshing = refreshAccessToken().finally(() => {
+        refreshing = null;
+      });
+    }
+    const token = await refreshing;
+    if (!token) {
+      throw error;
+    }
+    config._retried = true;
+    config.headers = config.headers ?? {};
+    config.headers.Authorization = `Bearer ${token}`;
+    return api(config);
+  }
+);
+
 export default api;
 export const absoluteUrl = (path: string) => (path.startsWith('http') ? path : `${API_URL}${path}`);
@@ -0,0 +1,19 @@
+"""Shared setup: the backend modules are imported flat, as the app does."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+
+@pytest.fixture
+def apply_pipeline():
+    """Evaluate an update pipeline on ``doc`` with mongomock's aggregation engine."""
+    mongomock = pytest.importorskip("mongomock")
+
+    def apply(doc, pipeline):
+        users = mongomock.MongoClient().db.users
+        users.insert_one(doc)
+        return next(users.aggregate([{"$match": {"_id": doc["_id"]}}] + pipeline))
+    return apply
@@ -0,0 +1,34 @@
+"""Azure Translator responses that cannot be used become AzureTranslatorError."""
+import asyncio
+
+import httpx
+import pytest
+
+from azure_client import AzureTranslatorClient, AzureTranslatorError
+from circuit_breaker import OPEN, CircuitBreaker
+
+
+def translate_with_body(breaker: CircuitBreaker, content: bytes):
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=content))
+    client = AzureTranslatorClient(key="key", transport=transport, breaker=breaker)
+
+    async def call():
+        try:
+            return await client.translate_many(["hola", "adiós"], "es", "yua")
+        finally:
+            await client.close()
+    return asyncio.run(call())
+
+
+def test_translations_are_read_in_order_and_missing_ones_keep_the_text():
+    results = translate_with_body(CircuitBreaker("test"), b'[{"translations": [{"text": "Ba\'ax ka wa\'alik"}]}]')
+    assert results == ["Ba'ax ka wa'alik", "adiós"]
+
+
+@pytest.mark.parametrize("content", [b"not json", b'{"error": 1}', b'[{"translations": [{}]}]', b'["x"]'])
+def test_unreadable_body_is_an_azure_error_and_a_breaker_failure(content):
+    breaker = CircuitBreaker("test", min_calls=1)
+    with pytest.raises(AzureTranslatorError) as error:
+        translate_with_body(breaker, content)
+    assert error.value.status_code == 502
+    assert breaker.state == OPEN
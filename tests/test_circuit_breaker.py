@@ -0,0 +1,108 @@
+"""Circuit breaker state machine, driven by an injected clock."""
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock):
+    return CircuitBreaker("test", window_seconds=30, min_calls=4, error_rate_threshold=0.5,
+                          slow_call_seconds=2.0, slow_rate_threshold=0.5, open_seconds=15,
+                          half_open_max_calls=1, clock=clock)
+
+
+def call(breaker, duration=0.1, failed=False):
+    breaker.before_call()
+    breaker.record(duration, failed)
+
+
+def trip(breaker):
+    for failed in (False, False, True, True):
+        call(breaker, failed=failed)
+
+
+def test_opens_on_error_rate():
+    breaker = make_breaker(Clock())
+    for failed in (False, False, True):
+        call(breaker, failed=failed)
+    assert breaker.state == CLOSED  # below min_calls
+    call(breaker, failed=True)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.rejected == 1
+
+
+def test_opens_on_slow_rate():
+    breaker = make_breaker(Clock())
+    for duration in (0.1, 0.1, 2.5, 3.0):
+        call(breaker, duration=duration)
+    assert breaker.state == OPEN
+
+
+def test_old_calls_leave_the_window():
+    clock = Clock()
+    breaker = make_breaker(clock)
+    call(breaker, failed=True)
+    call(breaker, failed=True)
+    clock.now += 31
+    for _ in range(3):
+        call(breaker)
+    call(breaker, failed=True)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_success_closes():
+    clock = Clock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 15
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record(0.1, False)
+    assert breaker.state == CLOSED
+    call(breaker)
+
+
+@pytest.mark.parametrize("duration, failed", [(0.1, True), (2.5, False)])
+def test_half_open_probe_failure_reopens(duration, failed):
+    clock = Clock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 15
+    breaker.before_call()
+    breaker.record(duration, failed)
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_cancelled_probe_frees_its_slot():
+    clock = Clock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 15
+    breaker.before_call()
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()  # the next probe gets through
+    breaker.record(0.1, False)
+    assert breaker.state == CLOSED
+
+
+def test_release_while_closed_changes_nothing():
+    breaker = make_breaker(Clock())
+    breaker.before_call()
+    breaker.release()
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 0
@@ -0,0 +1,27 @@
+"""Typo-tolerant lookups behind the dictionary's did-you-mean suggestions."""
+import time
+
+from dictionary_index import DictionaryIndex
+from fuzzy_index import SymmetricDeleteIndex
+
+
+def test_lookup_finds_terms_within_the_budget():
+    index = SymmetricDeleteIndex(["hola", "gracias"])
+    assert index.lookup("gracais") == [("gracias", 1)]
+    assert index.lookup("graciasxx", 2) == [("gracias", 2)]
+    assert index.lookup("graciasxxx", 2) == []
+
+
+def test_lookup_skips_queries_longer_than_any_term_can_reach():
+    index = SymmetricDeleteIndex(["hola", "gracias"])
+    assert index.max_length == 7
+    started = time.perf_counter()
+    assert index.lookup("a" * 1100, 2) == []
+    assert time.perf_counter() - started < 0.05
+
+
+def test_long_text_gets_no_suggestion():
+    index = DictionaryIndex([{"maya": "Nib óolal", "spanish": "Gracias"}])
+    assert index.translate_fuzzy("gracais", "es", "yua") == ("Nib óolal", "Gracias")
+    assert index.translate_fuzzy("gracias " * 150, "es", "yua") is None
+    assert index.suggest("x" * 1100, "yua") == []
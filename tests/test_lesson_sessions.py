@@ -0,0 +1,61 @@
+"""Server-side grading and the single update applied by a lesson submission."""
+import pytest
+
+from lesson_sessions import LessonSessionError, clamp_result, grade, submission_pipeline
+from progress_store import decode_progress
+
+LESSON = {
+    "id": "u1l1",
+    "xp_reward": 10,
+    "exercises": [
+        {"type": "multiple_choice", "correct_answer": "Hola"},
+        {"type": "translate", "correct_answer": "Nib óolal"},
+        {"type": "matching", "pairs": [{"maya": "a", "spanish": "x"}, {"maya": "b", "spanish": "y"}]},
+    ],
+}
+
+
+def test_grade_counts_correct_answers_and_rounds_half_up():
+    results, score, xp = grade(LESSON, ["Hola", "mal", {"a": "x", "b": "y"}])
+    assert results == [True, False, True]
+    assert (score, xp) == (67, 7)
+
+
+def test_grade_rejects_a_partial_answer_set():
+    with pytest.raises(LessonSessionError):
+        grade(LESSON, ["Hola"])
+
+
+@pytest.mark.parametrize("score, xp, expected", [(150, 999, (100, 10)), (-5, -20, (0, 0)), (80, 8, (80, 8))])
+def test_clamp_result(score, xp, expected):
+    assert clamp_result(LESSON, score, xp) == expected
+
+
+@pytest.mark.parametrize("ordinal, before, after", [
+    (1, {"0": 5}, {"0": 7}),          # bit not set yet: added
+    (2, {"0": 5}, {"0": 5}),          # already set: unchanged
+    (0, {}, {"0": 1}),                # word created on demand
+    (33, {"0": 5}, {"0": 5, "1": 2}),  # second word
+    (31, {"0": 1}, {"0": 1 + (1 << 31)}),
+])
+def test_submission_sets_the_completion_bit(ordinal, before, after, apply_pipeline):
+    doc = {"_id": 1, "progress": {"completed": before, "scores": {}, "attempts": {}}}
+    result = apply_pipeline(doc, submission_pipeline(ordinal, 80, 5, 0, 123))
+    assert result["progress"]["completed"] == after
+    mask, _, _ = decode_progress(result["progress"])
+    assert mask >> ordinal & 1
+
+
+def test_submission_applies_score_attempts_xp_hearts_and_session(apply_pipeline):
+    doc = {"_id": 1, "xp": 40, "lives": 2, "progress": {"completed": {}, "scores": {"3": 10}, "attempts": {"3": 1}}}
+    result = apply_pipeline(doc, submission_pipeline(3, 90, 7, 3, 1234))
+    assert result["progress"]["scores"]["3"] == 90
+    assert result["progress"]["attempts"]["3"] == 2
+    assert result["xp"] == 47
+    assert result["lives"] == 0
+    assert result["lesson_sessions"] == {"3": 1234}
+
+
+def test_submission_defaults_missing_counters(apply_pipeline):
+    result = apply_pipeline({"_id": 1, "progress": {}}, submission_pipeline(0, 100, 10, 1, 1))
+    assert (result["xp"], result["lives"]) == (10, 4)
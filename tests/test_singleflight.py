@@ -0,0 +1,52 @@
+"""Coalescing of identical in-flight calls."""
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_cancelled_leader_does_not_cancel_the_waiters():
+    async def scenario():
+        flights = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "ok"
+
+        leader = asyncio.create_task(flights.do("k", fn))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(flights.do("k", fn)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return results, calls, flights.stats()
+
+    results, calls, stats = asyncio.run(scenario())
+    assert results == ["ok"] * 3
+    assert calls == 1
+    assert stats == {"in_flight": 0, "leaders": 1, "coalesced": 3}
+
+
+def test_errors_reach_every_caller_and_the_key_is_freed():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0)
+            raise ValueError("upstream")
+
+        results = await asyncio.gather(*(flights.do("k", fn) for _ in range(3)), return_exceptions=True)
+        return results, flights.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert stats["in_flight"] == 0
@@ -0,0 +1,49 @@
+"""Revocations written by other workers reaching this worker's filter."""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from token_revocation import TokenRevocationList  # noqa: E402
+
+
+class AsyncCollection:
+    """The part of Motor's collection API the revocation list reads"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def find(self, *args, **kwargs):
+        async def cursor():
+            for doc in self.collection.find(*args, **kwargs):
+                yield doc
+        return cursor()
+
+    async def find_one(self, *args, **kwargs):
+        return self.collection.find_one(*args, **kwargs)
+
+
+def test_sync_picks_up_a_revocation_that_landed_after_the_last_sync():
+    collection = mongomock.MongoClient().db.revoked_tokens
+    revoked = TokenRevocationList(AsyncCollection(collection), capacity=1000, sync_overlap_seconds=30)
+    asyncio.run(revoked.load())
+
+    # Another worker stamped created_at before our load, but its write landed after it
+    collection.insert_one({"_id": "user:u1", "not_before": 1000.5,
+                           "created_at": revoked._synced_until - timedelta(seconds=5),
+                           "expires_at": datetime.utcnow() + timedelta(days=1)})
+    asyncio.run(revoked.sync())
+
+    assert asyncio.run(revoked.is_revoked("u1", None, 1000.0))
+    assert not asyncio.run(revoked.is_revoked("u1", None, 1000.7))
+
+
+def test_sync_overlap_does_not_reach_back_indefinitely():
+    collection = mongomock.MongoClient().db.revoked_tokens
+    revoked = TokenRevocationList(AsyncCollection(collection), capacity=1000, sync_overlap_seconds=30)
+    asyncio.run(revoked.load())
+    collection.insert_one({"_id": "jti:old", "created_at": revoked._synced_until - timedelta(minutes=5)})
+    asyncio.run(revoked.sync())
+    assert "jti:old" not in revoked.bloom
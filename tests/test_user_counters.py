@@ -0,0 +1,32 @@
+"""Server-side counter updates, evaluated with mongomock's aggregation engine.
+
+Pipeline updates run the same expressions as an aggregation ``$set`` stage,
+so applying them through ``aggregate`` checks what MongoDB will compute.
+"""
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from user_counters import LOSE_LIFE_PIPELINE, MAX_LIVES, gain_life_query  # noqa: E402
+
+
+@pytest.mark.parametrize("lives, expected", [(5, 4), (1, 0), (0, 0)])
+def test_lose_life_never_goes_below_zero(lives, expected, apply_pipeline):
+    assert apply_pipeline({"_id": 1, "lives": lives}, LOSE_LIFE_PIPELINE)["lives"] == expected
+
+
+def test_lose_life_treats_missing_lives_as_full(apply_pipeline):
+    assert apply_pipeline({"_id": 1}, LOSE_LIFE_PIPELINE)["lives"] == MAX_LIVES - 1
+
+
+def test_gain_life_only_matches_below_the_cap():
+    users = mongomock.MongoClient().db.users
+    users.insert_many([{"_id": "full", "lives": MAX_LIVES}, {"_id": "low", "lives": 2}, {"_id": "unset"}])
+    assert users.find_one(gain_life_query("full")) is None
+    assert users.find_one(gain_life_query("unset")) is None
+    assert users.find_one(gain_life_query("low"))["_id"] == "low"
+
+
+def test_gain_life_for_review_requires_the_completion_bit():
+    query = gain_life_query("u", completed_ordinal=33)
+    assert query["progress.completed.1"] == {"$bitsAllSet": 1 << 1}